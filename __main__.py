@@ -3,11 +3,21 @@ import sys
 from pathlib import Path
 import asyncio
 
-from src.bot import main
-
 project_root = Path(__file__).parent
 src_path = project_root / "src"
 sys.path.insert(0, str(src_path))
 
+from src.config.constants import settings
+
+
+def is_supervisor() -> bool:
+    return settings.cluster_worker_id is None and settings.cluster_workers != 1
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    if is_supervisor():
+        from cluster import run_cluster
+        asyncio.run(run_cluster(Path(__file__).resolve()))
+    else:
+        from src.bot import main
+        asyncio.run(main())
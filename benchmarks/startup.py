@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+startup.py — benchmark de inicialização do bot.
+
+Mede, cada fase em interpretadores novos (imports frios):
+
+- ``imports``: tempo de import de cada módulo pesado (``discord``, ``ddgs``,
+  ``PIL``, ``pydantic_settings``, ``nacl``...) e dos pacotes do bot, com o
+  detalhamento de ``-X importtime`` (submódulos com maior tempo próprio);
+- ``config``: leitura do ``config.json`` e montagem das listas em ``config/loader``
+  e construção do ``Settings``;
+- ``cogs``: import e registro dos cogs do manifesto (``CogLoader.load_all``) e o
+  custo do primeiro uso de cada cog lazy, com um bot que nunca conecta;
+- ``ready``: ``src/bot.py`` inteiro até o ``on_ready``, com login e gateway
+  trocados por stubs que disparam o ``ready`` na hora.
+
+O resultado vai para um JSON (por padrão ``benchmarks/results/startup-<commit>.json``)
+e pode ser comparado com um resultado anterior::
+
+    python benchmarks/startup.py --repeat 5
+    python benchmarks/startup.py --compare benchmarks/results/startup-abc1234.json
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+DEFAULT_MODULES = [
+    "discord",
+    "ddgs",
+    "PIL.Image",
+    "pydantic_settings",
+    "nacl",
+    "aiohttp",
+    "requests",
+    "config.constants",
+    "config.loader",
+    "cogs",
+]
+
+# variáveis mínimas para os módulos do bot importarem sem .env
+BENCH_ENV = {
+    "TOKEN": "benchmark",
+    "HTTP_SERVER_PORT": "0",
+    "TRACING_EXPORTER": "none",
+    "LOG_LEVEL": "WARNING",
+}
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    for key, value in BENCH_ENV.items():
+        env.setdefault(key, value)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), str(ROOT), env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def _summary(runs: list[float]) -> dict:
+    return {
+        "seconds": statistics.median(runs),
+        "min": min(runs),
+        "max": max(runs),
+        "runs": runs,
+    }
+
+
+# ---------------------------------------------------------------- imports
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Linhas do ``-X importtime`` -> {módulo: tempo próprio em µs}."""
+    self_us = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # cabeçalho
+        self_us[parts[2].strip()] = int(parts[0])
+    return self_us
+
+
+def _import_once(module: str, env: dict[str, str]) -> tuple[float, dict[str, int]]:
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(time.perf_counter() - start)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env, cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "falhou")
+    return float(proc.stdout.strip().splitlines()[-1]), _parse_importtime(proc.stderr)
+
+
+def bench_imports(modules: list[str], repeat: int) -> dict:
+    env = _env()
+    baseline = set(_parse_importtime(subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import time"],
+        capture_output=True, text=True, env=env, cwd=ROOT,
+    ).stderr))
+
+    results = {}
+    for module in modules:
+        runs = []
+        breakdown: dict[str, int] = {}
+        try:
+            for _ in range(repeat):
+                seconds, breakdown = _import_once(module, env)
+                runs.append(seconds)
+        except RuntimeError as e:
+            results[module] = {"error": str(e)}
+            continue
+
+        loaded = {name: us for name, us in breakdown.items() if name not in baseline}
+        top = sorted(loaded.items(), key=lambda item: item[1], reverse=True)[:5]
+        results[module] = {
+            **_summary(runs),
+            "modules_loaded": len(loaded),
+            "top_self": [{"module": name, "ms": us / 1000} for name, us in top],
+        }
+    return results
+
+
+# ---------------------------------------------------------------- workers
+
+def _run_worker(phase: str, repeat: int) -> dict:
+    """Roda ``phase`` em ``repeat`` interpretadores novos e agrega os números."""
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", phase],
+            capture_output=True, text=True, env=_env(), cwd=ROOT, timeout=120,
+        )
+        lines = proc.stdout.strip().splitlines()
+        if proc.returncode != 0 or not lines:
+            stderr = proc.stderr.strip().splitlines()
+            return {"error": stderr[-1] if stderr else f"saiu com {proc.returncode}"}
+        samples.append(json.loads(lines[-1]))
+
+    result = {}
+    for key, value in samples[0].items():
+        if isinstance(value, float):
+            result[key] = _summary([sample[key] for sample in samples])
+        elif isinstance(value, dict) and all(isinstance(v, float) for v in value.values()):
+            result[key] = {
+                name: _summary([sample[key][name] for sample in samples if name in sample[key]])
+                for name in value
+            }
+        else:
+            result[key] = value
+    return result
+
+
+def _time(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def worker_config() -> dict:
+    start = time.perf_counter()
+    import config.loader as cl
+    from config.constants import Settings
+    import_seconds = time.perf_counter() - start
+
+    config_file = cl.load_config()
+    return {
+        "import_loader": import_seconds,
+        "load_config": _time(cl.load_config),
+        "get_configs": _time(cl.get_configs, config_file),
+        "create_almoco_config": _time(cl.create_almoco_config, config_file),
+        "settings": _time(Settings),
+    }
+
+
+async def _cogs() -> dict:
+    import discord
+    from discord.ext import commands
+
+    import config.loader as cl
+    from cogs import COGS, CogLoader
+    from scheduler import Scheduler
+
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.voice_states = True
+    bot = commands.Bot(command_prefix="!", intents=intents, case_insensitive=True)
+
+    config_file = cl.load_config()
+    bot.configs_list = cl.get_configs(config_file)
+    bot.almoco_list = cl.create_almoco_config(config_file)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bot.scheduler = Scheduler(state_file=Path(tmp) / "scheduler.json")
+        # sem login: o bot só prepara o loop e o cliente HTTP, nunca abre o gateway
+        async with bot:
+            loader = CogLoader(bot, COGS)
+            start = time.perf_counter()
+            await loader.load_all()
+            load_all = time.perf_counter() - start
+            eager = dict(loader.timings)
+            commands_registered = len(bot.all_commands)
+
+            lazy = {}
+            for spec in (spec for spec in COGS if spec.lazy):
+                start = time.perf_counter()
+                if await loader.load_lazy(spec):
+                    lazy[spec.module] = time.perf_counter() - start
+
+    return {
+        "load_all": load_all,
+        "eager": eager,
+        "lazy_first_use": lazy,
+        "cogs_loaded": len(eager),
+        "commands_registered": commands_registered,
+    }
+
+
+def worker_cogs() -> dict:
+    import asyncio
+    return asyncio.run(_cogs())
+
+
+def worker_ready() -> dict:
+    # o main() real inicia o scheduler: sem gateway, um job de recuperação (ex.:
+    # check_record) alteraria o estado de verdade e o anúncio se perderia, então
+    # scheduler, takes e estado ficam numa cópia descartável
+    tmp = Path(tempfile.mkdtemp(prefix="bench-ready-"))
+    shutil.copy(ROOT / "config" / "take.json", tmp / "take.json")
+    os.environ.update({
+        "SCHEDULER_STATE_FILE": str(tmp / "scheduler_state.json"),
+        "TAKES_FILE": str(tmp / "take.json"),
+        "STATE_BACKEND": "memory",
+        "LEADER_ELECTION": "none",
+    })
+
+    start = time.perf_counter()
+    sys.path.insert(0, str(ROOT))
+    import asyncio
+
+    from src import bot as bot_module
+    bot = bot_module.bot
+    import_seconds = time.perf_counter() - start
+
+    async def login(token: str) -> None:
+        # o que o login real faz, menos a chamada à API
+        await bot._async_setup_hook()
+        await bot.setup_hook()
+
+    async def connect(*, reconnect: bool = True) -> None:
+        bot.dispatch("ready")
+        while bot.startup_seconds is None:
+            await asyncio.sleep(0.001)
+
+    bot.login = login
+    bot.connect = connect
+
+    try:
+        asyncio.run(bot_module.main())
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    return {
+        "import_bot": import_seconds,
+        "to_on_ready": time.perf_counter() - start,
+        "bot_startup_seconds": bot.startup_seconds,
+        "cogs": dict(bot.cog_loader.timings),
+    }
+
+
+WORKERS = {
+    "config": worker_config,
+    "cogs": worker_cogs,
+    "ready": worker_ready,
+}
+
+
+# ---------------------------------------------------------------- resultado
+
+def _git_commit() -> str | None:
+    proc = subprocess.run(
+        ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT,
+    )
+    return proc.stdout.strip() or None if proc.returncode == 0 else None
+
+
+def _flatten(results: dict, prefix: str = "") -> dict[str, float]:
+    """Achata o JSON em ``{"imports.discord": segundos, ...}`` para comparação."""
+    flat = {}
+    for key, value in results.items():
+        if not isinstance(value, dict):
+            continue
+        name = f"{prefix}{key}"
+        if "seconds" in value and "runs" in value:
+            flat[name] = value["seconds"]
+        else:
+            flat.update(_flatten(value, name + "."))
+    return flat
+
+
+def compare(current: dict, previous: dict, threshold: float) -> bool:
+    """Imprime as diferenças; retorna se alguma métrica piorou além de ``threshold``."""
+    old = _flatten(previous["results"])
+    new = _flatten(current["results"])
+    regressed = False
+    print(f"\ncomparando com {previous.get('commit')} ({previous.get('timestamp')})")
+    for name in sorted(old.keys() & new.keys()):
+        before, after = old[name], new[name]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        # diferenças abaixo de 1ms são ruído de medida
+        if change > threshold and after - before > 0.001:
+            flag = "  <-- regressão"
+            regressed = True
+        print(f"  {name:<50} {before * 1000:9.1f}ms -> {after * 1000:9.1f}ms  {change:+7.1%}{flag}")
+    return regressed
+
+
+def _print_results(results: dict) -> None:
+    for name, seconds in _flatten(results).items():
+        print(f"  {name:<50} {seconds * 1000:9.1f}ms")
+    for phase, value in results.items():
+        for key, entry in (value.items() if phase == "imports" else [(phase, value)]):
+            if isinstance(entry, dict) and "error" in entry:
+                print(f"  {key:<50} erro: {entry['error']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="interpretadores por medida (mediana)")
+    parser.add_argument("--phases", default="imports,config,cogs,ready")
+    parser.add_argument("--modules", default=",".join(DEFAULT_MODULES))
+    parser.add_argument("--output", type=Path, help="arquivo JSON de saída")
+    parser.add_argument("--compare", type=Path, help="resultado anterior para comparar")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="piora relativa que conta como regressão (padrão: 0.2)")
+    parser.add_argument("--worker", choices=sorted(WORKERS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(WORKERS[args.worker]()))
+        sys.stdout.flush()
+        # o bot deixa threads (watchdog, logging) e sessões abertas; sai sem esperar
+        os._exit(0)
+
+    phases = [phase.strip() for phase in args.phases.split(",") if phase.strip()]
+    results = {}
+    for phase in phases:
+        print(f"medindo {phase}...", file=sys.stderr)
+        if phase == "imports":
+            results[phase] = bench_imports(args.modules.split(","), args.repeat)
+        else:
+            results[phase] = _run_worker(phase, args.repeat)
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    output = args.output or RESULTS_DIR / f"startup-{commit or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    _print_results(results)
+    print(f"\nresultado salvo em {output}")
+
+    if args.compare:
+        previous = json.loads(args.compare.read_text(encoding="utf-8"))
+        if compare(report, previous, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+cache.py — cache de clipes de áudio já decodificados para PCM.
+
+Cada arquivo é decodificado uma única vez pelo FFmpeg para PCM s16le 48 kHz
+estéreo (o formato que o discord.py envia ao encoder Opus), com o volume
+normalizado (``loudnorm``). O resultado é indexado pelo hash do conteúdo do
+arquivo, gravado em disco e mapeado em memória, então sobrevive a restarts e
+arquivos iguais com nomes diferentes compartilham o mesmo PCM. A reprodução lê
+direto desse buffer, sem abrir um subprocesso por play.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import mmap
+import os
+from pathlib import Path
+
+import discord
+from discord import PCMVolumeTransformer
+
+from config.constants import settings
+from logger import get_logger
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+log = get_logger(__name__)
+
+CACHE_LOOKUPS = metrics.counter(
+    "cache_lookups_total", "Consultas a caches em memória por resultado", ("cache", "result")
+)
+DECODE_SECONDS = metrics.histogram(
+    "audio_decode_seconds", "Tempo de decodificação de um clipe pelo FFmpeg",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+FRAME_SIZE = discord.opus.Encoder.FRAME_SIZE
+SAMPLING_RATE = discord.opus.Encoder.SAMPLING_RATE
+CHANNELS = discord.opus.Encoder.CHANNELS
+
+LOUDNORM_FILTER = "loudnorm=I=-16:TP=-1.5:LRA=11"
+
+
+class BufferedPCMAudio(discord.AudioSource):
+    """AudioSource que toca PCM de um buffer em memória, frame a frame (20 ms)."""
+
+    def __init__(self, pcm):
+        self._pcm = memoryview(pcm)
+        self._pos = 0
+
+    def read(self) -> bytes:
+        chunk = self._pcm[self._pos:self._pos + FRAME_SIZE]
+        self._pos += FRAME_SIZE
+        if not chunk:
+            return b""
+        if len(chunk) < FRAME_SIZE:
+            return bytes(chunk) + b"\x00" * (FRAME_SIZE - len(chunk))
+        return bytes(chunk)
+
+    def is_opus(self) -> bool:
+        return False
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _map_file(path: Path) -> mmap.mmap:
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class PCMCache:
+    """Decodifica, normaliza e guarda clipes de áudio em PCM, indexados pelo conteúdo."""
+
+    def __init__(self, cache_dir: str, executable: str = "ffmpeg", normalize: bool = True):
+        self.cache_dir = Path(cache_dir)
+        self.executable = executable
+        self.normalize = normalize
+        # hash do conteúdo -> PCM (mmap do arquivo em disco)
+        self._clips: dict[str, mmap.mmap] = {}
+        # caminho -> (mtime, hash), evita reler o arquivo a cada play
+        self._digests: dict[str, tuple[float, str]] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def __contains__(self, path: str) -> bool:
+        entry = self._digests.get(path)
+        return entry is not None and entry[1] in self._clips
+
+    async def digest(self, path: str) -> str:
+        mtime = os.path.getmtime(path)
+        entry = self._digests.get(path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1]
+        digest = await asyncio.to_thread(_file_digest, path)
+        self._digests[path] = (mtime, digest)
+        return digest
+
+    def _cache_path(self, digest: str) -> Path:
+        suffix = "norm" if self.normalize else "raw"
+        return self.cache_dir / f"{digest}.{suffix}.pcm"
+
+    async def _decode(self, path: str, target: Path) -> None:
+        filters = ["-af", LOUDNORM_FILTER] if self.normalize else []
+        partial = target.with_suffix(".tmp")
+        process = await asyncio.create_subprocess_exec(
+            self.executable,
+            "-nostdin", "-loglevel", "error", "-y",
+            "-i", path,
+            "-vn", *filters,
+            "-f", "s16le", "-ar", str(SAMPLING_RATE), "-ac", str(CHANNELS),
+            str(partial),
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, err = await process.communicate()
+        if process.returncode != 0:
+            partial.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"FFmpeg falhou ao decodificar {path}: {err.decode(errors='ignore').strip()}"
+            )
+        os.replace(partial, target)
+
+    async def load(self, path: str):
+        """Retorna o PCM do arquivo, decodificando só se esse conteúdo nunca foi visto."""
+        digest = await self.digest(path)
+        pcm = self._clips.get(digest)
+        CACHE_LOOKUPS.inc(cache="pcm", result="miss" if pcm is None else "hit")
+        if pcm is not None:
+            return pcm
+
+        lock = self._locks.setdefault(digest, asyncio.Lock())
+        async with lock:
+            pcm = self._clips.get(digest)
+            if pcm is not None:
+                return pcm
+
+            target = self._cache_path(digest)
+            if not target.exists() or target.stat().st_size == 0:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with DECODE_SECONDS.time(), tracer.span("audio decode", path=path):
+                    await self._decode(path, target)
+                log.info("Áudio decodificado para cache: %s -> %s", path, target.name)
+
+            pcm = await asyncio.to_thread(_map_file, target)
+            self._clips[digest] = pcm
+            log.info(
+                "Áudio em cache: %s (%.1fs, %d KiB)",
+                path,
+                len(pcm) / (SAMPLING_RATE * CHANNELS * 2),
+                len(pcm) // 1024,
+            )
+            return pcm
+
+    async def warm(self, paths: list[str]) -> None:
+        """Pré-decodifica os clipes existentes; falhas só são logadas."""
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                await self.load(path)
+            except Exception as e:
+                log.error("Erro ao pré-carregar áudio %s: %s", path, e)
+
+    async def source(self, path: str, volume: float = 1.0) -> PCMVolumeTransformer:
+        """AudioSource pronto para ``VoiceClient.play`` tocando do cache."""
+        pcm = await self.load(path)
+        return PCMVolumeTransformer(BufferedPCMAudio(pcm), volume=volume)
+
+
+pcm_cache = PCMCache(settings.audio_cache_dir)
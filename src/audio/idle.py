@@ -0,0 +1,77 @@
+"""
+idle.py — sai dos canais de voz em que o bot ficou sozinho.
+
+Em vez de varrer os canais periodicamente, cada ``on_voice_state_update`` reavalia
+a guild afetada: se o bot ficou sozinho, um timer de saída é armado; se alguém
+entrou antes do prazo, o timer é cancelado.
+"""
+from __future__ import annotations
+
+import asyncio
+
+import discord
+
+from audio.sessions import voice_sessions
+from config.constants import settings
+from logger import get_logger
+
+log = get_logger(__name__)
+
+
+def is_alone(voice_client: discord.VoiceClient) -> bool:
+    """True se não há mais ninguém além do bot no canal de voz."""
+    me = voice_client.guild.me.id
+    return all(user_id == me for user_id in voice_client.channel.voice_states)
+
+
+class VoiceIdleTracker:
+    """Timers de saída por guild para canais de voz vazios."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._timers: dict[int, asyncio.Task] = {}
+
+    def pending(self) -> int:
+        return len(self._timers)
+
+    def check(self, guild: discord.Guild) -> None:
+        """Arma ou cancela o timer da guild conforme o estado atual do canal."""
+        vc = guild.voice_client
+        if vc is None or not vc.is_connected() or not is_alone(vc):
+            self.cancel(guild.id)
+            return
+
+        if guild.id not in self._timers:
+            log.info("Sozinho em %s (%s); saindo em %.0fs", vc.channel.name, guild.name, self.timeout)
+            task = asyncio.create_task(self._leave_after(guild))
+            self._timers[guild.id] = task
+            task.add_done_callback(lambda t, gid=guild.id: self._forget(gid, t))
+
+    def _forget(self, guild_id: int, task: asyncio.Task) -> None:
+        if self._timers.get(guild_id) is task:
+            del self._timers[guild_id]
+
+    def check_all(self, voice_clients) -> None:
+        for vc in voice_clients:
+            self.check(vc.guild)
+
+    def cancel(self, guild_id: int) -> None:
+        task = self._timers.pop(guild_id, None)
+        if task is not None:
+            task.cancel()
+
+    def cancel_all(self) -> None:
+        for guild_id in list(self._timers):
+            self.cancel(guild_id)
+
+    async def _leave_after(self, guild: discord.Guild) -> None:
+        await asyncio.sleep(self.timeout)
+        vc = guild.voice_client
+        if vc is None or not vc.is_connected() or not is_alone(vc):
+            return
+        channel_name = vc.channel.name
+        await voice_sessions.disconnect(guild)
+        log.info("Bot desconectado do canal de voz: %s", channel_name)
+
+
+idle_tracker = VoiceIdleTracker(timeout=settings.voice_idle_timeout)
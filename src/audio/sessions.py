@@ -0,0 +1,90 @@
+"""
+sessions.py — uma conexão de voz por guild, reaproveitada entre comandos.
+
+Trocar de canal usa ``move_to`` na sessão existente em vez de desconectar e
+refazer o handshake. Conexões são serializadas por guild: quem pede para tocar
+enquanto uma conexão está em andamento espera por ela em vez de competir.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Final
+
+import discord
+
+from logger import get_logger
+
+log = get_logger(__name__)
+
+INVALID_SESSION: Final[int] = 4006
+_MAX_ATTEMPTS: Final[int] = 3
+_BACKOFF_BASE: Final[float] = 1.0
+_CONNECT_TIMEOUT: Final[float] = 20.0
+
+
+class VoiceSessionManager:
+    """Gerencia as conexões de voz do bot, uma por guild."""
+
+    def __init__(self):
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    def _lock(self, guild_id: int) -> asyncio.Lock:
+        return self._locks.setdefault(guild_id, asyncio.Lock())
+
+    def connecting(self, guild_id: int) -> bool:
+        return self._lock(guild_id).locked()
+
+    async def wait_ready(self, guild: discord.Guild) -> discord.VoiceClient | None:
+        """Espera uma conexão pendente da guild terminar e retorna o voice client atual."""
+        async with self._lock(guild.id):
+            return guild.voice_client
+
+    async def connect(self, channel: discord.VoiceChannel) -> discord.VoiceClient:
+        """Conecta ao canal, ou move a sessão existente da guild para ele."""
+        async with self._lock(channel.guild.id):
+            vc = channel.guild.voice_client
+            if vc is not None and vc.is_connected():
+                if vc.channel.id != channel.id:
+                    log.info("Movendo sessão de voz: %s -> %s", vc.channel.name, channel.name)
+                    await vc.move_to(channel)
+                return vc
+
+            if vc is not None:
+                await vc.disconnect(force=True)
+            return await self._connect_with_retry(channel)
+
+    async def ensure_connected(self, channel: discord.VoiceChannel) -> discord.VoiceClient:
+        """Retorna a sessão da guild se já existir; senão conecta em ``channel``."""
+        vc = await self.wait_ready(channel.guild)
+        if vc is not None and vc.is_connected():
+            return vc
+        return await self.connect(channel)
+
+    async def _connect_with_retry(self, channel: discord.VoiceChannel) -> discord.VoiceClient:
+        attempt = 1
+        while True:
+            try:
+                return await channel.connect(timeout=_CONNECT_TIMEOUT, reconnect=True)
+            except discord.errors.ConnectionClosed as e:
+                if e.code != INVALID_SESSION or attempt >= _MAX_ATTEMPTS:
+                    raise
+
+            delay = _BACKOFF_BASE * (2 ** (attempt - 1))
+            log.warning(
+                "Sessão de voz inválida (4006) em %s, tentativa %d/%d. Nova tentativa em %.1fs",
+                channel.name, attempt, _MAX_ATTEMPTS, delay,
+            )
+            # limpa o estado de voz que o gateway ainda guarda para a sessão antiga
+            if channel.guild.voice_client is not None:
+                await channel.guild.voice_client.disconnect(force=True)
+            await channel.guild.change_voice_state(channel=None)
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def disconnect(self, guild: discord.Guild) -> None:
+        async with self._lock(guild.id):
+            if guild.voice_client is not None:
+                await guild.voice_client.disconnect()
+
+
+voice_sessions = VoiceSessionManager()
@@ -0,0 +1,147 @@
+"""
+soundboard.py — sons configurados em ``config/sounds.json`` e fila de reprodução por guild.
+
+Cada guild tem um GuildPlayer com uma fila: pedidos feitos enquanto outro som está
+tocando esperam a vez em vez de falhar com "Already playing audio".
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import discord
+
+from audio.cache import pcm_cache
+from audio.sessions import voice_sessions
+from config.constants import settings
+from config.loader import SOUND_COMMANDS
+from logger import get_logger
+from utils.metrics import metrics
+
+log = get_logger(__name__)
+
+MAX_QUEUE_SIZE = 10
+
+PLAYBACKS = metrics.counter("voice_playbacks_total", "Clipes de áudio tocados por resultado", ("result",))
+START_SECONDS = metrics.histogram(
+    "voice_playback_start_seconds",
+    "Tempo entre o clipe sair da fila e começar a tocar",
+)
+
+
+class Sound:
+    """Entrada do manifesto de sons."""
+
+    def __init__(self, name: str, data: dict):
+        self.name = name
+        self.file = data["file"]
+        self.emoji = data.get("emoji")
+        self.style = getattr(discord.ButtonStyle, data.get("style", "secondary"))
+        self.volume = float(data.get("volume", 0.2))
+        self.message = data.get("message", "")
+        self.description = data.get("description", "")
+
+    @property
+    def path(self) -> str:
+        return f"{settings.img_path}{self.file}"
+
+
+class GuildPlayer:
+    """Toca os clipes enfileirados de uma guild, um de cada vez."""
+
+    def __init__(self, guild_id: int):
+        self.guild_id = guild_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=MAX_QUEUE_SIZE)
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def idle(self) -> bool:
+        return self.queue.empty() and (self._worker is None or self._worker.done())
+
+    def enqueue(self, voice_client: discord.VoiceClient, path: str, volume: float) -> None:
+        """Enfileira um clipe; lança asyncio.QueueFull se a fila estiver cheia."""
+        self.queue.put_nowait((voice_client.guild, path, volume))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while not self.queue.empty():
+            guild, path, volume = self.queue.get_nowait()
+            start = time.perf_counter()
+            # espera uma conexão/troca de canal pendente e usa a sessão atual da guild
+            voice_client = await voice_sessions.wait_ready(guild)
+            if voice_client is None or not voice_client.is_connected():
+                PLAYBACKS.inc(result="disconnected")
+                continue
+
+            try:
+                source = await pcm_cache.source(path, volume=volume)
+            except Exception as e:
+                log.error("Erro ao carregar áudio %s: %s", path, e)
+                PLAYBACKS.inc(result="error")
+                continue
+
+            finished = asyncio.Event()
+            outcome: list[str] = []
+
+            def after_playback(error, clip=path):
+                if error:
+                    log.error("Erro ao reproduzir áudio %s: %s", clip, error)
+                else:
+                    log.info("Reprodução de %s finalizada corretamente.", clip)
+                outcome.append("error" if error else "ok")
+                loop.call_soon_threadsafe(finished.set)
+
+            try:
+                voice_client.play(source, after=after_playback)
+            except discord.ClientException as e:
+                log.error("Não foi possível tocar %s: %s", path, e)
+                PLAYBACKS.inc(result="error")
+                continue
+            START_SECONDS.observe(time.perf_counter() - start)
+            await finished.wait()
+            PLAYBACKS.inc(result=outcome[0] if outcome else "ok")
+
+    def stop(self) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        if self._worker is not None:
+            self._worker.cancel()
+
+
+class Soundboard:
+    """Sons disponíveis e players por guild."""
+
+    def __init__(self, manifest: dict[str, dict]):
+        self.sounds = {name: Sound(name, data) for name, data in manifest.items()}
+        self._players: dict[int, GuildPlayer] = {}
+
+    def player(self, guild_id: int) -> GuildPlayer:
+        if guild_id not in self._players:
+            self._players[guild_id] = GuildPlayer(guild_id)
+        return self._players[guild_id]
+
+    def paths(self) -> list[str]:
+        return [sound.path for sound in self.sounds.values()]
+
+    def enqueue(self, voice_client: discord.VoiceClient, path: str, volume: float) -> None:
+        self.player(voice_client.guild.id).enqueue(voice_client, path, volume)
+
+    def play(self, voice_client: discord.VoiceClient, sound_name: str) -> Sound:
+        sound = self.sounds[sound_name]
+        self.enqueue(voice_client, sound.path, sound.volume)
+        return sound
+
+    def stop_all(self) -> None:
+        for player in self._players.values():
+            player.stop()
+
+
+soundboard = Soundboard(SOUND_COMMANDS)
+
+metrics.gauge(
+    "voice_queue_depth",
+    "Clipes esperando na fila, somando todas as guilds",
+    lambda: sum(player.queue.qsize() for player in soundboard._players.values()),
+)
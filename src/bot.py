@@ -1,5 +1,11 @@
+import time
+
+# referência para o tempo até o on_ready, antes dos imports pesados
+_started_at = time.perf_counter()
+
 import asyncio
 import locale
+import math
 import os
 from pathlib import Path
 
@@ -8,10 +14,19 @@ from discord.ext import commands
 from dotenv import load_dotenv
 
 from .logger import get_logger
-from .cogs import AutoCog
+from .cogs import COGS, CogLoader
 from .config import loader as cl
 from .config.constants import settings
+from .scheduler import Scheduler
 from .server import NotificationServer
+from .utils.sharding import shard_latencies, shard_options
+from .utils.triggers import TriggerRegistry
+from .utils.watchdog import LoopWatchdog
+# imports absolutos de propósito: o tracer (e o span atual), o registro de
+# métricas e o estado replicado pelo cluster precisam ser os mesmos usados pelos cogs
+from cluster import attach, claim_channels, cluster_client, create_elector
+from utils.metrics import metrics
+from utils.tracing import http_trace_config
 
 src_path = Path(__file__).parent
 env_path = src_path.parent / '.env'
@@ -34,32 +49,88 @@ intents = discord.Intents.default()
 intents.message_content = True
 intents.voice_states = True
 
-bot = commands.Bot(command_prefix="!", intents=intents, case_insensitive=True)
+# com SHARDING=true cada shard tem o seu gateway; ver utils/sharding.py
+bot_class, bot_options = (
+    (commands.AutoShardedBot, shard_options()) if settings.sharding else (commands.Bot, {})
+)
+
+# cada chamada REST ao Discord (send, reply, edit...) vira um span filho do comando
+bot = bot_class(
+    command_prefix="!",
+    intents=intents,
+    case_insensitive=True,
+    http_trace=http_trace_config(),
+    **bot_options,
+)
 
 bot.configs_list = configs_list
+bot.triggers = TriggerRegistry(configs_list, idle_ttl=settings.trigger_idle_ttl)
 bot.almoco_list = almoco_frases_list
+# com réplicas, só o líder roda os jobs e aceita notificações (ver cluster/leader.py)
+bot.leader = create_elector()
+bot.scheduler = Scheduler(state_file=Path(settings.scheduler_state_file), leader=bot.leader)
+bot.watchdog = LoopWatchdog(threshold=settings.loop_stall_threshold)
+# só existe quando o processo é um worker do cluster (ver cluster/supervisor.py)
+bot.cluster = cluster_client()
 
 notification_server = NotificationServer(
     bot=bot,
     host=settings.http_server_host,
     port=settings.http_server_port,
-    channel_id=settings.notification_channel_id
+    channel_id=settings.notification_channel_id,
+    webhook_url=settings.notification_webhook_url,
+    batch_window=settings.notification_batch_window,
+)
+
+bot.cog_loader = CogLoader(bot, COGS)
+bot.startup_seconds = None
+
+metrics.gauge(
+    "bot_startup_seconds",
+    "Tempo da importação do bot até o primeiro on_ready",
+    lambda: bot.startup_seconds if bot.startup_seconds is not None else -1,
 )
+metrics.gauge(
+    "discord_shard_latency_seconds",
+    "Latência do heartbeat de cada shard conectado",
+    lambda: {(str(shard_id),): latency for shard_id, latency in shard_latencies(bot).items()
+             if math.isfinite(latency)},
+    labelnames=("shard",),
+)
+metrics.gauge("trigger_sets_loaded", "Servidores com gatilhos compilados em memória", bot.triggers.loaded)
+metrics.gauge("bot_is_leader", "1 se este processo é o líder entre as réplicas", lambda: int(bot.leader.is_leader))
+
 
 async def load_extensions(bot_instance):
-    for cog_class in AutoCog.get_registry():
-        try:
-            await bot_instance.add_cog(cog_class(bot_instance))
-            logger.info("COG: %s carregado com sucesso", cog_class.__name__)
-        except Exception as e:
-            logger.error("Erro COG: %s: %s", cog_class.__name__, e, exc_info=True)
+    await bot_instance.cog_loader.load_all()
 
 @bot.event
 async def on_ready():
-    logger.info("Bot online como %s", bot.user)
+    if bot.startup_seconds is None:
+        bot.startup_seconds = time.perf_counter() - _started_at
+        logger.info("Bot online como %s (pronto em %.2fs)", bot.user, bot.startup_seconds)
+    else:
+        logger.info("Bot online como %s", bot.user)
+    bot.scheduler.start()
+    if bot.cluster is not None:
+        await claim_channels(bot, bot.cluster)
+
+
+@bot.event
+async def on_shard_ready(shard_id):
+    logger.info("Shard %s conectado", shard_id)
+
+
+@bot.event
+async def on_shard_disconnect(shard_id):
+    logger.warning("Shard %s desconectado", shard_id)
 
 
 async def main():
+    bot.watchdog.start()
+    bot.leader.start()
+    if bot.cluster is not None:
+        await attach(bot, bot.cluster)
     await load_extensions(bot)
 
     logger.info("Iniciando HTTP server para notificações...")
@@ -70,7 +141,10 @@ async def main():
         await bot.start(settings.token)
     except Exception as e:
         logger.error("Erro ao iniciar bot: %s", e, exc_info=True)
-        await http_runner.cleanup()
+        await bot.scheduler.shutdown()
+        await bot.leader.stop()
+        await notification_server.stop(http_runner)
+        bot.watchdog.stop()
         raise
 
 
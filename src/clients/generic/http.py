@@ -6,6 +6,7 @@ import aiohttp
 import requests
 
 from logger import get_logger
+from utils.tracing import http_trace_config, tracer
 
 log = get_logger(__name__)
 
@@ -25,21 +26,23 @@ async def fetch_http_dog_image(http, flag):
     url = f'https://http.dog/{http}'
 
     try:
-        response = requests.get(json_url)
+        with tracer.span("http GET", url=json_url):
+            response = requests.get(json_url)
         if response.status_code == 200:
             data = response.json()
             title = data.get("title", "Título não encontrado")
             description = title if flag else "nao achei no mdn"
             return description, url, image_jpg
     except Exception as e:
-        log.info(f"Erro ao buscar dados: {e}")
+        log.info("Erro ao buscar dados: %s", e)
 
     return None, None, None
 
 
 async def fetch_generic_description(http, base_url, pattern):
     url = f'{base_url}{http}'
-    response = requests.get(url)
+    with tracer.span("http GET", url=url):
+        response = requests.get(url)
 
     if response.status_code == 200:
         match = re.search(pattern, response.content.decode('utf-8', errors='ignore'))
@@ -49,6 +52,6 @@ async def fetch_generic_description(http, base_url, pattern):
     return None, url
 
 async def xingar():
-    async with aiohttp.ClientSession() as session:
+    async with aiohttp.ClientSession(trace_configs=[http_trace_config()]) as session:
         async with session.get("http://xinga-me.appspot.com/api") as response:
             return (await response.json())["xingamento"]
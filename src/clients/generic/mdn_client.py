@@ -3,10 +3,13 @@ import re
 
 import requests
 
+from utils.tracing import tracer
+
 
 async def fetch_mdn_description(http):
     url = f'https://developer.mozilla.org/pt-BR/docs/Web/HTTP/Status/{http}'
-    response = requests.get(url)
+    with tracer.span("http GET", url=url):
+        response = requests.get(url)
 
     if response.status_code == 200:
         match = re.search(r'<meta\s+name=["\']description["\']\s+content=["\'](.*?)["\']\s*/?>',
@@ -0,0 +1,135 @@
+"""
+dedup.py — remove imagens quase idênticas (espelhos da mesma imagem) dos resultados.
+
+Cada resultado ganha um hash perceptual (dHash de 64 bits) calculado a partir de um
+download parcial; resultados a poucos bits de distância de um anterior são descartados.
+Os resultados (que podem vir do cache de buscas) não são alterados, e o dHash roda
+num pool próprio para não disputar o executor padrão do asyncio.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+from typing import Final
+
+import aiohttp
+from PIL import Image
+
+from logger import get_logger
+from utils.executor import BoundedExecutor, ExecutorSaturated
+from utils.tracing import http_trace_config
+
+log = get_logger(__name__)
+
+PARTIAL_BYTES: Final[int] = 64 * 1024
+HAMMING_THRESHOLD: Final[int] = 6
+_HASH_SIZE: Final[int] = 8
+_FETCH_TIMEOUT: Final[float] = 3.0
+_STAGE_TIMEOUT: Final[float] = 4.0
+_MAX_CONCURRENCY: Final[int] = 8
+_JPEG_EOI: Final[bytes] = b"\xff\xd9"
+
+# link -> hash (ou None se não deu para calcular)
+_hash_cache: dict[str, int | None] = {}
+_HASH_CACHE_MAX: Final[int] = 1000
+
+# decodificar e reduzir a imagem é CPU: um pool pequeno e só dele
+dedup_executor = BoundedExecutor("dedup", max_workers=2, max_queue=_MAX_CONCURRENCY * 2)
+
+
+def dhash(data: bytes) -> int | None:
+    """
+    Calcula o dHash de uma imagem, possivelmente truncada.
+
+    JPEGs truncados são fechados com um marcador EOI para o decoder aceitar os
+    bytes parciais (JPEG progressivo já traz a imagem inteira em baixa resolução).
+    """
+    if data[:2] == b"\xff\xd8" and not data.endswith(_JPEG_EOI):
+        data += _JPEG_EOI
+    try:
+        with Image.open(io.BytesIO(data)) as img:
+            img.draft("L", (_HASH_SIZE * 4, _HASH_SIZE * 4))
+            small = img.convert("L").resize((_HASH_SIZE + 1, _HASH_SIZE))
+            pixels = small.tobytes()
+    except Exception:
+        return None
+
+    value = 0
+    for row in range(_HASH_SIZE):
+        offset = row * (_HASH_SIZE + 1)
+        for col in range(_HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+async def _fetch_partial(session: aiohttp.ClientSession, url: str) -> bytes | None:
+    headers = {"Range": f"bytes=0-{PARTIAL_BYTES - 1}"}
+    try:
+        async with session.get(url, headers=headers, timeout=_FETCH_TIMEOUT, ssl=False) as resp:
+            if resp.status not in (200, 206):
+                return None
+            body = bytearray()
+            async for chunk in resp.content.iter_chunked(16 * 1024):
+                body.extend(chunk)
+                if len(body) >= PARTIAL_BYTES:
+                    break
+            return bytes(body[:PARTIAL_BYTES])
+    except (asyncio.TimeoutError, aiohttp.ClientError, ValueError):
+        return None
+
+
+async def _hash_link(
+    session: aiohttp.ClientSession,
+    link: str,
+    semaphore: asyncio.Semaphore,
+) -> int | None:
+    if link in _hash_cache:
+        return _hash_cache[link]
+    async with semaphore:
+        data = await _fetch_partial(session, link)
+    try:
+        value = await dedup_executor.run(dhash, data) if data else None
+    except ExecutorSaturated:
+        # pool cheio: fica sem hash desta vez, sem guardar no cache
+        return None
+    if len(_hash_cache) >= _HASH_CACHE_MAX:
+        _hash_cache.pop(next(iter(_hash_cache)))
+    _hash_cache[link] = value
+    return value
+
+
+async def collapse_near_duplicates(results: list, threshold: int = HAMMING_THRESHOLD) -> list:
+    """
+    Remove resultados visualmente iguais a um resultado anterior da lista.
+
+    Resultados cujo hash não pôde ser calculado (timeout, formato não suportado)
+    são mantidos.
+    """
+    if len(results) < 2:
+        return results
+
+    semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=_MAX_CONCURRENCY, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(connector=connector, trace_configs=[http_trace_config()]) as session:
+        tasks = [asyncio.create_task(_hash_link(session, item["link"], semaphore)) for item in results]
+        done, pending = await asyncio.wait(tasks, timeout=_STAGE_TIMEOUT)
+        for task in pending:
+            task.cancel()
+    hashes = [task.result() if task in done and task.exception() is None else None for task in tasks]
+
+    kept: list = []
+    kept_hashes: list[int] = []
+    for item, value in zip(results, hashes):
+        if value is not None and any(hamming(value, h) <= threshold for h in kept_hashes):
+            continue
+        if value is not None:
+            kept_hashes.append(value)
+        kept.append(item)
+
+    if len(kept) != len(results):
+        log.info("Dedup perceptual: %d -> %d resultado(s)", len(results), len(kept))
+    return kept
@@ -9,6 +9,8 @@ from typing import Final, TypedDict
 from ddgs import DDGS
 
 from logger import get_logger
+from utils.executor import ExecutorSaturated, search_executor
+from utils.tracing import tracer
 
 log = get_logger(__name__)
 
@@ -23,7 +25,8 @@ class ImageResult(TypedDict):
 
 
 def _search_sync(query: str, max_results: int) -> list[ImageResult]:
-    raw = DDGS().images(query=query, region="wt-wt", safesearch="off", max_results=max_results)
+    with tracer.span("http ddgs images", query=query, max_results=max_results):
+        raw = DDGS().images(query=query, region="wt-wt", safesearch="off", max_results=max_results)
 
     return [
         ImageResult(title=item.get("title") or "Sem título", link=item["image"])
@@ -61,12 +64,16 @@ async def search_images(
     for attempt in range(1, retries + 1):
         try:
             results = await asyncio.wait_for(
-                asyncio.to_thread(_search_sync, query, max_results),
+                search_executor.run(_search_sync, query, max_results),
                 timeout=timeout,
             )
             log.info("%d imagem(ns) retornada(s) para %r", len(results), query)
             return results
 
+        except ExecutorSaturated as exc:
+            log.warning("Busca rejeitada para %r: %s", query, exc)
+            return []
+
         except TimeoutError:
             last_exc = TimeoutError(f"Timeout após {timeout}s")
             log.warning("Timeout (tentativa %d/%d)", attempt, retries)
@@ -1,11 +1,13 @@
 import asyncio
 import os
-from collections import OrderedDict
 from urllib.parse import urlparse, quote_plus
 
 import aiohttp
 
 from logger import get_logger
+from state import state
+from state.cache import StateCache
+from utils.tracing import http_trace_config
 
 log = get_logger(__name__)
 
@@ -14,44 +16,10 @@ MIN_IMAGE_SIZE_BYTES = 10 * 1024
 PROBLEM_DOMAINS = {"instagram.com", "lookaside.instagram.com"}
 
 
-class LimitedURLCache:
-    """Cache LRU para URLs com limite de memória."""
-
-    def __init__(self, maxsize: int = 300):
-        self.cache: OrderedDict = OrderedDict()
-        self.maxsize = maxsize
-
-    def get(self, url: str) -> bool | None:
-        return self.cache.get(url)
-
-    def add(self, url: str, valid: bool) -> None:
-        if url in self.cache:
-            del self.cache[url]
-        elif len(self.cache) >= self.maxsize:
-            self.cache.popitem(last=False)
-        self.cache[url] = valid
-
-
-class LimitedQueryCache:
-    """Cache LRU para queries de busca."""
-
-    def __init__(self, maxsize: int = 50):
-        self.cache: OrderedDict = OrderedDict()
-        self.maxsize = maxsize
-
-    def get(self, query: str) -> list | None:
-        return self.cache.get(query)
-
-    def add(self, query: str, results: list) -> None:
-        if query in self.cache:
-            del self.cache[query]
-        elif len(self.cache) >= self.maxsize:
-            self.cache.popitem(last=False)
-        self.cache[query] = results
-
-
-_url_cache = LimitedURLCache(maxsize=300)
-_query_cache = LimitedQueryCache(maxsize=50)
+# validade de URLs e resultados por query ficam no backend de estado, então valem
+# para todas as réplicas; no backend em memória o limite de entradas dos antigos LRUs continua
+_url_cache = StateCache("google_url", ttl=24 * 3600, backend=state, max_entries=300)
+_query_cache = StateCache("google_query", ttl=3600, backend=state, max_entries=50)
 
 
 def is_valid_image_url(url: str) -> bool:
@@ -81,20 +49,11 @@ async def verify_image_accessibility(
     timeout: int = 3,
     semaphore: asyncio.Semaphore | None = None,
 ) -> bool:
-    # Verificar cache primeiro
-    cached = _url_cache.get(url)
-    if cached is not None:
-        return cached
-
-    async def _inner() -> bool:
-        result = await _verify_image_lightweight(session, url, timeout=timeout)
-        _url_cache.add(url, result)
-        return result
-
+    """Faz a verificação da URL (sem cache: ``filter_valid_images`` consulta o cache em lote)."""
     if semaphore is not None:
         async with semaphore:
-            return await _inner()
-    return await _inner()
+            return await _verify_image_lightweight(session, url, timeout=timeout)
+    return await _verify_image_lightweight(session, url, timeout=timeout)
 
 
 async def _verify_image_lightweight(
@@ -175,15 +134,23 @@ async def filter_valid_images(
         semaphore = asyncio.Semaphore(3)
 
     results = []
+    known = await _url_cache.get_many(link for link, _ in candidates)
+    checked = {}
 
     # Lazy loading: verificar até conseguir max_needed resultados válidos
     for link, title in candidates:
         if len(results) >= max_needed:
             break
 
-        if await verify_image_accessibility(session, link, timeout=2, semaphore=semaphore):
+        valid = known.get(link)
+        if valid is None:
+            valid = await verify_image_accessibility(session, link, timeout=2, semaphore=semaphore)
+            checked[link] = valid
+        if valid:
             results.append({"title": title, "link": link})
 
+    if checked:
+        await _url_cache.add_many(checked)
     return results
 
 
@@ -219,7 +186,7 @@ async def handle_spelling_correction(data: dict, query: str, corrected_query_use
 async def search_images_google(query, max_results=30):
     """Busca imagens com cache por query e connection pooling otimizado."""
     # Verificar cache de query primeiro
-    cached_results = _query_cache.get(query)
+    cached_results = await _query_cache.get(query)
     if cached_results is not None:
         log.info("Retornando %d imagens do cache para query: %s", len(cached_results), query)
         return cached_results
@@ -241,7 +208,7 @@ async def search_images_google(query, max_results=30):
     connector = aiohttp.TCPConnector(limit=10, limit_per_host=5, ttl_dns_cache=300)
 
     try:
-        async with aiohttp.ClientSession(connector=connector) as session:
+        async with aiohttp.ClientSession(connector=connector, trace_configs=[http_trace_config()]) as session:
             while len(results) < max_results:
                 to_request = min(per_request, max_results - len(results))
                 url = build_google_cse_url(api_key, cx, query, to_request, start)
@@ -309,16 +276,17 @@ async def search_images_google(query, max_results=30):
 
     # Cachear resultados
     if results:
-        _query_cache.add(query, results)
+        await _query_cache.add(query, results)
 
     return results
 
 
-async def search_images(query, max_results=30):
-    api_key = os.getenv("GOOGLE_API_KEY")
-    cx = os.getenv("GOOGLE_CX")
+def is_configured() -> bool:
+    return bool(os.getenv("GOOGLE_API_KEY") and os.getenv("GOOGLE_CX"))
 
-    if api_key and cx:
+
+async def search_images(query, max_results=30):
+    if is_configured():
         try:
             imgs = await search_images_google(query, max_results=max_results)
             if imgs:
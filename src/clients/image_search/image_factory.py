@@ -0,0 +1,252 @@
+"""
+image_factory.py — orquestra as engines de busca de imagens (Google e DuckDuckGo).
+
+Dois modos:
+
+* ``race``:  a engine mais rápida (pelo histórico de latência) começa sozinha; se não
+  responder até o seu p95, a outra é disparada em paralelo (hedging). A primeira que
+  trouxer resultados suficientes vence e as demais são canceladas.
+* ``merge``: todas rodam em paralelo e os resultados são intercalados, sem duplicatas
+  por URL.
+
+Nos dois modos o resultado final passa pelo dedup perceptual (``dedup.py``).
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Final
+from urllib.parse import urlparse
+
+from clients.image_search import duck_client, google_client
+from clients.image_search.dedup import collapse_near_duplicates
+from config.constants import settings
+from logger import get_logger
+from utils.metrics import metrics
+
+log = get_logger(__name__)
+
+SEARCH_SECONDS = metrics.histogram(
+    "image_search_engine_seconds", "Latência de cada engine de busca de imagens", ("engine",)
+)
+SEARCH_FAILURES = metrics.counter(
+    "image_search_engine_failures_total", "Buscas que falharam por engine", ("engine",)
+)
+SEARCHES = metrics.histogram(
+    "image_search_seconds",
+    "Latência total da busca de imagens, incluindo o dedup",
+    ("mode",),
+)
+
+SearchFn = Callable[[str, int], Awaitable[list | None]]
+
+_DEFAULT_HEDGE_DELAY: Final[float] = 1.5
+_MIN_HEDGE_DELAY: Final[float] = 0.2
+_MIN_SAMPLES: Final[int] = 5
+
+
+class LatencyHistogram:
+    """Janela deslizante de latências (em segundos) de uma engine."""
+
+    def __init__(self, window: int = 100):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.failures = 0
+
+    def observe(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        idx = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[idx]
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+
+class SearchEngine:
+    """Engine de busca com o seu histograma de latência."""
+
+    def __init__(
+        self,
+        name: str,
+        search: SearchFn,
+        max_results: int,
+        available: Callable[[], bool] = lambda: True,
+    ):
+        self.name = name
+        self.search = search
+        self.max_results = max_results
+        self.available = available
+        self.histogram = LatencyHistogram()
+
+    def median(self) -> float:
+        p50 = self.histogram.quantile(0.5)
+        return p50 if p50 is not None else _DEFAULT_HEDGE_DELAY
+
+    def hedge_delay(self, quantile: float) -> float:
+        """Tempo de espera antes de disparar a próxima engine."""
+        if len(self.histogram) < _MIN_SAMPLES:
+            return _DEFAULT_HEDGE_DELAY
+        return max(_MIN_HEDGE_DELAY, self.histogram.quantile(quantile))
+
+
+def _url_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.netloc.lower().removeprefix('www.')}{parsed.path}"
+
+
+def dedup_results(results: list) -> list:
+    """
+    Remove duplicatas por URL (sem esquema/query).
+
+    Imagens iguais em URLs diferentes ficam para o dedup perceptual, que roda depois.
+    """
+    seen_urls: set[str] = set()
+    unique = []
+    for item in results:
+        link = item.get("link")
+        if not link:
+            continue
+        key = _url_key(link)
+        if key in seen_urls:
+            continue
+        seen_urls.add(key)
+        unique.append(item)
+    return unique
+
+
+def interleave(*result_lists: list) -> list:
+    merged = []
+    longest = max((len(r) for r in result_lists), default=0)
+    for i in range(longest):
+        for results in result_lists:
+            if i < len(results):
+                merged.append(results[i])
+    return merged
+
+
+class SearchOrchestrator:
+    """Coordena várias engines de busca de imagens."""
+
+    def __init__(
+        self,
+        engines: list[SearchEngine],
+        min_results: int = 3,
+        hedge_quantile: float = 0.95,
+    ):
+        self.engines = engines
+        self.min_results = min_results
+        self.hedge_quantile = hedge_quantile
+
+    def _ordered_engines(self) -> list[SearchEngine]:
+        """Engines disponíveis, da mais rápida para a mais lenta (mediana)."""
+        return sorted((e for e in self.engines if e.available()), key=SearchEngine.median)
+
+    async def _run(self, engine: SearchEngine, query: str) -> list:
+        start = time.perf_counter()
+        try:
+            results = await engine.search(query, engine.max_results) or []
+        except asyncio.CancelledError:
+            # cancelada por perder a corrida: levou pelo menos isso, e uma engine
+            # que sempre perde não pode parecer rápida para o hedging
+            elapsed = time.perf_counter() - start
+            engine.histogram.observe(elapsed)
+            SEARCH_SECONDS.observe(elapsed, engine=engine.name)
+            raise
+        except Exception as e:
+            # falhas lentas (timeout) também contam na latência da engine
+            elapsed = time.perf_counter() - start
+            engine.histogram.observe(elapsed)
+            SEARCH_SECONDS.observe(elapsed, engine=engine.name)
+            engine.histogram.failures += 1
+            SEARCH_FAILURES.inc(engine=engine.name)
+            log.warning("Engine %s falhou para %r: %s", engine.name, query, e)
+            return []
+
+        elapsed = time.perf_counter() - start
+        engine.histogram.observe(elapsed)
+        SEARCH_SECONDS.observe(elapsed, engine=engine.name)
+        log.debug("Engine %s: %d resultado(s) em %.2fs", engine.name, len(results), elapsed)
+        return results
+
+    async def race(self, query: str) -> tuple[list, str | None]:
+        """
+        Retorna ``(resultados, engine)`` da primeira engine com resultados suficientes.
+
+        As engines são disparadas em ordem de latência; a próxima só começa quando a
+        anterior falha, volta com poucos resultados ou passa do seu tempo de hedge.
+        """
+        pending_engines = self._ordered_engines()
+        running: dict[asyncio.Task, SearchEngine] = {}
+        best: tuple[list, str | None] = ([], None)
+
+        try:
+            while pending_engines or running:
+                if pending_engines and not running:
+                    engine = pending_engines.pop(0)
+                    running[asyncio.create_task(self._run(engine, query))] = engine
+
+                timeout = None
+                if pending_engines:
+                    timeout = min(e.hedge_delay(self.hedge_quantile) for e in running.values())
+
+                done, _ = await asyncio.wait(
+                    running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    engine = pending_engines.pop(0)
+                    log.info("Hedging: disparando %s para %r", engine.name, query)
+                    running[asyncio.create_task(self._run(engine, query))] = engine
+                    continue
+
+                for task in done:
+                    engine = running.pop(task)
+                    results = task.result()
+                    if len(results) >= self.min_results:
+                        return results, engine.name
+                    if len(results) > len(best[0]):
+                        best = (results, engine.name)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return best
+
+    async def merge(self, query: str) -> tuple[list, str | None]:
+        """Busca em todas as engines e intercala os resultados sem duplicatas."""
+        engines = self._ordered_engines()
+        if not engines:
+            return [], None
+
+        all_results = await asyncio.gather(*(self._run(e, query) for e in engines))
+        used = [e.name for e, r in zip(engines, all_results) if r]
+        merged = dedup_results(interleave(*all_results))
+        return merged, " + ".join(used) or None
+
+    async def search(self, query: str, mode: str = "race") -> tuple[list, str | None]:
+        """Busca no modo pedido e remove imagens quase idênticas do resultado."""
+        with SEARCHES.time(mode=mode):
+            if mode == "merge":
+                results, engine = await self.merge(query)
+            else:
+                results, engine = await self.race(query)
+            return await collapse_near_duplicates(results), engine
+
+
+google_engine = SearchEngine(
+    "Google",
+    google_client.search_images,
+    max_results=10,
+    available=google_client.is_configured,
+)
+duck_engine = SearchEngine("DuckDuckGo", duck_client.search_images, max_results=20)
+
+orchestrator = SearchOrchestrator(
+    [google_engine, duck_engine],
+    min_results=settings.image_search_min_results,
+)
@@ -0,0 +1,190 @@
+"""
+prefetch.py — pré-carrega e reduz as próximas imagens do paginator.
+
+Enquanto o usuário vê uma página, as próximas são baixadas em segundo plano,
+reduzidas com Pillow e guardadas num cache LRU em memória. O paginator envia a
+versão reduzida como anexo; páginas cujo download falhou são descartadas antes
+do usuário chegar nelas. A falha só fica no cache por ``FAILURE_TTL`` segundos:
+um erro passageiro não descarta a imagem das buscas seguintes.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import time
+from collections import OrderedDict
+from typing import Final
+
+import aiohttp
+from PIL import Image, UnidentifiedImageError
+
+from logger import get_logger
+from utils.metrics import metrics
+
+log = get_logger(__name__)
+
+CACHE_LOOKUPS = metrics.counter(
+    "cache_lookups_total", "Consultas a caches em memória por resultado", ("cache", "result")
+)
+PREFETCH_SECONDS = metrics.histogram(
+    "image_prefetch_seconds", "Download e redução de uma imagem do paginator", ("result",)
+)
+
+PREVIEW_NAME: Final[str] = "preview"
+THUMBNAIL_SIZE: Final[tuple[int, int]] = (800, 800)
+MAX_DOWNLOAD_BYTES: Final[int] = 8 * 1024 * 1024
+_FETCH_TIMEOUT: Final[float] = 6.0
+_JPEG_QUALITY: Final[int] = 85
+FAILURE_TTL: Final[float] = 60.0
+
+
+class ThumbnailCache:
+    """
+    Cache LRU de miniaturas (link -> (bytes, nome do arquivo), ou None se falhou).
+
+    Falhas expiram em ``failure_ttl`` segundos; miniaturas só saem pelo LRU.
+    """
+
+    def __init__(self, maxsize: int = 40, failure_ttl: float = FAILURE_TTL):
+        # link -> (miniatura, momento em que expira ou None)
+        self.cache: OrderedDict[str, tuple[tuple[bytes, str] | None, float | None]] = OrderedDict()
+        self.maxsize = maxsize
+        self.failure_ttl = failure_ttl
+
+    def _entry(self, link: str):
+        entry = self.cache.get(link)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self.cache[link]
+            return None
+        return entry
+
+    def __contains__(self, link: str) -> bool:
+        return self._entry(link) is not None
+
+    def get(self, link: str) -> tuple[bytes, str] | None:
+        entry = self._entry(link)
+        if entry is None:
+            return None
+        self.cache.move_to_end(link)
+        return entry[0]
+
+    def add(self, link: str, data: tuple[bytes, str] | None) -> None:
+        if link in self.cache:
+            del self.cache[link]
+        elif len(self.cache) >= self.maxsize:
+            self.cache.popitem(last=False)
+        expires_at = time.monotonic() + self.failure_ttl if data is None else None
+        self.cache[link] = (data, expires_at)
+
+
+def downscale(data: bytes) -> tuple[bytes, str]:
+    """
+    Reduz a imagem para caber em THUMBNAIL_SIZE e reencoda como JPEG.
+
+    Imagens animadas são mantidas como vieram para não perder a animação.
+    Retorna ``(bytes, nome do arquivo)``.
+    """
+    with Image.open(io.BytesIO(data)) as img:
+        if getattr(img, "is_animated", False):
+            return data, f"{PREVIEW_NAME}.{(img.format or 'gif').lower()}"
+
+        img.thumbnail(THUMBNAIL_SIZE)
+        if img.mode not in ("RGB", "L"):
+            img = img.convert("RGB")
+        out = io.BytesIO()
+        img.save(out, format="JPEG", quality=_JPEG_QUALITY, optimize=True)
+        return out.getvalue(), f"{PREVIEW_NAME}.jpg"
+
+
+class ImagePrefetcher:
+    """Baixa e reduz imagens em segundo plano, compartilhando uma sessão HTTP."""
+
+    def __init__(self, cache: ThumbnailCache | None = None):
+        self.cache = cache or ThumbnailCache()
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=6, limit_per_host=2, ttl_dns_cache=300)
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    def get(self, link: str) -> tuple[bytes, str] | None:
+        """Miniatura pronta para ``link``, ou None se ainda não baixou/falhou."""
+        thumbnail = self.cache.get(link)
+        CACHE_LOOKUPS.inc(cache="thumbnail", result="miss" if thumbnail is None else "hit")
+        return thumbnail
+
+    def failed(self, link: str) -> bool:
+        return link in self.cache and self.cache.get(link) is None
+
+    def schedule(self, links: list[str]) -> None:
+        """Dispara o prefetch dos links que ainda não estão no cache nem em andamento."""
+        for link in links:
+            if link in self.cache or link in self._tasks:
+                continue
+            task = asyncio.create_task(self._prefetch(link))
+            self._tasks[link] = task
+            task.add_done_callback(lambda _t, key=link: self._tasks.pop(key, None))
+
+    async def wait(self, link: str, timeout: float) -> tuple[bytes, str] | None:
+        """Espera o prefetch em andamento de ``link`` por até ``timeout`` segundos."""
+        task = self._tasks.get(link)
+        if task is not None:
+            await asyncio.wait({task}, timeout=timeout)
+        return self.cache.get(link)
+
+    async def _prefetch(self, link: str) -> None:
+        start = time.perf_counter()
+        try:
+            data = await self._download(link)
+            thumbnail = await asyncio.to_thread(downscale, data) if data else None
+        except (UnidentifiedImageError, OSError) as e:
+            log.debug("Imagem inválida em %s: %s", link, e)
+            thumbnail = None
+        except Exception as e:
+            log.debug("Erro no prefetch de %s: %s", link, type(e).__name__)
+            thumbnail = None
+        self.cache.add(link, thumbnail)
+        PREFETCH_SECONDS.observe(
+            time.perf_counter() - start, result="ok" if thumbnail is not None else "failed"
+        )
+
+    async def _download(self, link: str) -> bytes | None:
+        session = self._get_session()
+        try:
+            async with session.get(link, timeout=_FETCH_TIMEOUT, ssl=False) as resp:
+                if resp.status != 200:
+                    log.debug("Prefetch status %d para %s", resp.status, link)
+                    return None
+                if not resp.headers.get("Content-Type", "").lower().startswith("image/"):
+                    return None
+                if (resp.content_length or 0) > MAX_DOWNLOAD_BYTES:
+                    return None
+
+                body = bytearray()
+                async for chunk in resp.content.iter_chunked(64 * 1024):
+                    body.extend(chunk)
+                    if len(body) > MAX_DOWNLOAD_BYTES:
+                        return None
+                return bytes(body)
+        except asyncio.TimeoutError:
+            log.debug("Timeout no prefetch de %s", link)
+            return None
+
+    async def close(self) -> None:
+        for task in list(self._tasks.values()):
+            task.cancel()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+image_prefetcher = ImagePrefetcher()
+
+metrics.gauge(
+    "image_prefetch_in_flight",
+    "Prefetches de imagem em andamento",
+    lambda: len(image_prefetcher._tasks),
+)
@@ -5,12 +5,37 @@ import requests
 
 from config.constants import settings
 from logger import get_logger
+from utils.metrics import metrics
+from utils.tracing import tracer
 
 log = get_logger(__name__)
 
 # Buffer de renovação de token (em segundos)
 TOKEN_REFRESH_BUFFER = 120
 
+REQUEST_SECONDS = metrics.histogram(
+    "twitch_request_seconds", "Latência das chamadas HTTP à API da Twitch", ("endpoint",)
+)
+REQUESTS = metrics.counter(
+    "twitch_requests_total", "Chamadas HTTP à API da Twitch por status", ("endpoint", "status")
+)
+TOKEN_REFRESHES = metrics.counter("twitch_token_refreshes_total", "Renovações do token de app da Twitch")
+
+
+def _request(method: str, url: str, endpoint: str, **kwargs) -> requests.Response:
+    """``requests.request`` com latência e status registrados por endpoint."""
+    with tracer.span(f"http {method}", url=url, endpoint=f"twitch {endpoint}") as span:
+        try:
+            with REQUEST_SECONDS.time(endpoint=endpoint):
+                resp = requests.request(method, url, **kwargs)
+        except requests.RequestException:
+            REQUESTS.inc(endpoint=endpoint, status="error")
+            raise
+        REQUESTS.inc(endpoint=endpoint, status=str(resp.status_code))
+        if span is not None:
+            span.set_attribute("status", resp.status_code)
+        return resp
+
 
 class TwitchClient:
     def __init__(self):
@@ -52,7 +77,7 @@ class TwitchClient:
         }
 
         try:
-            resp = requests.post(url, params=params, timeout=10)
+            resp = _request("POST", url, "token", params=params, timeout=10)
             resp.raise_for_status()
         except requests.RequestException as e:
             raise RuntimeError(f"Erro de conexão ao obter token Twitch: {e}") from e
@@ -68,6 +93,7 @@ class TwitchClient:
         if not access_token:
             raise RuntimeError(f"Resposta inesperada ao obter token: {data}")
 
+        TOKEN_REFRESHES.inc()
         self._token = access_token
         self._token_expires_at = time.time() + int(expires_in) - TOKEN_REFRESH_BUFFER
         log.info("Token Twitch renovado. Expira em %.0f segundos", int(expires_in))
@@ -95,14 +121,14 @@ class TwitchClient:
         else:
             params["login"] = login_or_id.lower()
 
-        resp = requests.get(url, headers=headers, params=params, timeout=10)
+        resp = _request("GET", url, "users", headers=headers, params=params, timeout=10)
 
         # Se 401, renovar token e tentar novamente
         if resp.status_code == 401:
             log.warning("Token expirou ao buscar usuário Twitch. Renovando...")
             token = self.get_app_access_token(force_refresh=True)
             headers["Authorization"] = f"Bearer {token}"
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = _request("GET", url, "users", headers=headers, params=params, timeout=10)
 
         if resp.status_code != 200:
             raise RuntimeError(f"Falha ao buscar usuário Twitch: {resp.status_code} {resp.text}")
@@ -149,14 +175,14 @@ class TwitchClient:
             }
         }
 
-        resp = requests.post(url, headers=headers, json=body, timeout=10)
+        resp = _request("POST", url, "eventsub_create", headers=headers, json=body, timeout=10)
 
         # Se 401, renovar token e tentar novamente
         if resp.status_code == 401:
             log.warning("Token expirou ao criar subscription EventSub. Renovando...")
             token = self.get_app_access_token(force_refresh=True)
             headers["Authorization"] = f"Bearer {token}"
-            resp = requests.post(url, headers=headers, json=body, timeout=10)
+            resp = _request("POST", url, "eventsub_create", headers=headers, json=body, timeout=10)
 
         # Trata caso onde já existe subscription (409) sem lançar
         if resp.status_code == 409:
@@ -191,7 +217,7 @@ class TwitchClient:
         token_refreshed = False
 
         while True:
-            resp = requests.get(url, headers=headers, params=params, timeout=10)
+            resp = _request("GET", url, "eventsub_list", headers=headers, params=params, timeout=10)
 
             # Se 401, renovar token UMA VEZ e tentar novamente
             if resp.status_code == 401 and not token_refreshed:
@@ -199,7 +225,7 @@ class TwitchClient:
                 token = self.get_app_access_token(force_refresh=True)
                 headers["Authorization"] = f"Bearer {token}"
                 token_refreshed = True
-                resp = requests.get(url, headers=headers, params=params, timeout=10)
+                resp = _request("GET", url, "eventsub_list", headers=headers, params=params, timeout=10)
 
             if resp.status_code != 200:
                 raise RuntimeError(f"Falha ao listar EventSub: {resp.status_code} {resp.text}")
@@ -221,3 +247,14 @@ class TwitchClient:
 
         log.info("EventSub subscriptions listadas com sucesso. Total: %d", len(all_items))
         return {"total": len(all_items), "data": all_items}
+
+
+_client: Optional[TwitchClient] = None
+
+
+def get_client() -> TwitchClient:
+    """Cliente compartilhado, criado no primeiro uso (mantém o token em cache entre chamadas)."""
+    global _client
+    if _client is None:
+        _client = TwitchClient()
+    return _client
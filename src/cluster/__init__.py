@@ -0,0 +1,19 @@
+from .ipc import IPCClient, IPCError, IPCHub
+from .leader import FileLease, LeaderElector, SQLiteLease, create_elector
+from .supervisor import Supervisor, run_cluster
+from .worker import attach, claim_channels, cluster_client
+
+__all__ = [
+    "FileLease",
+    "IPCClient",
+    "IPCError",
+    "IPCHub",
+    "LeaderElector",
+    "SQLiteLease",
+    "Supervisor",
+    "attach",
+    "claim_channels",
+    "cluster_client",
+    "create_elector",
+    "run_cluster",
+]
@@ -0,0 +1,280 @@
+"""
+ipc.py — barramento local entre o supervisor e os workers do cluster.
+
+O supervisor abre um socket Unix (``IPCHub``) e cada worker se conecta com um
+``IPCClient``. As mensagens são objetos JSON, um por linha, e há dois padrões:
+
+* ``publish``: difusão para todos os outros workers (ex.: um take registrado ou um
+  cooldown disparado, para que o estado em memória de todos continue igual);
+* ``request``: pedido para o worker dono de um canal, com resposta (ex.: o worker
+  que recebeu o ``/event`` pede ao dono do canal de notificações que envie).
+  Um worker vira dono de um canal ao chamar ``claim`` depois do ``on_ready``.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import os
+from typing import Any, Awaitable, Callable, Coroutine
+
+from logger import get_logger
+
+log = get_logger(__name__)
+
+# linhas maiores que isso derrubam a conexão (o estado dos takes cabe com folga)
+MAX_MESSAGE = 4 * 1024 * 1024
+RECONNECT_DELAY = 1.0
+
+Handler = Callable[[Any], Awaitable[Any]]
+Listener = Callable[[Any], None]
+
+
+class IPCError(Exception):
+    """Pedido que não pôde ser atendido por nenhum worker."""
+
+
+async def _send(writer: asyncio.StreamWriter, message: dict) -> None:
+    writer.write(json.dumps(message, ensure_ascii=False).encode() + b"\n")
+    await writer.drain()
+
+
+async def _messages(reader: asyncio.StreamReader):
+    while True:
+        line = await reader.readline()
+        if not line:
+            return
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            log.warning("Mensagem IPC inválida descartada: %r", line[:200])
+
+
+class IPCHub:
+    """Lado do supervisor: conhece os workers e roteia as mensagens entre eles."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.workers: dict[int, asyncio.StreamWriter] = {}
+        self.claims: dict[int, int] = {}
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> None:
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.path, limit=MAX_MESSAGE)
+        log.info("Barramento IPC ouvindo em %s", self.path)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for writer in list(self.workers.values()):
+            writer.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        worker_id = None
+        try:
+            async for message in _messages(reader):
+                op = message.get("op")
+                if op == "hello":
+                    worker_id = message["worker"]
+                    self.workers[worker_id] = writer
+                    log.info("Worker %s conectado ao barramento (shards %s)", worker_id, message.get("shards"))
+                elif worker_id is None:
+                    log.warning("Mensagem IPC antes do hello descartada: %s", op)
+                else:
+                    await self._route(worker_id, message)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as e:
+            log.warning("Conexão IPC do worker %s perdida: %s", worker_id, e)
+        finally:
+            if worker_id is not None and self.workers.get(worker_id) is writer:
+                del self.workers[worker_id]
+                self.claims = {channel: owner for channel, owner in self.claims.items() if owner != worker_id}
+                log.info("Worker %s saiu do barramento", worker_id)
+            writer.close()
+
+    async def _deliver(self, worker_id: int, message: dict) -> bool:
+        writer = self.workers.get(worker_id)
+        if writer is None:
+            return False
+        try:
+            await _send(writer, message)
+            return True
+        except ConnectionError as e:
+            log.warning("Falha ao entregar mensagem IPC ao worker %s: %s", worker_id, e)
+            return False
+
+    async def _route(self, sender: int, message: dict) -> None:
+        op = message.get("op")
+        if op == "claim":
+            self.claims[message["channel"]] = sender
+        elif op == "publish":
+            for worker_id in list(self.workers):
+                if worker_id != sender:
+                    await self._deliver(worker_id, message)
+        elif op == "request":
+            owner = self.claims.get(message["channel"])
+            forwarded = owner is not None and await self._deliver(owner, {**message, "from": sender})
+            if not forwarded:
+                await self._deliver(sender, {
+                    "op": "reply",
+                    "id": message["id"],
+                    "ok": False,
+                    "error": f"nenhum worker é dono do canal {message['channel']}",
+                })
+        elif op == "reply":
+            await self._deliver(message.pop("to"), message)
+        else:
+            log.warning("Operação IPC desconhecida do worker %s: %s", sender, op)
+
+
+class IPCClient:
+    """Lado do worker: publica, assina tópicos e atende/faz pedidos por canal."""
+
+    def __init__(self, path: str, worker_id: int, shard_ids: list[int] | None = None):
+        self.path = path
+        self.worker_id = worker_id
+        self.shard_ids = shard_ids
+        self.on_lost: Callable[[], None] | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+        self._listeners: dict[str, list[Listener]] = {}
+        self._handlers: dict[str, Handler] = {}
+        self._claims: set[int] = set()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._parent = os.getppid()
+        self._background: set[asyncio.Task] = set()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> None:
+        reader, writer = await asyncio.open_unix_connection(self.path, limit=MAX_MESSAGE)
+        self._writer = writer
+        await _send(writer, {"op": "hello", "worker": self.worker_id, "shards": self.shard_ids})
+        # reconexão: o hub esquece os donos de canal de quem caiu
+        for channel_id in self._claims:
+            await _send(writer, {"op": "claim", "channel": channel_id})
+        self._reader_task = asyncio.create_task(self._read(reader))
+        log.info("Worker %s conectado ao barramento IPC", self.worker_id)
+
+    async def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def subscribe(self, topic: str, listener: Listener) -> None:
+        """Chama ``listener(data)`` a cada ``publish`` de outro worker em ``topic``."""
+        self._listeners.setdefault(topic, []).append(listener)
+
+    def handle(self, topic: str, handler: Handler) -> None:
+        """Atende os pedidos de ``topic`` feitos a este worker como dono do canal."""
+        self._handlers[topic] = handler
+
+    async def publish(self, topic: str, data: Any) -> None:
+        if not self.connected:
+            log.debug("Barramento IPC desconectado, publish de %s descartado", topic)
+            return
+        await _send(self._writer, {"op": "publish", "topic": topic, "data": data})
+
+    def publish_nowait(self, topic: str, data: Any) -> None:
+        """``publish`` para quem não pode esperar (código síncrono no event loop)."""
+        self.spawn(self.publish(topic, data))
+
+    def spawn(self, coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+        """Roda ``coro`` em segundo plano, guardando a task até ela terminar."""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    async def claim(self, channel_id: int) -> None:
+        """Passa a receber os pedidos destinados a ``channel_id``."""
+        self._claims.add(channel_id)
+        if self.connected:
+            await _send(self._writer, {"op": "claim", "channel": channel_id})
+
+    async def request(self, channel_id: int, topic: str, data: Any, timeout: float = 15.0) -> Any:
+        """Pede ao dono de ``channel_id`` que atenda ``topic``; levanta ``IPCError`` se ninguém atender."""
+        if not self.connected:
+            raise IPCError("barramento IPC desconectado")
+        request_id = f"{self.worker_id}:{next(self._ids)}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await _send(self._writer, {
+                "op": "request", "id": request_id, "channel": channel_id, "topic": topic, "data": data,
+            })
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise IPCError(f"sem resposta para {topic} em {timeout:.0f}s") from None
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read(self, reader: asyncio.StreamReader) -> None:
+        try:
+            async for message in _messages(reader):
+                op = message.get("op")
+                if op == "publish":
+                    self._dispatch(message["topic"], message.get("data"))
+                elif op == "request":
+                    self.spawn(self._serve(message))
+                elif op == "reply":
+                    self._resolve(message)
+        except (ConnectionError, ValueError) as e:
+            log.warning("Conexão com o barramento IPC perdida: %s", e)
+        self._writer = None
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(IPCError("barramento IPC desconectado"))
+        self.spawn(self._reconnect())
+
+    def _dispatch(self, topic: str, data: Any) -> None:
+        for listener in self._listeners.get(topic, []):
+            try:
+                listener(data)
+            except Exception as e:
+                log.error("Erro ao aplicar mensagem IPC de %s: %s", topic, e, exc_info=True)
+
+    async def _serve(self, message: dict) -> None:
+        reply = {"op": "reply", "id": message["id"], "to": message["from"]}
+        handler = self._handlers.get(message["topic"])
+        try:
+            if handler is None:
+                raise IPCError(f"worker {self.worker_id} não atende {message['topic']}")
+            reply.update(ok=True, data=await handler(message.get("data")))
+        except Exception as e:
+            log.error("Erro ao atender pedido IPC %s: %s", message["topic"], e, exc_info=True)
+            reply.update(ok=False, error=str(e))
+        if self.connected:
+            await _send(self._writer, reply)
+
+    def _resolve(self, message: dict) -> None:
+        future = self._pending.get(message["id"])
+        if future is None or future.done():
+            return
+        if message.get("ok"):
+            future.set_result(message.get("data"))
+        else:
+            future.set_exception(IPCError(message.get("error", "erro desconhecido")))
+
+    async def _reconnect(self) -> None:
+        while os.getppid() == self._parent:
+            await asyncio.sleep(RECONNECT_DELAY)
+            try:
+                await self.connect()
+                return
+            except OSError:
+                continue
+        # o supervisor morreu: sem ele ninguém reinicia nem coordena este worker
+        log.critical("Supervisor do cluster não está mais rodando")
+        if self.on_lost is not None:
+            self.on_lost()
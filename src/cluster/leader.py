@@ -0,0 +1,201 @@
+"""
+leader.py — eleição de líder entre réplicas do bot, por lease.
+
+Com duas réplicas (containers) rodando para disponibilidade, só o líder roda os
+jobs agendados e aceita notificações do ``/event``; a outra fica de reserva e
+assume quando o líder some.
+
+``LEADER_ELECTION`` escolhe o lease:
+
+* ``file``: lock exclusivo (``flock``) em ``LEADER_LEASE_PATH``, num volume
+  compartilhado pelas réplicas da mesma máquina. O sistema operacional solta o
+  lock quando o processo do líder morre, e a reserva assume na tentativa seguinte
+  (até ``LEADER_LEASE_TTL / 3`` segundos).
+* ``sqlite``: uma linha com dono e validade no banco em ``LEADER_LEASE_PATH``,
+  renovada a cada ``LEADER_LEASE_TTL / 3`` segundos. Se o líder parar de renovar
+  (morreu ou travou), a reserva assume em até ``LEADER_LEASE_TTL * 4 / 3``.
+
+Um líder que não consegue renovar dentro do TTL deixa de se considerar líder
+antes que a reserva possa assumir, então nunca há dois líderes ao mesmo tempo.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+from pathlib import Path
+from typing import Callable
+
+from config.constants import settings
+from logger import get_logger
+from utils.sharding import parse_shard_ids
+
+log = get_logger(__name__)
+
+
+class FileLease:
+    """Lease por ``flock``: quem segura o lock é o líder."""
+
+    def __init__(self, path: str | Path, holder: str):
+        self.path = Path(path)
+        self.holder = holder
+        self._fd: int | None = None
+
+    def acquire(self, ttl: float) -> bool:
+        import fcntl
+
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                return False
+            self._fd = fd
+        # heartbeat: quem está segurando e desde quando renovou (só informativo)
+        os.ftruncate(self._fd, 0)
+        os.pwrite(self._fd, f"{self.holder} {time.time():.0f}\n".encode(), 0)
+        return True
+
+    def release(self) -> None:
+        if self._fd is not None:
+            import fcntl
+
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class SQLiteLease:
+    """Lease numa linha do SQLite com dono e validade."""
+
+    SCHEMA = "CREATE TABLE IF NOT EXISTS lease (name TEXT PRIMARY KEY, holder TEXT NOT NULL, expires_at REAL NOT NULL)"
+
+    def __init__(self, path: str | Path, holder: str, name: str):
+        self.path = Path(path)
+        self.holder = holder
+        self.name = name
+        self._conn: sqlite3.Connection | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(self.SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def acquire(self, ttl: float) -> bool:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT holder, expires_at FROM lease WHERE name = ?", (self.name,)).fetchone()
+            if row is not None and row[0] != self.holder and row[1] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO lease (name, holder, expires_at) VALUES (?, ?, ?)",
+                (self.name, self.holder, now + ttl),
+            )
+            return True
+
+    def release(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM lease WHERE name = ? AND holder = ?", (self.name, self.holder))
+        conn.close()
+        self._conn = None
+
+
+class LeaderElector:
+    """Tenta pegar/renovar o lease periodicamente e diz se este processo é o líder."""
+
+    def __init__(self, lease: FileLease | SQLiteLease | None, ttl: float):
+        """
+        Args:
+            lease: Lease disputado pelas réplicas; ``None`` desliga a eleição (sempre líder).
+            ttl:   Validade do lease em segundos; renovado a cada ``ttl / 3``.
+        """
+        self.lease = lease
+        self.ttl = ttl
+        self._leader = lease is None
+        self._renewed_at = float("inf") if lease is None else 0.0
+        self._listeners: list[Callable[[bool], None]] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.lease is not None
+
+    @property
+    def is_leader(self) -> bool:
+        # sem renovação dentro do TTL a reserva já pode ter assumido
+        return self._leader and time.monotonic() - self._renewed_at < self.ttl
+
+    def subscribe(self, listener: Callable[[bool], None]) -> None:
+        """Chama ``listener(é_líder)`` a cada troca de papel."""
+        self._listeners.append(listener)
+
+    def start(self) -> None:
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        # solta o lease na hora para a reserva não esperar o TTL
+        await asyncio.to_thread(self.lease.release)
+        self._set(False)
+
+    async def _run(self) -> None:
+        while True:
+            attempt_at = time.monotonic()
+            try:
+                acquired = await asyncio.to_thread(self.lease.acquire, self.ttl)
+            except Exception as e:
+                # falha temporária (ex.: banco ocupado): continua líder até o TTL vencer
+                log.warning("Erro ao renovar o lease de líder: %s", e)
+                self._set(self.is_leader)
+            else:
+                if acquired:
+                    self._renewed_at = attempt_at
+                self._set(acquired)
+            await asyncio.sleep(self.ttl / 3)
+
+    def _set(self, leader: bool) -> None:
+        if leader == self._leader:
+            return
+        self._leader = leader
+        if leader:
+            log.info("Este processo (%s) virou o líder", self.lease.holder)
+        else:
+            log.warning("Este processo (%s) deixou de ser o líder", self.lease.holder)
+        for listener in self._listeners:
+            listener(leader)
+
+
+def create_elector() -> LeaderElector:
+    """Eleitor configurado por ``LEADER_ELECTION`` (``none``, ``file`` ou ``sqlite``)."""
+    kind = settings.leader_election.lower()
+    if kind == "none":
+        return LeaderElector(None, settings.leader_lease_ttl)
+
+    holder = f"{socket.gethostname()}:{os.getpid()}"
+    # workers do cluster com shards diferentes não disputam o mesmo lease
+    shard_ids = parse_shard_ids(settings.shard_ids)
+    name = "shards-" + ("-".join(map(str, shard_ids)) if shard_ids else "all")
+    if kind == "file":
+        path = Path(settings.leader_lease_path)
+        lease = FileLease(path.with_name(f"{path.name}.{name}.lock"), holder)
+    elif kind == "sqlite":
+        lease = SQLiteLease(settings.leader_lease_path, holder, name)
+    else:
+        raise ValueError(f"LEADER_ELECTION desconhecido: {kind}")
+    return LeaderElector(lease, settings.leader_lease_ttl)
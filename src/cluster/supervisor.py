@@ -0,0 +1,170 @@
+"""
+supervisor.py — sobe N processos do bot, cada um com uma faixa de shards.
+
+Com ``CLUSTER_WORKERS`` > 1 (ou 0, um por núcleo) o ``__main__.py`` roda o
+supervisor em vez do bot. Ele divide os shards entre os workers, abre o barramento
+IPC e reinicia com backoff qualquer worker que morrer.
+
+Cada worker é o bot normal rodando com ``SHARDING=true`` e as variáveis abaixo:
+
+* ``SHARD_COUNT`` / ``SHARD_IDS``: a faixa de shards do worker;
+* ``CLUSTER_WORKER_ID`` / ``CLUSTER_IPC_PATH``: identidade e barramento;
+* ``HTTP_SERVER_PORT``: o worker 0 fica com a porta configurada (``/event`` e
+  healthcheck); os demais usam as seguintes, só para health e métricas;
+* ``SCHEDULER_STATE_FILE``: um arquivo de estado por worker.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+
+from config.constants import settings
+from logger import get_logger
+from .ipc import IPCHub
+
+log = get_logger(__name__)
+
+GATEWAY_BOT_URL = "https://discord.com/api/v10/gateway/bot"
+MAX_BACKOFF = 60.0
+# um worker que ficou de pé esse tempo volta ao backoff mínimo se cair
+STABLE_AFTER = 60.0
+STOP_TIMEOUT = 10.0
+
+
+def split_shards(shard_count: int, workers: int) -> list[list[int]]:
+    """Faixas contíguas de shards, o mais iguais possível."""
+    return [
+        list(range(i * shard_count // workers, (i + 1) * shard_count // workers))
+        for i in range(workers)
+    ]
+
+
+async def recommended_shards() -> int:
+    """Número de shards recomendado pelo Discord para o bot."""
+    headers = {"Authorization": f"Bot {settings.token}"}
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_BOT_URL, headers=headers) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
+    return data["shards"]
+
+
+class Worker:
+    """Um processo do bot e o seu histórico de reinícios."""
+
+    def __init__(self, worker_id: int, shard_ids: list[int], env: dict[str, str]):
+        self.worker_id = worker_id
+        self.shard_ids = shard_ids
+        self.env = env
+        self.process: asyncio.subprocess.Process | None = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.backoff = 1.0
+
+    async def spawn(self, entrypoint: Path) -> None:
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, str(entrypoint), env=self.env, cwd=entrypoint.parent,
+        )
+        self.started_at = time.monotonic()
+        log.info("Worker %s iniciado (pid %s, shards %s)", self.worker_id, self.process.pid, self.shard_ids)
+
+
+class Supervisor:
+    """Mantém os workers do cluster rodando."""
+
+    def __init__(self, workers: int, shard_count: int, entrypoint: Path, ipc_path: str):
+        self.entrypoint = entrypoint
+        self.hub = IPCHub(ipc_path)
+        self.workers = [
+            Worker(worker_id, shard_ids, self._env(worker_id, shard_ids, shard_count, ipc_path))
+            for worker_id, shard_ids in enumerate(split_shards(shard_count, workers))
+        ]
+        self._stopping = asyncio.Event()
+
+    @staticmethod
+    def _env(worker_id: int, shard_ids: list[int], shard_count: int, ipc_path: str) -> dict[str, str]:
+        state_file = Path(settings.scheduler_state_file)
+        return {
+            **os.environ,
+            "SHARDING": "true",
+            "SHARD_COUNT": str(shard_count),
+            "SHARD_IDS": f"{shard_ids[0]}-{shard_ids[-1]}",
+            "CLUSTER_WORKER_ID": str(worker_id),
+            "CLUSTER_IPC_PATH": ipc_path,
+            "HTTP_SERVER_PORT": str(settings.http_server_port + worker_id),
+            "SCHEDULER_STATE_FILE": str(state_file.with_name(f"{state_file.stem}.worker{worker_id}{state_file.suffix}")),
+        }
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, self._stopping.set)
+
+        await self.hub.start()
+        try:
+            await asyncio.gather(*(self._keep_alive(worker) for worker in self.workers))
+        finally:
+            await self._stop_all()
+            await self.hub.stop()
+
+    async def _keep_alive(self, worker: Worker) -> None:
+        while not self._stopping.is_set():
+            await worker.spawn(self.entrypoint)
+            exited = asyncio.create_task(worker.process.wait())
+            stopping = asyncio.create_task(self._stopping.wait())
+            await asyncio.wait({exited, stopping}, return_when=asyncio.FIRST_COMPLETED)
+            stopping.cancel()
+            if self._stopping.is_set():
+                # Ctrl+C chega a todo o grupo de processos; o worker pode ter saído junto
+                exited.cancel()
+                return
+
+            uptime = time.monotonic() - worker.started_at
+            if uptime > STABLE_AFTER:
+                worker.backoff = 1.0
+            worker.restarts += 1
+            log.error(
+                "Worker %s saiu com código %s após %.0fs; reiniciando em %.0fs",
+                worker.worker_id, worker.process.returncode, uptime, worker.backoff,
+            )
+            try:
+                await asyncio.wait_for(self._stopping.wait(), worker.backoff)
+                return
+            except asyncio.TimeoutError:
+                pass
+            worker.backoff = min(worker.backoff * 2, MAX_BACKOFF)
+
+    async def _stop_all(self) -> None:
+        running = [w.process for w in self.workers if w.process and w.process.returncode is None]
+        log.info("Encerrando %d worker(s)...", len(running))
+        for process in running:
+            process.terminate()
+        try:
+            await asyncio.wait_for(asyncio.gather(*(p.wait() for p in running)), STOP_TIMEOUT)
+        except asyncio.TimeoutError:
+            for process in running:
+                if process.returncode is None:
+                    log.warning("Worker pid %s não encerrou, matando", process.pid)
+                    process.kill()
+
+
+async def run_cluster(entrypoint: Path) -> None:
+    """Ponto de entrada do modo cluster (chamado pelo ``__main__.py``)."""
+    workers = settings.cluster_workers or os.cpu_count() or 1
+    if settings.shard_count is None:
+        recommended = await recommended_shards()
+        log.info("Discord recomenda %d shard(s)", recommended)
+        # cada worker precisa de pelo menos um shard
+        shard_count = max(recommended, workers)
+    else:
+        shard_count = settings.shard_count
+        workers = min(workers, shard_count)
+
+    log.info("Cluster com %d worker(s) e %d shard(s)", workers, shard_count)
+    await Supervisor(workers, shard_count, entrypoint, settings.cluster_ipc_path).run()
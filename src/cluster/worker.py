@@ -0,0 +1,60 @@
+"""
+worker.py — o lado do bot no cluster.
+
+Liga o bot ao barramento IPC do supervisor:
+
+* com o backend de estado em memória, takes e cooldowns alterados aqui são
+  publicados e aplicados nos outros workers, então um take registrado ou um
+  cooldown disparado vale para o cluster todo (com sqlite/redis o backend já é
+  compartilhado); o arquivo de takes só é gravado pelo worker 0;
+* o worker dono do canal de notificações atende as notificações recebidas pelo
+  ``/event`` de outro worker (ver ``server/discord_sender.py``).
+"""
+from __future__ import annotations
+
+from config.constants import settings
+from config.take_helper import take_store
+from logger import get_logger
+from state import state
+from utils import cooldown
+from utils.sharding import owns_channel, parse_shard_ids
+from .ipc import IPCClient
+
+log = get_logger(__name__)
+
+
+def cluster_client() -> IPCClient | None:
+    """Cliente do barramento se este processo é um worker do cluster."""
+    if settings.cluster_worker_id is None:
+        return None
+    return IPCClient(settings.cluster_ipc_path, settings.cluster_worker_id, parse_shard_ids(settings.shard_ids))
+
+
+async def attach(bot, client: IPCClient) -> None:
+    """Conecta ao barramento e liga a replicação de estado e o atendimento de pedidos."""
+    # sem supervisor o worker encerra; o supervisor novo sobe outro no lugar
+    client.on_lost = lambda: client.spawn(bot.close())
+
+    if not state.shared:
+        # cada worker manda só o tipo de take que alterou; o worker 0 mescla e grava o arquivo
+        take_store.file_owner = client.worker_id == 0
+        take_store.replicate_with(lambda change: client.publish_nowait("takes", change))
+        client.subscribe("takes", lambda change: client.spawn(take_store.apply_remote(change)))
+
+        cooldown.replicate_with(lambda *data: client.publish_nowait("cooldown", list(data)))
+        client.subscribe("cooldown", lambda data: client.spawn(cooldown.apply_remote(*data)))
+
+    async def notify(data: dict) -> None:
+        from server.discord_sender import send_to_discord
+        await send_to_discord(bot, data["channel_id"], data["streamer"], data["status"], data["timestamp"])
+
+    client.handle("notify", notify)
+    await client.connect()
+
+
+async def claim_channels(bot, client: IPCClient) -> None:
+    """Anuncia ao barramento os canais configurados que ficam nos shards deste worker."""
+    for channel_id in {settings.notification_channel_id, settings.announce_channel_id}:
+        if channel_id and owns_channel(bot, channel_id):
+            await client.claim(channel_id)
+            log.info("Worker %s é dono do canal %s", client.worker_id, channel_id)
@@ -1,3 +1,5 @@
 from cogs._base import AutoCog
+from cogs._loader import CogLoader
+from cogs.manifest import COGS, CogSpec
 
-__all__ = ["AutoCog"]
\ No newline at end of file
+__all__ = ["AutoCog", "COGS", "CogLoader", "CogSpec"]
@@ -1,12 +1,27 @@
 from __future__ import annotations
 
+import functools
 import importlib
 import importlib.resources
+import inspect
 import pkgutil
 import sys
 
 from discord.ext import commands
 
+from utils.tracing import tracer
+
+
+def _traced_listener(cog_name: str, func):
+    name = f"listener {cog_name}.{func.__name__}"
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        with tracer.span(name):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
 
 class AutoCog(commands.Cog):
     _registry: list[type] = []
@@ -14,6 +29,27 @@ class AutoCog(commands.Cog):
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
         AutoCog._registry.append(cls)
+        # roda antes do CogMeta coletar os listeners, que herdam __cog_listener__ via wraps
+        for attr, value in list(cls.__dict__.items()):
+            if inspect.iscoroutinefunction(value) and hasattr(value, "__cog_listener__"):
+                setattr(cls, attr, _traced_listener(cls.__name__, value))
+
+    async def cog_before_invoke(self, ctx: commands.Context) -> None:
+        name = ctx.command.qualified_name
+        ctx.bot.watchdog.track(name)
+        span = tracer.start_span(
+            f"command {name}",
+            cog=type(self).__name__,
+            guild=ctx.guild.id if ctx.guild else 0,
+            channel=ctx.channel.id,
+        )
+        ctx.trace = (span, tracer.activate(span))
+
+    async def cog_after_invoke(self, ctx: commands.Context) -> None:
+        ctx.bot.watchdog.untrack()
+        span, token = getattr(ctx, "trace", (None, None))
+        tracer.deactivate(token)
+        tracer.end_span(span, "comando falhou" if ctx.command_failed else None)
 
     @classmethod
     def load_all(cls) -> None:
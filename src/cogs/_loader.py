@@ -0,0 +1,127 @@
+"""
+_loader.py — carrega os cogs do manifesto em paralelo e registra stubs dos lazy.
+
+Os módulos dos cogs são importados em threads (o import de ``ddgs``, ``PIL`` etc.
+é síncrono) e os ``add_cog`` — que rodam ``cog_load`` — acontecem concorrentemente.
+Um cog que falha é logado e não impede os demais.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib
+import importlib.util
+import pkgutil
+import time
+
+from discord.ext import commands
+
+from cogs._base import AutoCog
+from cogs.manifest import CogSpec
+from logger import get_logger
+
+log = get_logger(__name__)
+
+LAZY_HELP = "(carregado no primeiro uso)"
+
+
+def _missing_requirements(spec: CogSpec) -> list[str]:
+    return [name for name in spec.requires if importlib.util.find_spec(name) is None]
+
+
+class CogLoader:
+    """Carrega os cogs do manifesto no bot."""
+
+    def __init__(self, bot: commands.Bot, specs: list[CogSpec]):
+        self.bot = bot
+        self.specs = specs
+        self.timings: dict[str, float] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    async def load_all(self) -> None:
+        start = time.perf_counter()
+        eager = [spec for spec in self.specs if not spec.lazy] + self._unlisted()
+        lazy = [spec for spec in self.specs if spec.lazy]
+
+        await asyncio.gather(*(self._load(spec) for spec in eager))
+        for spec in lazy:
+            self._register_stubs(spec)
+
+        log.info(
+            "%d cog(s) carregado(s) e %d sob demanda em %.2fs",
+            len(self.bot.cogs), len(lazy), time.perf_counter() - start,
+        )
+
+    def _unlisted(self) -> list[CogSpec]:
+        """Módulos em ``cogs/`` fora do manifesto (mantém a descoberta automática)."""
+        listed = {spec.module for spec in self.specs}
+        package = importlib.import_module("cogs")
+        specs = []
+        for module_info in pkgutil.walk_packages(package.__path__, prefix="cogs.", onerror=lambda _: None):
+            name = module_info.name
+            if module_info.ispkg or name in listed or name.rsplit(".", 1)[-1].startswith("_") or name == "cogs.manifest":
+                continue
+            specs.append(CogSpec(name, ""))
+        return specs
+
+    async def _import(self, spec: CogSpec):
+        missing = _missing_requirements(spec)
+        if missing:
+            raise ModuleNotFoundError(f"dependências ausentes: {', '.join(missing)}")
+        return await asyncio.to_thread(importlib.import_module, spec.module)
+
+    async def _load(self, spec: CogSpec) -> bool:
+        start = time.perf_counter()
+        try:
+            module = await self._import(spec)
+            if spec.cls:
+                classes = [getattr(module, spec.cls)]
+            else:
+                classes = [cls for cls in AutoCog._registry if cls.__module__ == spec.module]
+            for cog_class in classes:
+                await self.bot.add_cog(cog_class(self.bot))
+        except Exception as e:
+            log.error("Erro COG: %r: %s", spec, e, exc_info=True)
+            return False
+
+        elapsed = time.perf_counter() - start
+        self.timings[spec.module] = elapsed
+        log.info("COG: %r carregado em %.3fs", spec, elapsed)
+        return True
+
+    def _register_stubs(self, spec: CogSpec) -> None:
+        for name, aliases in spec.commands.items():
+            if any(self.bot.get_command(n) is not None for n in (name, *aliases)):
+                # o cog real chegou a registrar o comando antes de falhar
+                continue
+            self.bot.add_command(
+                commands.Command(self._stub(spec), name=name, aliases=list(aliases), help=LAZY_HELP)
+            )
+
+    def _remove_stubs(self, spec: CogSpec) -> None:
+        for name in spec.commands:
+            self.bot.remove_command(name)
+
+    def _stub(self, spec: CogSpec):
+        async def stub(ctx: commands.Context):
+            if not await self.load_lazy(spec):
+                await ctx.send("Esse comando não está disponível agora 😿")
+                return
+            # reprocessa a mensagem, agora resolvendo para o comando real
+            real_ctx = await self.bot.get_context(ctx.message)
+            if real_ctx.command is not None and real_ctx.command.callback is not stub:
+                await self.bot.invoke(real_ctx)
+
+        return stub
+
+    async def load_lazy(self, spec: CogSpec) -> bool:
+        """Troca os stubs de ``spec`` pelo cog real. Retorna se o cog está carregado."""
+        lock = self._locks.setdefault(spec.module, asyncio.Lock())
+        async with lock:
+            if spec.module in self.timings:
+                return True
+            log.info("Carregando cog sob demanda: %r", spec)
+            self._remove_stubs(spec)
+            if await self._load(spec):
+                return True
+            self._register_stubs(spec)
+            return False
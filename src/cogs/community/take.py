@@ -1,34 +1,14 @@
-from datetime import datetime
-
 from discord.ext.commands import command, Bot
 
 from clients.generic.http import xingar
 from cogs import AutoCog
-from config.take_helper import load_takes_json, days_since_last_take, save_takes_json
+from config.take_helper import days_since_last_take, take_store
 from logger import get_logger
 
 log = get_logger(__name__)
 
 async def generic_take(ctx, take_type: str):
-    data = load_takes_json()
-
-    if take_type not in data:
-        data[take_type] = {
-            "last_take": None,
-            "record": 0,
-            "total": 0
-        }
-
-    take_data = data[take_type]
-    last_take = take_data["last_take"]
-    current_days = days_since_last_take(last_take) if last_take else 0
-
-    if current_days > take_data["record"]:
-        take_data["record"] = current_days
-
-    take_data["last_take"] = datetime.now().isoformat()
-    take_data["total"] += 1
-    save_takes_json(data)
+    take_data = await take_store.register_take(take_type)
 
     await ctx.send(
         f"ESTAMOS HÁ 0 DIAS SEM {take_type.upper()}. \n"
@@ -46,11 +26,11 @@ class Take(AutoCog):
     @command(name="take")
     async def take(self, ctx):
         """Mostra o status dos takes"""
-        data = load_takes_json()
+        data = await take_store.load()
         response = "STATUS DOS TAKES:\n"
 
+        log.debug("Montando status de %d take(s)", len(data))
         for take_type, take_data in data.items():
-            log.info(f"Processando take: {take_type} com dados: {take_data}")
             if not isinstance(take_data, dict):
                 continue
 
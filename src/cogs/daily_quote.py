@@ -1,14 +1,13 @@
 import json
 import os
 import random
-from datetime import date, time, timezone, timedelta
-
-from discord.ext import tasks
-from discord.ext.commands import Cog
+from datetime import date, timezone, timedelta
 
 from cogs import AutoCog
 from config.constants import settings
 from logger import get_logger
+from scheduler import CronTrigger
+from utils.sharding import owns_channel
 
 log = get_logger(__name__)
 
@@ -40,24 +39,25 @@ def save_state(message_id: int, date_str: str):
 
 class DailyCitation(AutoCog):
 
+    tz = timezone(timedelta(hours=-3))
+
     def __init__(self, bot):
         self.bot = bot
-        self._task_started = False
-
-    @Cog.listener()
-    async def on_ready(self):
-        """Inicia a task quando o bot estiver pronto e conectado."""
-        if not self._task_started:
-            log.info("Bot pronto! Iniciando task daily_citation...")
-            self.daily_citation.start()
-            self._task_started = True
 
-    tz = timezone(timedelta(hours=-3))
+    async def cog_load(self):
+        self.bot.scheduler.add_job(
+            "daily_citation",
+            self.daily_citation,
+            trigger=CronTrigger("0 11,23 * * *", tz=self.tz),
+            catch_up=True,
+        )
 
-    @tasks.loop(time=[time(11, 0, tzinfo=tz), time(23, 0, tzinfo=tz)])
     async def daily_citation(self):
-        """Executa às 11:00 e às 23:00 (UTC)."""
+        """Executa às 11:00 e às 23:00 (UTC-3)."""
         log.info("Executando daily_citation")
+        if not owns_channel(self.bot, settings.announce_channel_id):
+            log.debug("Canal de anúncios pertence a outro shard, daily_citation ignorado")
+            return
 
         source_channel = self.bot.get_channel(settings.citation)
         target_channel = self.bot.get_channel(settings.announce_channel_id)
@@ -115,14 +115,8 @@ class DailyCitation(AutoCog):
             today_str
         )
 
-    @daily_citation.before_loop
-    async def before_daily_citation(self):
-        log.info("Aguardando bot ficar pronto antes de iniciar daily_citation...")
-        await self.bot.wait_until_ready()
-        log.info("Bot pronto! Iniciando daily_citation loop...")
-
-    def cog_unload(self):
-        self.daily_citation.cancel()
+    async def cog_unload(self):
+        self.bot.scheduler.remove_job("daily_citation")
 
 
 async def setup(bot):
@@ -1,7 +1,5 @@
-import datetime
 import random
-import re
-from collections import defaultdict
+import time
 
 import discord
 from discord.ext.commands import Cog
@@ -10,10 +8,28 @@ from clients.generic.http import xingar
 from cogs import AutoCog
 from config.constants import settings
 from logger import get_logger
+from state import state
+from utils.attachments import forget_message, send_image
 from utils.cooldown import on_cooldown
+from utils.metrics import metrics
 
 logger = get_logger(__name__)
 
+MESSAGES = metrics.counter("bot_messages_total", "Mensagens processadas pelo on_message")
+TRIGGER_MATCH_SECONDS = metrics.histogram(
+    "bot_trigger_match_seconds",
+    "Tempo para avaliar os gatilhos de palavra-chave de uma mensagem",
+    buckets=(0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05),
+)
+TRIGGER_MATCHES = metrics.counter("bot_trigger_matches_total", "Gatilhos disparados", ("trigger",))
+DISCORD_SEND_SECONDS = metrics.histogram(
+    "discord_send_seconds", "Latência de envio de mensagens ao Discord", ("target",)
+)
+
+# deleções contadas numa janela que começa na primeira delas
+DELETE_WINDOW = 60
+DELETE_LIMIT = 3
+
 
 def flood_msg_check():
     return random.randint(1, 11) == 1
@@ -22,34 +38,32 @@ def flood_msg_check():
 class Events(AutoCog):
     def __init__(self, bot):
         self.bot = bot
-        self.deleted_messages = defaultdict(list)
 
     @Cog.listener()
     async def on_message_delete(self, message):
         if isinstance(message.channel, discord.TextChannel):
-            user_id = message.author.id
-            now = datetime.datetime.now()
-
             if message.author == self.bot.user:
                 return
 
-            self.deleted_messages[user_id].append(now)
-
-            self.deleted_messages[user_id] = [
-                timestamp for timestamp in self.deleted_messages[user_id] if now - timestamp < datetime.timedelta(minutes=1)
-            ]
+            key = f"deleted_messages:{message.author.id}"
+            deleted = await state.incr(key, ttl=DELETE_WINDOW)
 
-            if len(self.deleted_messages[user_id]) >= 3:
+            if deleted >= DELETE_LIMIT:
                 img_path = settings.img_path + "delete.jpg"
                 try:
-                    with open(img_path, "rb") as image_file:
-                        logger.info("Enviando imagem %s devido a deleção excessiva de mensagens por %s no canal %s", img_path, message.author, message.channel.name)
-                        self.deleted_messages[user_id].clear()
-                        alert_channel = message.channel
-                        await alert_channel.send(f"{message.author.mention}  Começou com deletepill", file=discord.File(image_file), delete_after=10)
+                    logger.info("Enviando imagem %s devido a deleção excessiva de mensagens por %s no canal %s", img_path, message.author, message.channel.name)
+                    await state.delete(key)
+                    alert_channel = message.channel
+                    await send_image(alert_channel.send, img_path, f"{message.author.mention}  Começou com deletepill", delete_after=10)
                 except Exception as e:
                     logger.error("Erro ao enviar imagem de alerta: %s", e)
 
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        # a URL de um anexo reaproveitado morre junto com a mensagem que o subiu
+        if payload.cached_message is None or payload.cached_message.author == self.bot.user:
+            await forget_message(payload.message_id)
+
     @Cog.listener()
     async def on_message(self, message):
         if message.author == self.bot.user or message.content.startswith("!"):
@@ -59,18 +73,29 @@ class Events(AutoCog):
             logger.warning("Menção inválida por %s em %s", message.author, message.guild)
             return
 
-        for config_instance in self.bot.configs_list.get("configs_list", []):
-            if config_instance["enabled"]:
-                keywords_regex = r"\b(?:{})\b".format("|".join(config_instance["keywords"]))
-                if re.search(keywords_regex, message.content.lower()) and not on_cooldown(message.author.id, self.bot.configs_list["cooldown"]):
-                    img_path = settings.img_path + config_instance["image_name"]
-                    try:
-                        with open(img_path, "rb") as image_file:
-                            logger.info("Palavra-chave detectada: %s no canal %s", config_instance['name'], message.channel.name)
-                            await message.reply(config_instance["custom_message"], file=discord.File(image_file))
-                    except Exception as e:
-                        logger.error("Erro ao enviar imagem associada à palavra-chave: %s", e)
-                    return
+        MESSAGES.inc()
+        start = time.perf_counter()
+        triggers = self.bot.triggers.get(message.guild.id if message.guild else None)
+        config_instance = triggers.match(message.content)
+        TRIGGER_MATCH_SECONDS.observe(time.perf_counter() - start)
+
+        # o cooldown é por usuário: se o primeiro gatilho está em cooldown, todos estão
+        if config_instance is not None and await on_cooldown(message.author.id, triggers.cooldown):
+            config_instance = None
+
+        if config_instance is not None:
+            TRIGGER_MATCHES.inc(trigger=config_instance["name"])
+            img_path = settings.img_path + config_instance["image_name"]
+            try:
+                logger.info(
+                    "Palavra-chave detectada: %s no canal %s", config_instance['name'], message.channel.name,
+                    extra={"sample": "trigger"},
+                )
+                with DISCORD_SEND_SECONDS.time(target="trigger"):
+                    await send_image(message.reply, img_path, config_instance["custom_message"])
+            except Exception as e:
+                logger.error("Erro ao enviar imagem associada à palavra-chave: %s", e)
+            return
 
         if self.bot.user.mentioned_in(message):
             logger.info("Bot mencionado por %s no canal %s", message.author, message.channel.name)
@@ -78,7 +103,7 @@ class Events(AutoCog):
             if random.random() < 0.9:
                 return
 
-            if not on_cooldown(message.author.id, self.bot.configs_list["cooldown"]):
+            if not await on_cooldown(message.author.id, triggers.cooldown):
                 xingamento = await xingar()
                 if xingamento:
                     await message.reply(xingamento)
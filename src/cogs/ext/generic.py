@@ -39,7 +39,7 @@ class Generic(AutoCog):
             embed.set_image(url=image_url)
             await ctx.message.reply(embed=embed)
         except Exception as e:
-            log.info(f"Erro ao buscar dados: {e}")
+            log.info("Erro ao buscar dados: %s", e)
             await ctx.send("ih rapaz, deu ruim 😿")
 
     @command(name="http")
@@ -4,14 +4,12 @@ import discord
 from discord.ext.commands import command
 
 from clients.generic.http import get_timestamp
-from clients.twitch.twitch_client import TwitchClient
+from clients.twitch.twitch_client import get_client
 from cogs import AutoCog
 from config.constants import settings, NEGATIVE_REPLIES
 from logger import get_logger
 from ui.subscriptions_paginator import SubscriptionsPaginator
 
-twitch_client = TwitchClient()
-
 log = get_logger(__name__)
 
 
@@ -28,10 +26,8 @@ class Twitch(AutoCog):
             await ctx.invoke(self.bot.get_command("javascript"))
             return
 
-        loop = asyncio.get_running_loop()
-
         try:
-            user = await loop.run_in_executor(None, twitch_client.get_user, mensagem)
+            user = await asyncio.to_thread(get_client().get_user, mensagem)
         except Exception as e:
             await ctx.send(NEGATIVE_REPLIES, delete_after=10)
             return
@@ -54,14 +50,13 @@ class Twitch(AutoCog):
         secret = settings.twitch_client_secret or ""
 
         try:
-            result = await loop.run_in_executor(
-                None,
-                twitch_client.subscribe_eventsub,
+            result = await asyncio.to_thread(
+                get_client().subscribe_eventsub,
                 broadcaster_id,
                 callback,
                 secret)
         except Exception as e:
-            log.error(f"Erro ao criar subscription: {e}", exc_info=True)
+            log.error("Erro ao criar subscription: %s", e, exc_info=True)
             await ctx.send(f"Nao foi possivel criar a subscription 😿")
             return
 
@@ -88,12 +83,11 @@ class Twitch(AutoCog):
     @command(name="list")
     async def list(self, ctx):
         """Lista todas as subscriptions EventSub e permite navegação com botões."""
-        loop = asyncio.get_running_loop()
         try:
             async with ctx.typing():
-                subs_resp = await loop.run_in_executor(None, twitch_client.list_eventsub_subscriptions)
+                subs_resp = await asyncio.to_thread(get_client().list_eventsub_subscriptions)
         except Exception as e:
-            log.error(f"Erro ao listar subscriptions: {e}", exc_info=True)
+            log.error("Erro ao listar subscriptions: %s", e, exc_info=True)
             await ctx.send("Erro ao buscar subscriptions do Twitch 😿")
             return
 
@@ -110,7 +104,7 @@ class Twitch(AutoCog):
             user = None
             if broadcaster_id:
                 try:
-                    user = await loop.run_in_executor(None, twitch_client.get_user, broadcaster_id)
+                    user = await asyncio.to_thread(get_client().get_user, broadcaster_id)
                 except Exception:
                     user = None
             subs_with_users.append({"sub": sub, "user": user})
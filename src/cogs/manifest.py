@@ -0,0 +1,74 @@
+"""
+manifest.py — cogs do bot, suas dependências pesadas e quais carregam sob demanda.
+
+Cogs ``lazy`` não são importados na inicialização: no lugar dos seus comandos o bot
+registra stubs que importam o cog no primeiro uso e reexecutam a mensagem. Por isso
+os comandos (e aliases) de um cog lazy precisam estar listados aqui.
+
+Módulos dentro de ``cogs/`` que não aparecem no manifesto continuam sendo
+descobertos e carregados na inicialização.
+"""
+from __future__ import annotations
+
+from config.loader import SOUND_COMMANDS
+
+
+class CogSpec:
+    """Como carregar um cog."""
+
+    def __init__(
+        self,
+        module: str,
+        cls: str,
+        *,
+        requires: tuple[str, ...] = (),
+        lazy: bool = False,
+        commands: dict[str, tuple[str, ...]] | None = None,
+    ):
+        """
+        Args:
+            module:   Módulo do cog (``cogs.media.image``).
+            cls:      Nome da classe do cog no módulo.
+            requires: Pacotes pesados/opcionais de que o cog depende; sem eles o
+                      cog não é carregado.
+            lazy:     Carrega só quando um dos ``commands`` for usado.
+            commands: Comandos do cog (nome -> aliases), usados para os stubs.
+        """
+        self.module = module
+        self.cls = cls
+        self.requires = requires
+        self.lazy = lazy
+        self.commands = commands or {}
+
+    def __repr__(self) -> str:
+        return f"{self.module}.{self.cls}"
+
+
+COGS: list[CogSpec] = [
+    CogSpec("cogs.events", "Events"),
+    CogSpec("cogs.misc", "Misc"),
+    CogSpec("cogs.tasks", "Tasks"),
+    CogSpec("cogs.daily_quote", "DailyCitation"),
+    CogSpec("cogs.community.quotations", "Quotations"),
+    CogSpec("cogs.community.take", "Take"),
+    CogSpec("cogs.ext.generic", "Generic", requires=("requests",)),
+    CogSpec(
+        "cogs.ext.twitch", "Twitch",
+        requires=("requests",),
+        lazy=True,
+        commands={"sub": ("add",), "list": ()},
+    ),
+    CogSpec(
+        "cogs.media.image", "Image",
+        requires=("ddgs", "PIL", "aiohttp"),
+        lazy=True,
+        commands={"google": ("img", "image"), "duck": ()},
+    ),
+    CogSpec(
+        "cogs.media.voice", "Voice",
+        # PyNaCl para o áudio e davey para a criptografia ponta a ponta (DAVE)
+        requires=("nacl", "davey"),
+        lazy=True,
+        commands={"join": (), "leave": (), "sound": (), **{name: () for name in SOUND_COMMANDS}},
+    ),
+]
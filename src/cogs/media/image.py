@@ -1,8 +1,11 @@
 from discord.ext.commands import command
 
+from clients.image_search.dedup import collapse_near_duplicates
 from clients.image_search.duck_client import search_images as search_images_duck
-from clients.image_search.google_client import search_images
+from clients.image_search.image_factory import orchestrator
+from clients.image_search.prefetch import image_prefetcher
 from cogs import AutoCog
+from config.constants import settings
 from logger import get_logger
 from ui.image_paginator import ImagePaginator
 
@@ -14,6 +17,10 @@ class Image(AutoCog):
     def __init__(self, bot):
         self.bot = bot
 
+    async def cog_unload(self):
+        # o bot.close() descarrega os cogs: fecha a sessão HTTP e os prefetches pendentes
+        await image_prefetcher.close()
+
     @command(name="google", aliases=["img", "image"])
     async def google_images(self, ctx, *, query: str = None):
         """Busca imagens na internet"""
@@ -24,38 +31,28 @@ class Image(AutoCog):
         if ctx.message.reference:
             query = ctx.message.reference.resolved.content.strip()
 
-
-        local_search_engine = "Google"
-
         try:
             async with ctx.typing():
-                results = await search_images(query, max_results=10)
-                log.info(f"Resultados obtidos do Google para '{query}'")
+                results, search_engine = await orchestrator.search(
+                    query, mode=settings.image_search_mode
+                )
+                log.info("Resultados obtidos via %s para '%s'", search_engine, query)
         except Exception as e:
-            log.error(f"Erro na busca de imagens: {e}")
+            log.error("Erro na busca de imagens: %s", e)
             await ctx.send("Nao deu")
             return
 
         if not results:
-            try:
-                log.info("Utilizando fallback DuckDuckGo para busca de imagens")
-                local_search_engine = "DuckDuckGo (fallback)"
-                results = await search_images_duck(query, max_results=20)
-            except Exception as e:
-                log.error(f"Erro na busca DuckDuckGo: {e}")
-                await ctx.send("To naum 😿 reclama com o google")
-                return
-
-            if not results:
-                await ctx.send("To naum 😿 reclama com o google")
-                return
-
-        view = ImagePaginator(results, query, ctx, timeout=300, search_engine=local_search_engine)
+            await ctx.send("To naum 😿 reclama com o google")
+            return
+
+        view = ImagePaginator(results, query, ctx, timeout=300, search_engine=search_engine)
         view.update_button_states()
 
         embed = view.build_embed()
         sent = await ctx.send(embed=embed, view=view)
         view.message = sent
+        view.prefetch_ahead()
 
     @command(name="duck")
     async def duck_images(self, ctx, *, query: str = None):
@@ -69,9 +66,11 @@ class Image(AutoCog):
 
         try:
             async with ctx.typing():
-                results = await search_images_duck(query, max_results=20)
+                results = await collapse_near_duplicates(
+                    await search_images_duck(query, max_results=20)
+                )
         except Exception as e:
-            log.error(f"Erro na busca DuckDuckGo: {e}")
+            log.error("Erro na busca DuckDuckGo: %s", e)
             await ctx.send("Nao deu")
             return
 
@@ -89,4 +88,5 @@ class Image(AutoCog):
 
         embed = view.build_embed()
         sent = await ctx.send(embed=embed, view=view)
-        view.message = sent
\ No newline at end of file
+        view.message = sent
+        view.prefetch_ahead()
\ No newline at end of file
@@ -2,20 +2,53 @@ import asyncio
 import os
 
 import discord
-from discord import FFmpegPCMAudio, PCMVolumeTransformer
-from discord.ext.commands import command
+from discord.ext.commands import Cog, command
 
+from audio.cache import pcm_cache
+from audio.idle import idle_tracker
+from audio.sessions import INVALID_SESSION, voice_sessions
+from audio.soundboard import soundboard
 from cogs import AutoCog
 from config.constants import settings
+from config.loader import register_sound_commands, unregister_sound_commands
 from logger import get_logger
 
 log = get_logger(__name__)
 
+# Clipes tocados fora do soundboard (ex.: Tasks.play_random_audio)
+EXTRA_CLIPS = ("arms.mp3",)
+
 
 class Voice(AutoCog):
 
     def __init__(self, bot):
         self.bot = bot
+        self._warm_task = None
+        register_sound_commands(self)
+
+    async def cog_load(self):
+        paths = soundboard.paths() + [f"{settings.img_path}{clip}" for clip in EXTRA_CLIPS]
+        self._warm_task = asyncio.create_task(pcm_cache.warm(paths))
+
+    async def cog_unload(self):
+        # comandos de som são do bot, não do cog: sem isso um reload registraria de novo
+        unregister_sound_commands(self)
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+            self._warm_task = None
+        soundboard.stop_all()
+        idle_tracker.cancel_all()
+
+    @Cog.listener()
+    async def on_ready(self):
+        # após reconexões o bot pode ter voltado para canais que esvaziaram
+        idle_tracker.check_all(self.bot.voice_clients)
+
+    @Cog.listener()
+    async def on_voice_state_update(self, member, before, after):
+        if before.channel == after.channel:
+            return
+        idle_tracker.check(member.guild)
 
     @command(name="join", description="Bot conecta ao canal de voz do usuário")
     async def join(self, ctx):
@@ -26,13 +59,7 @@ class Voice(AutoCog):
         voice_channel = ctx.author.voice.channel
 
         try:
-            if ctx.voice_client is not None:
-                await ctx.voice_client.disconnect(force=True)
-
-            await ctx.guild.change_voice_state(channel=None)
-            await asyncio.sleep(1.5)
-
-            vc = await voice_channel.connect(timeout=20.0, reconnect=False)
+            await voice_sessions.connect(voice_channel)
 
             await self.bot.change_presence(
                 activity=discord.Activity(
@@ -43,7 +70,7 @@ class Voice(AutoCog):
             await ctx.send(f'Conectado ao canal de voz: {voice_channel.name}', delete_after=10)
 
         except discord.errors.ConnectionClosed as e:
-            if e.code == 4006:
+            if e.code == INVALID_SESSION:
                 await ctx.send("Sessão de voz inválida 😿", delete_after=15)
                 if ctx.voice_client:
                     await ctx.voice_client.disconnect(force=True)
@@ -54,7 +81,7 @@ class Voice(AutoCog):
             await ctx.send("Timeout 😿", delete_after=10)
 
         except Exception as e:
-            log.error(f"Erro ao conectar ao canal de voz: {e}", exc_info=True)
+            log.error("Erro ao conectar ao canal de voz: %s", e, exc_info=True)
             await ctx.send("Erro inesperado. 😿", delete_after=10)
 
     @command(name="leave", description="Bot sai do canal de voz")
@@ -63,105 +90,52 @@ class Voice(AutoCog):
         if ctx.voice_client is None:
             await ctx.send("Não estou conectado a um canal de voz. 😿", delete_after=1)
             return
-        await ctx.voice_client.disconnect()
+        await voice_sessions.disconnect(ctx.guild)
 
-    @command(name="love")
-    async def love(self, ctx):
-        """Toca o som do love"""
+    async def play_sound(self, ctx, sound_name: str):
+        """Entra no canal do autor se preciso e enfileira o som do manifesto."""
         if ctx.author.voice and not ctx.voice_client:
             await self.join(ctx)
 
-        if ctx.voice_client is None:
+        voice_client = await voice_sessions.wait_ready(ctx.guild)
+        if voice_client is None:
             await ctx.send("Não estou conectado a um canal de voz. 😿", delete_after=10)
             return
 
-        mp3_path = f"{settings.img_path}audio.mp3"
+        sound = soundboard.sounds[sound_name]
+        if not os.path.exists(sound.path):
+            log.error("Arquivo de áudio não encontrado: %s", sound.path)
+            await ctx.send('Arquivo de áudio não encontrado! 😿', delete_after=4)
+            return
 
         try:
-            if not os.path.exists(mp3_path):
-                log.error(f"Arquivo de áudio não encontrado: {mp3_path}")
-                await ctx.send(f'Arquivo de áudio não encontrado! 😿', delete_after=4)
-                return
-
-            ffmpeg_options = {
-                'options': '-vn -ar 48000 -ac 2 -f s16le'
-            }
-
-            source = FFmpegPCMAudio(mp3_path, **ffmpeg_options)
-            source = PCMVolumeTransformer(source, volume=0.2)
-
-            def after_playback(error):
-                if error:
-                    log.error(f'Erro ao reproduzir áudio: {error}')
-                else:
-                    log.info('Reprodução de love finalizada corretamente.')
-
-            ctx.voice_client.play(source, after=after_playback)
-            await ctx.send(f'Love {ctx.author.mention}!', delete_after=4)
+            soundboard.play(voice_client, sound_name)
+        except asyncio.QueueFull:
+            await ctx.send("Calma, a fila de sons tá cheia 😿", delete_after=4)
             return
         except Exception as e:
-            log.error(f'Erro ao reproduzir áudio love: {e}', exc_info=True)
+            log.error("Erro ao reproduzir áudio %s: %s", sound_name, e, exc_info=True)
             await ctx.send(f'Ocorreu um erro ao tentar tocar o áudio: {e}', delete_after=4)
-
-    @command(name="agro")
-    async def agro(self, ctx):
-        """Toca o som do agrochan love"""
-        if ctx.author.voice and not ctx.voice_client:
-            await self.join(ctx)
-
-        if ctx.voice_client is None:
-            await ctx.send("Não estou conectado a um canal de voz. 😿", delete_after=10)
             return
 
-        mp3_path = f"{settings.img_path}agrochan-love.mp3"
-
-        try:
-            if not os.path.exists(mp3_path):
-                log.error(f"Arquivo de áudio não encontrado: {mp3_path}")
-                await ctx.send(f'Arquivo de áudio não encontrado! 😿', delete_after=4)
-                return
-
-            ffmpeg_options = {
-                'options': '-vn -ar 48000 -ac 2 -f s16le'
-            }
-
-            source = FFmpegPCMAudio(mp3_path, **ffmpeg_options)
-            source = PCMVolumeTransformer(source, volume=0.2)
-
-            def after_playback(error):
-                if error:
-                    log.error(f'Erro ao reproduzir áudio agro: {error}')
-                else:
-                    log.info('Reprodução de agro finalizada corretamente.')
-
-            ctx.voice_client.play(source, after=after_playback)
-            await ctx.send(f'🚜 {ctx.author.mention}!', delete_after=4)
-            return
-        except Exception as e:
-            log.error(f'Erro ao reproduzir áudio agro: {e}', exc_info=True)
-            await ctx.send(f'Ocorreu um erro ao tentar tocar o áudio: {e}', delete_after=4)
+        await ctx.send(sound.message.format(mention=ctx.author.mention), delete_after=4)
 
     @command(name="sound")
     async def sound(self, ctx):
         """Mostra os botões de sound"""
         embed = discord.Embed(title="love", description="Escolhe ai:")
+        view = discord.ui.View()
 
-        button1 = discord.ui.Button(label="❤️", style=discord.ButtonStyle.primary)
-        button2 = discord.ui.Button(label="🚜", style=discord.ButtonStyle.success)
-
-        async def button1_callback(interaction: discord.Interaction):
-            await interaction.response.send_message("Você clicou no botão ❤️!", ephemeral=True)
-            await self.love(ctx)
-
-        async def button2_callback(interaction: discord.Interaction):
-            await interaction.response.send_message("Você clicou no botão 🚜!", ephemeral=True)
-            await self.agro(ctx)
+        for sound in soundboard.sounds.values():
+            button = discord.ui.Button(label=sound.emoji or sound.name, style=sound.style)
 
-        button1.callback = button1_callback
-        button2.callback = button2_callback
+            async def button_callback(interaction: discord.Interaction, sound=sound):
+                await interaction.response.send_message(
+                    f"Você clicou no botão {sound.emoji or sound.name}!", ephemeral=True
+                )
+                await self.play_sound(ctx, sound.name)
 
-        view = discord.ui.View()
-        view.add_item(button1)
-        view.add_item(button2)
+            button.callback = button_callback
+            view.add_item(button)
 
-        await ctx.send(embed=embed, view=view, delete_after=300)
\ No newline at end of file
+        await ctx.send(embed=embed, view=view, delete_after=300)
@@ -1,12 +1,15 @@
 import asyncio
+import math
 from datetime import datetime
 from random import choice
 
 from discord.ext.commands import command, Context
 
 from cogs import AutoCog
+from config.constants import settings
 from config.loader import register_media_commands
-from logger import get_logger
+from logger import get_logger, module_levels, set_module_level
+from utils.sharding import is_sharded, shard_latencies
 
 logger = get_logger(__name__)
 
@@ -26,7 +29,8 @@ class Misc(AutoCog):
     async def trigger(self, ctx):
         """Mostra os triggers disponíveis"""
         response = "Triggers disponíveis:\n"
-        for config_instance in self.bot.configs_list.get("configs_list", []):
+        triggers, _ = self.bot.triggers.configs_for(ctx.guild.id if ctx.guild else None)
+        for config_instance in triggers:
             response += f"Nome do trigger: {config_instance['name']}\n"
             response += f"Palavras-chave: {', '.join(config_instance['keywords'])}\n"
             response += f"Imagem: {config_instance['image_name']}\n"
@@ -36,8 +40,52 @@ class Misc(AutoCog):
     @command(name="ping")
     async def ping(self, ctx: Context):
         """Ping Pong!"""
-        time = round(self.bot.latency * 1000)
-        await ctx.send(f"Pong! {time}ms")
+        if not is_sharded(self.bot):
+            time = round(self.bot.latency * 1000)
+            await ctx.send(f"Pong! {time}ms")
+            return
+
+        current = ctx.guild.shard_id if ctx.guild else 0
+        response = "Pong!\n"
+        for shard_id, latency in sorted(shard_latencies(self.bot).items()):
+            time = f"{round(latency * 1000)}ms" if math.isfinite(latency) else "N/A"
+            marker = " (este servidor)" if shard_id == current else ""
+            response += f"Shard {shard_id}: {time}{marker}\n"
+        await ctx.send(response)
+
+    @command(name="jobs")
+    async def jobs(self, ctx):
+        """Mostra os jobs agendados e a duração das execuções"""
+        response = "Jobs agendados:\n"
+        if self.bot.leader.enabled:
+            papel = "líder" if self.bot.leader.is_leader else "reserva (jobs não rodam aqui)"
+            response += f"Esta réplica: {papel}\n"
+        for name, stats in self.bot.scheduler.stats().items():
+            last_duration = stats["last_duration"]
+            duration = f"{last_duration:.3f}s" if last_duration is not None else "N/A"
+            response += (
+                f"{name} ({stats['trigger']}): próxima {stats['next_run'] or 'N/A'}, "
+                f"última duração {duration}, execuções {stats['runs']}, falhas {stats['failures']}\n"
+            )
+        await ctx.send(response)
+
+    @command(name="loglevel")
+    async def loglevel(self, ctx, modulo: str = None, nivel: str = None):
+        """Mostra ou altera o nível de log de um módulo (só admin)"""
+        if ctx.author.id != settings.adm_id:
+            return
+
+        if modulo and nivel:
+            try:
+                set_module_level(modulo, nivel)
+            except ValueError:
+                await ctx.send(f"Nível inválido: {nivel}")
+                return
+
+        response = "Níveis de log:\n"
+        for name, level in module_levels().items():
+            response += f"{name}: {level}\n"
+        await ctx.send(response)
 
     @command(name="jahpodmussar", aliases=["almoco", "japodecomer"])
     async def jahpodmussar(self, ctx):
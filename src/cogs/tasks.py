@@ -1,44 +1,43 @@
 import random
 
 import discord
-from discord import PCMVolumeTransformer
-from discord.ext import tasks
-from discord.ext.commands import Cog
 
 from cogs import AutoCog
 from config.constants import settings
-from config.take_helper import load_takes_json, days_since_last_take, save_takes_json
+from config.take_helper import take_store
 from logger import get_logger
+from scheduler import DeadlineTrigger, IntervalTrigger
+from utils.sharding import owns_channel
 
 log = get_logger(__name__)
 
 class Tasks(AutoCog):
     def __init__(self, bot):
         self.bot = bot
+        # check_record dorme até o exato momento em que o recorde seria batido
+        record_deadline = DeadlineTrigger(
+            lambda: take_store.next_record_at("take merda"), refresh=take_store.load
+        )
+        self._jobs = {
+            "check_record": (self.check_record, record_deadline, 0, True),
+            "music": (self.music, IntervalTrigger(minutes=30), 30, False),
+            "play_random_audio": (self.play_random_audio, IntervalTrigger(minutes=10), 30, False),
+        }
+
+    async def cog_load(self):
+        await take_store.load()
+        take_store.subscribe(self._on_takes_changed)
+        for name, (func, trigger, jitter, catch_up) in self._jobs.items():
+            self.bot.scheduler.add_job(name, func, trigger=trigger, jitter=jitter, catch_up=catch_up)
+
+    async def cog_unload(self):
+        take_store.unsubscribe(self._on_takes_changed)
+        for name in self._jobs:
+            self.bot.scheduler.remove_job(name)
+
+    def _on_takes_changed(self):
+        self.bot.scheduler.reschedule("check_record")
 
-    @Cog.listener()
-    async def on_ready(self):
-        tasks_to_start = [
-            self.check_record,
-            self.leave_if_alone,
-            self.music,
-            self.play_random_audio,
-        ]
-        for task in tasks_to_start:
-            if not task.is_running():
-                task.start()
-                log.info(f"Task iniciada: {task.coro.__name__}")
-
-    @tasks.loop(minutes=10)
-    async def leave_if_alone(self):
-        log.info("Executando task leave_if_alone")
-        for vc in self.bot.voice_clients:
-            if len(vc.channel.members) == 1:
-                await vc.disconnect()
-                log.info(f"Bot desconectado do canal de voz: {vc.channel.name}")
-                return
-
-    @tasks.loop(minutes=10)
     async def play_random_audio(self):
         log.info("Executando task play_random_audio")
 
@@ -46,17 +45,18 @@ class Tasks(AutoCog):
             log.info("Bot não está em nenhum canal de voz")
             return
 
+        # import tardio: a pilha de áudio só é carregada junto com o cog de voz
+        from audio.soundboard import soundboard
+
         for vc in self.bot.voice_clients:
-            if not vc.is_playing() and random.randint(1, 100) <= 5:
+            if soundboard.player(vc.guild.id).idle and random.randint(1, 100) <= 5:
                 audio_path = settings.img_path + "arms.mp3"
                 try:
-                    source = PCMVolumeTransformer(discord.FFmpegPCMAudio(audio_path), volume=0.01)
-                    vc.play(source)
-                    log.info(f"Tocando áudio {audio_path} no canal de voz: {vc.channel.name}")
+                    soundboard.enqueue(vc, audio_path, volume=0.01)
+                    log.info("Tocando áudio %s no canal de voz: %s", audio_path, vc.channel.name)
                 except Exception as e:
-                    log.error(f"Erro ao tocar áudio: {e}")
+                    log.error("Erro ao tocar áudio: %s", e)
 
-    @tasks.loop(minutes=30)
     async def music(self):
         log.info("Excutando Music")
         music_array = [
@@ -85,16 +85,14 @@ class Tasks(AutoCog):
                 name=random_music,
             ))
 
-    @music.before_loop
-    async def before_music(self):
-        await self.bot.wait_until_ready()
-
-    @tasks.loop(hours=4)
     async def check_record(self):
         log.info("Executando task check_record")
         channel_id = settings.announce_channel_id
         if channel_id == 0:
             return
+        if not owns_channel(self.bot, channel_id):
+            log.debug("Canal de anúncios pertence a outro shard, check_record ignorado")
+            return
 
         await self.handle_record(
             channel_id=channel_id,
@@ -106,27 +104,14 @@ class Tasks(AutoCog):
         )
 
     async def handle_record(self, channel_id: int, take_type: str, message_template: str):
-        data = load_takes_json()
-
-        if take_type not in data:
+        days = await take_store.update_record(take_type)
+        if days is None:
             return
 
-        take_data = data[take_type]
-        days = days_since_last_take(take_data["last_take"]) if take_data["last_take"] else 0
-        record = take_data["record"]
-
-        if days > record:
-            take_data["record"] = days
-            save_takes_json(data)
-
-            channel = self.bot.get_channel(channel_id)
-            if channel:
-                message = message_template.format(days=days)
-                await channel.send(message)
-
-    @check_record.before_loop
-    async def before_check_record(self):
-        await self.bot.wait_until_ready()
+        channel = self.bot.get_channel(channel_id)
+        if channel:
+            message = message_template.format(days=days)
+            await channel.send(message)
 
 
 async def setup(bot):
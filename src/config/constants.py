@@ -22,19 +22,72 @@ class Settings(BaseSettings):
     citation: int = Field(default=0, description="ID para citações")
     notification_channel_id: int = Field(default=0, description="ID do canal de notificações")
     user_id: int = Field(default=0, description="ID do usuário")
+    attachment_reuse: bool = Field(default=True, description="Reenvia imagens já enviadas pela URL do anexo no CDN em vez de subir o arquivo")
+    attachment_url_ttl: float = Field(default=86400.0, description="Validade (s) da URL de anexo em cache quando ela não diz quando expira")
+    trigger_idle_ttl: float = Field(default=3600.0, description="Segundos sem mensagens até os gatilhos de um servidor saírem da memória")
+
+    # Shards
+    sharding: bool = Field(default=False, description="Usa AutoShardedBot, com um gateway por shard")
+    shard_count: Optional[int] = Field(default=None, description="Total de shards; vazio usa o recomendado pelo Discord")
+    shard_ids: str = Field(default="", description="Shards conectados por este processo, ex.: 0,1 ou 0-3; vazio = todos")
+
+    # Cluster
+    cluster_workers: int = Field(default=1, description="Processos do bot; mais de 1 ativa o cluster, 0 usa um por núcleo")
+    cluster_worker_id: Optional[int] = Field(default=None, description="Definido pelo supervisor em cada worker")
+    cluster_ipc_path: str = Field(default=".cache/cluster.sock", description="Socket Unix do barramento IPC do cluster")
+
+    # Eleição de líder entre réplicas
+    leader_election: str = Field(default="none", description="Lease de líder: none, file ou sqlite")
+    leader_lease_path: str = Field(default=".cache/leader", description="Arquivo do lock (file) ou banco (sqlite) do lease")
+    leader_lease_ttl: float = Field(default=15.0, description="Validade do lease (s); a reserva assume em até 4/3 disso")
+
+    # Estado compartilhado
+    state_backend: str = Field(default="memory", description="Onde fica o estado: memory, sqlite ou redis")
+    state_sqlite_path: str = Field(default=".cache/state.db", description="Arquivo do backend sqlite")
+    state_redis_url: str = Field(default="redis://localhost:6379/0", description="URL do backend redis")
 
     # Servidor HTTP para notificações
     http_server_host: str = Field(default="0.0.0.0", description="Host do servidor HTTP")
     http_server_port: int = Field(default=8081, description="Porta do servidor HTTP")
+    health_cache_ttl: float = Field(default=2.0, description="Segundos que o resultado dos health checks fica em cache")
+    health_max_loop_lag: float = Field(default=1.0, description="Atraso máximo do event loop (s) para o bot estar pronto")
+    health_max_stall: float = Field(default=10.0, description="Maior travamento recente do event loop (s) tolerado pelo liveness")
+    health_max_latency: float = Field(default=5.0, description="Latência máxima do gateway (s) para o bot estar pronto")
+    loop_stall_threshold: float = Field(default=0.5, description="Segundos de event loop bloqueado antes do watchdog reportar")
+    notification_queue_max: int = Field(default=50, description="Notificações pendentes antes do bot deixar de estar pronto")
+    notification_webhook_url: str = Field(default="", description="Webhook do Discord para as notificações; vazio envia pelo canal do bot")
+    notification_batch_window: float = Field(default=2.0, description="Segundos que uma notificação espera outras para irem juntas no webhook")
 
     # Twitch
     twitch_client_id: Optional[str] = Field(default=None, description="Twitch Client ID")
     twitch_client_secret: Optional[str] = Field(default=None, description="Twitch Client Secret")
     twitch_eventsub_callback: Optional[str] = Field(default=None, description="URL de callback do Twitch EventSub")
 
+    # Busca de imagens
+    image_search_mode: str = Field(default="race", description="Modo de busca de imagens: race ou merge")
+    image_search_min_results: int = Field(default=3, description="Mínimo de resultados para uma engine vencer a corrida")
+    search_max_workers: int = Field(default=4, description="Threads dedicadas às buscas síncronas")
+    search_max_queue: int = Field(default=4, description="Buscas em espera antes de rejeitar novas")
+
+    # Áudio
+    audio_cache_dir: str = Field(default=".cache/audio", description="Diretório do cache de PCM dos clipes de voz")
+    voice_idle_timeout: int = Field(default=120, description="Segundos sozinho no canal de voz antes de sair")
+
+    # Logging
+    log_level: str = Field(default="INFO", description="Nível de log padrão")
+    log_format: str = Field(default="text", description="Formato da saída de log: text ou json")
+    log_levels: str = Field(default="", description="Níveis por módulo, ex.: discord=WARNING,clients=DEBUG")
+    log_sample_rates: str = Field(default="", description="Amostragem de logs frequentes, ex.: trigger=10,notif=5")
+
+    # Tracing
+    tracing_exporter: str = Field(default="none", description="Exportador de spans: none, jsonl ou otlp")
+    tracing_file: str = Field(default=".cache/traces.jsonl", description="Arquivo do exportador jsonl")
+    tracing_otlp_endpoint: str = Field(default="http://localhost:4318/v1/traces", description="Endpoint OTLP/HTTP do collector")
+
     # Arquivos de configuração
     takes_file: str = Field(default="take.json", description="Arquivo JSON para armazenar dados de takes")
     config_file: str = Field(default="pai_config.json", description="Arquivo JSON com configurações do bot")
+    scheduler_state_file: str = Field(default=".cache/scheduler_state.json", description="Arquivo JSON com a última execução de cada job")
 
 
 # Instância singleton global
@@ -2,10 +2,9 @@ import json
 import os
 from pathlib import Path
 
-import discord
-
 import config.constants
 from logger import get_logger
+from utils.attachments import send_image
 
 log = get_logger(__name__)
 
@@ -43,31 +42,75 @@ def register_media_commands(self):
     for cmd_name, cmd_data in MEDIA_COMMANDS.items():
         log.info("Registrando comando de mídia: %s -> %s", cmd_name, cmd_data['file'])
 
-        async def _command_template(ctx, file_name=cmd_data["file"]):
-            img_path = os.path.join(config.constants.settings.img_path, file_name)
-            try:
-                with open(img_path, "rb") as f:
-                    await ctx.send(file=discord.File(f))
-            except Exception as e:
-                log.error("Erro ao enviar arquivo (%s): %s", file_name, e)
-                await ctx.send(f"Não consegui enviar {cmd_name}")
+        self.bot.command(name=cmd_name)(_media_command(cmd_name, cmd_data["file"]))
+
+
+def _media_command(cmd_name, file_name):
+    # nome e arquivo presos na closure: um parâmetro com default viraria argumento
+    # do comando (``!javascript ../outro.png`` escolheria o arquivo)
+    async def _command_template(ctx):
+        img_path = os.path.join(config.constants.settings.img_path, file_name)
+        try:
+            await send_image(ctx.send, img_path)
+        except Exception as e:
+            log.error("Erro ao enviar arquivo (%s): %s", file_name, e)
+            await ctx.send(f"Não consegui enviar {cmd_name}")
+
+    return _command_template
+
+
+sounds_path = CONFIG_DIR / "sounds.json"
+with open(sounds_path, "r", encoding="utf-8") as f:
+    SOUND_COMMANDS = json.load(f)
+
+
+def register_sound_commands(self):
+    """Registra um comando por som do manifesto; ``self`` precisa ter ``play_sound``."""
+    for sound_name, sound_data in SOUND_COMMANDS.items():
+        log.info("Registrando comando de som: %s -> %s", sound_name, sound_data["file"])
+
+        self.bot.command(name=sound_name, help=sound_data.get("description"))(_sound_command(self, sound_name))
+
+
+def unregister_sound_commands(self):
+    """Remove os comandos registrados por ``register_sound_commands``."""
+    for sound_name in SOUND_COMMANDS:
+        self.bot.remove_command(sound_name)
+
+
+def _sound_command(cog, sound_name):
+    # ``!love @alguém``: argumentos extras são ignorados, não viram o nome do som
+    async def _command_template(ctx):
+        await cog.play_sound(ctx, sound_name)
+
+    return _command_template
+
 
-        self.bot.command(name=cmd_name)(_command_template)
+def _trigger_configs(configurations):
+    return [
+        {
+            "name": cfg.get("name", ""),
+            "enabled": cfg.get("enabled", False),
+            "keywords": cfg.get("keywords", []),
+            "image_name": cfg.get("image_name", ""),
+            "custom_message": cfg.get("custom_message", ""),
+        }
+        for cfg in configurations
+    ]
 
 
 def get_configs(config):
-    configurations = config.get("configs", [])
+    """Gatilhos globais e, em ``guilds``, os de cada servidor (ver utils/triggers.py)."""
     cooldown = config.get("cooldown", 0)
     return {
-        "configs_list": [
-            {
-                "name": cfg.get("name", ""),
-                "enabled": cfg.get("enabled", False),
-                "keywords": cfg.get("keywords", []),
-                "image_name": cfg.get("image_name", ""),
-                "custom_message": cfg.get("custom_message", ""),
+        "configs_list": _trigger_configs(config.get("configs", [])),
+        "cooldown": cooldown,
+        "guilds": {
+            int(guild_id): {
+                "configs_list": _trigger_configs(guild.get("configs", [])),
+                "cooldown": guild.get("cooldown", cooldown),
+                "inherit": guild.get("inherit", False),
             }
-            for cfg in configurations
-        ],
-        "cooldown": cooldown
+            for guild_id, guild in config.get("guilds", {}).items()
+        },
     }
@@ -1,22 +1,30 @@
+import asyncio
+import copy
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from config.constants import settings
+from state import state
+from utils.tracing import tracer
 
 # Diretório de configurações (config/ está no mesmo nível de src/)
 CONFIG_DIR = Path(__file__).parent.parent.parent / "config"
 
+STATE_KEY = "takes"
+
 def load_takes_json():
     """Carrega dados de takes do arquivo JSON."""
-    with open(CONFIG_DIR / settings.takes_file, "r", encoding="utf-8") as f:
+    path = CONFIG_DIR / settings.takes_file
+    with tracer.span("file read", path=str(path)), open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
 def save_takes_json(data: dict[str, Any]) -> None:
     """Salva dados de takes no arquivo JSON."""
-    with open(CONFIG_DIR / settings.takes_file, "w", encoding="utf-8") as f:
+    path = CONFIG_DIR / settings.takes_file
+    with tracer.span("file write", path=str(path)), open(path, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4)
 
 def days_since_last_take(last_take):
@@ -25,3 +33,123 @@ def days_since_last_take(last_take):
     last_take = datetime.fromisoformat(last_take)
     return (datetime.now() - last_take).days
 
+
+class TakeStore:
+    """
+    Estado dos takes em memória.
+
+    Com o backend de estado em memória, o arquivo é lido uma vez e reescrito (fora
+    do event loop) a cada alteração. Com um backend persistente (sqlite, redis) os
+    takes ficam nele, sob a chave ``takes``, e são relidos a cada operação para
+    enxergar alterações de outras réplicas; o arquivo só é usado para a migração
+    inicial.
+
+    Quem precisa reagir a mudanças (ex.: o agendamento do check_record) se
+    registra com ``subscribe``. No cluster sem backend compartilhado, cada
+    alteração local (só o tipo de take alterado) também é entregue ao
+    ``replicate_with`` e as dos outros workers chegam por ``apply_remote``, que as
+    mescla. Só o processo com ``file_owner`` reescreve o arquivo, então duas
+    alterações simultâneas em workers diferentes não se sobrescrevem.
+    """
+
+    def __init__(self):
+        self._data: dict[str, Any] | None = None
+        self._listeners: list[Callable[[], None]] = []
+        self._replicate: Callable[[dict[str, Any]], None] | None = None
+        self._save_lock = asyncio.Lock()
+        #: este processo grava o arquivo (no cluster, só o worker 0)
+        self.file_owner = True
+
+    async def load(self) -> dict[str, Any]:
+        if state.persistent:
+            data = await state.get(STATE_KEY)
+            if data is None:
+                data = await asyncio.to_thread(load_takes_json)
+                await state.set(STATE_KEY, data)
+            self._data = data
+        elif self._data is None:
+            self._data = await asyncio.to_thread(load_takes_json)
+        return self._data
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def replicate_with(self, callback: Callable[[dict[str, Any]], None]) -> None:
+        """Entrega ``{tipo: dados}`` do take alterado a ``callback`` depois de cada alteração local."""
+        self._replicate = callback
+
+    async def apply_remote(self, change: dict[str, Any]) -> None:
+        """Mescla os tipos de take alterados por outro processo (e grava, se for o dono do arquivo)."""
+        data = await self.load()
+        data.update(change)
+        if self.file_owner and not state.persistent:
+            await self._write(copy.deepcopy(data))
+        self._notify()
+
+    def _notify(self) -> None:
+        for listener in self._listeners:
+            listener()
+
+    async def _write(self, snapshot: dict[str, Any]) -> None:
+        async with self._save_lock:
+            if state.persistent:
+                await state.set(STATE_KEY, snapshot)
+            elif self.file_owner:
+                await asyncio.to_thread(save_takes_json, snapshot)
+
+    async def _save(self, take_type: str) -> None:
+        await self._write(copy.deepcopy(self._data))
+        if self._replicate is not None:
+            self._replicate({take_type: copy.deepcopy(self._data[take_type])})
+        self._notify()
+
+    async def register_take(self, take_type: str) -> dict[str, Any]:
+        """Registra um take agora, atualizando o recorde antes de zerar a contagem."""
+        data = await self.load()
+        take_data = data.setdefault(take_type, {"last_take": None, "record": 0, "total": 0})
+
+        last_take = take_data["last_take"]
+        current_days = days_since_last_take(last_take) if last_take else 0
+        if current_days > take_data["record"]:
+            take_data["record"] = current_days
+
+        take_data["last_take"] = datetime.now().isoformat()
+        take_data["total"] += 1
+        await self._save(take_type)
+        return take_data
+
+    async def update_record(self, take_type: str) -> int | None:
+        """Atualiza o recorde se ele foi batido; retorna os dias do novo recorde."""
+        data = await self.load()
+        take_data = data.get(take_type)
+        if not take_data or not take_data["last_take"]:
+            return None
+
+        days = days_since_last_take(take_data["last_take"])
+        if days <= take_data["record"]:
+            return None
+
+        take_data["record"] = days
+        await self._save(take_type)
+        return days
+
+    def next_record_at(self, take_type: str) -> datetime | None:
+        """
+        Momento em que a contagem atual passa o recorde, pelos dados do último ``load``.
+
+        Com backend persistente outra réplica pode ter alterado os takes desde
+        então: chame ``load`` antes (o ``DeadlineTrigger`` do check_record faz isso
+        pelo ``refresh``).
+        """
+        take_data = (self._data or {}).get(take_type)
+        if not take_data or not take_data["last_take"]:
+            return None
+        last_take = datetime.fromisoformat(take_data["last_take"])
+        return last_take + timedelta(days=take_data["record"] + 1)
+
+
+take_store = TakeStore()
@@ -1,13 +1,118 @@
+"""
+logger.py — configuração de logging do bot.
+
+Os handlers de saída rodam numa thread (``QueueListener``): quem loga só enfileira o
+record, então escrever no terminal nunca bloqueia o event loop. A saída pode ser
+texto ou JSON (``LOG_FORMAT=json``), o nível pode ser ajustado por módulo em tempo
+de execução e eventos muito frequentes podem ser amostrados: um log com
+``extra={"sample": "<chave>"}`` só passa 1 a cada N vezes, conforme
+``LOG_SAMPLE_RATES`` (ex.: ``trigger=10,notif=5``).
+
+Todo o estado fica nos handlers do root logger, então as funções deste módulo
+funcionam mesmo que ele seja importado por mais de um caminho (``logger`` e
+``src.logger``).
+"""
+import atexit
+import json
 import logging
-
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()
-    ]
-)
+import logging.handlers
+import queue
+import threading
+from datetime import datetime, timezone
+
+from config.constants import settings
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# atributos padrão de LogRecord; o resto veio de ``extra=`` e vai para o JSON
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por record, com os campos passados em ``extra``."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Deixa passar 1 a cada N records de cada chave de amostragem."""
+
+    def __init__(self, rates: dict[str, int]):
+        super().__init__()
+        self.rates = rates
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = getattr(record, "sample", None)
+        rate = self.rates.get(key, 1) if key is not None else 1
+        if rate <= 1:
+            return True
+        with self._lock:
+            count = self._counts.get(key, 0)
+            self._counts[key] = count + 1
+        if count % rate:
+            return False
+        record.sampled = rate
+        return True
+
+
+def _parse_pairs(spec: str) -> dict[str, str]:
+    """``"a=1,b=2"`` -> ``{"a": "1", "b": "2"}``."""
+    pairs = {}
+    for item in spec.split(","):
+        if "=" in item:
+            key, value = item.split("=", 1)
+            pairs[key.strip()] = value.strip()
+    return pairs
+
+
+def _queue_handler() -> logging.handlers.QueueHandler | None:
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            return handler
+    return None
+
+
+def _setup() -> None:
+    root = logging.getLogger()
+    if _queue_handler() is not None:
+        return
+
+    output = logging.StreamHandler()
+    if settings.log_format.lower() == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.handlers.QueueHandler(log_queue)
+    handler.addFilter(SamplingFilter(
+        {key: int(rate) for key, rate in _parse_pairs(settings.log_sample_rates).items()}
+    ))
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root.addHandler(handler)
+    root.setLevel(settings.log_level.upper())
+    for name, level in _parse_pairs(settings.log_levels).items():
+        logging.getLogger(name).setLevel(level.upper())
+
+
+_setup()
 
 
 bot_logger = logging.getLogger("bot_logger")
@@ -22,6 +127,31 @@ def set_log_level(level: int) -> None:
     bot_logger.setLevel(level)
 
 
+def set_module_level(name: str, level: int | str) -> None:
+    """Ajusta o nível de um módulo (e dos seus submódulos) em tempo de execução."""
+    logging.getLogger(name).setLevel(level.upper() if isinstance(level, str) else level)
+
+
+def module_levels() -> dict[str, str]:
+    """Módulos com nível próprio (os demais herdam do root)."""
+    levels = {"root": logging.getLevelName(logging.getLogger().level)}
+    for name, logger in sorted(logging.root.manager.loggerDict.items()):
+        if isinstance(logger, logging.Logger) and logger.level != logging.NOTSET:
+            levels[name] = logging.getLevelName(logger.level)
+    return levels
+
+
+def set_sample_rate(key: str, rate: int) -> None:
+    """Passa a deixar 1 a cada ``rate`` logs com ``extra={"sample": key}``."""
+    handler = _queue_handler()
+    if handler is None:
+        return
+    for log_filter in handler.filters:
+        # duck typing: o filtro pode ter sido criado pela outra cópia deste módulo
+        if hasattr(log_filter, "rates"):
+            log_filter.rates[key] = rate
+
+
 def log_info(message: str) -> None:
     bot_logger.info(message)
 
@@ -39,4 +169,4 @@ def log_error(message: str) -> None:
 
 
 def log_critical(message: str) -> None:
-    bot_logger.critical(message)
\ No newline at end of file
+    bot_logger.critical(message)
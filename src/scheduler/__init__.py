@@ -0,0 +1,4 @@
+from .scheduler import Job, Scheduler
+from .triggers import CronTrigger, DeadlineTrigger, IntervalTrigger
+
+__all__ = ["CronTrigger", "DeadlineTrigger", "IntervalTrigger", "Job", "Scheduler"]
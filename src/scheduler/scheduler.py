@@ -0,0 +1,289 @@
+"""
+scheduler.py — agendador único para as tarefas periódicas dos cogs.
+
+Cada cog registra seus jobs em ``bot.scheduler`` (normalmente no ``cog_load``) e o
+bot inicia o agendador uma única vez no primeiro ``on_ready``. O horário da última
+execução de cada job é persistido em disco, o que permite recuperar execuções
+perdidas durante um restart (``catch_up``).
+
+Com várias réplicas, o agendador recebe o ``LeaderElector`` do bot e só executa
+os jobs no líder; nas reservas a rodada conta como feita pelo líder, então quem
+assume a liderança não repete execuções que o antigo líder já fez. Jobs com
+``DeadlineTrigger`` são a exceção: na reserva o prazo fica em aberto, e ao virar
+líder o agendador recarrega os dados do prazo (``refresh``) e reagenda todos os
+jobs, de modo que um prazo que o antigo líder não cumpriu ainda dispara.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Callable
+
+from logger import get_logger
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+log = get_logger(__name__)
+
+JOB_SECONDS = metrics.histogram(
+    "scheduler_job_seconds", "Duração das execuções de jobs agendados", ("job",),
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+)
+JOB_RUNS = metrics.counter("scheduler_job_runs_total", "Execuções de jobs por resultado", ("job", "result"))
+
+JobFunc = Callable[[], Awaitable[None]]
+
+
+class Job:
+    """Um job agendado e as estatísticas das suas execuções."""
+
+    def __init__(self, name: str, func: JobFunc, trigger, jitter: float, catch_up: bool):
+        self.name = name
+        self.func = func
+        self.trigger = trigger
+        self.jitter = jitter
+        self.catch_up = catch_up
+        self.last_run: datetime | None = None
+        self.next_run: datetime | None = None
+        self.running = False
+        self.runs = 0
+        self.failures = 0
+        self.skipped = 0
+        self.last_duration: float | None = None
+        self.total_duration = 0.0
+        self._task: asyncio.Task | None = None
+        self._wakeup = asyncio.Event()
+
+    def stats(self) -> dict:
+        return {
+            "trigger": repr(self.trigger),
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "next_run": self.next_run.isoformat() if self.next_run else None,
+            "running": self.running,
+            "runs": self.runs,
+            "failures": self.failures,
+            "skipped": self.skipped,
+            "last_duration": self.last_duration,
+            "avg_duration": self.total_duration / self.runs if self.runs else None,
+        }
+
+
+def _now() -> datetime:
+    return datetime.now().astimezone()
+
+
+class Scheduler:
+    """Agenda jobs por intervalo ou expressão cron, sem sobreposição de execuções."""
+
+    def __init__(self, state_file: Path, leader=None):
+        self.state_file = Path(state_file)
+        self.leader = leader
+        self.jobs: dict[str, Job] = {}
+        self.running = False
+        self._state: dict[str, str] = self._load_state()
+        self._background: set[asyncio.Task] = set()
+        if leader is not None:
+            leader.subscribe(self._on_leadership)
+
+    def _standby(self) -> bool:
+        return self.leader is not None and not self.leader.is_leader
+
+    def _on_leadership(self, is_leader: bool) -> None:
+        if is_leader and self.running:
+            task = asyncio.create_task(self._promoted())
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+    async def _promoted(self) -> None:
+        """Recarrega os prazos e reagenda todos os jobs ao assumir a liderança."""
+        for job in list(self.jobs.values()):
+            await self._refresh(job)
+            self.reschedule(job.name)
+        log.info("Liderança assumida: %d job(s) reagendado(s)", len(self.jobs))
+
+    def _load_state(self) -> dict[str, str]:
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            log.error("Erro ao carregar estado do scheduler: %s", e)
+            return {}
+
+    def _write_state(self, state: dict[str, str]) -> None:
+        tmp = self.state_file.with_suffix(".tmp")
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with tracer.span("file write", path=str(self.state_file)):
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=4)
+            tmp.replace(self.state_file)
+
+    async def _save_state(self) -> None:
+        try:
+            await asyncio.to_thread(self._write_state, dict(self._state))
+        except Exception as e:
+            log.error("Erro ao salvar estado do scheduler: %s", e)
+
+    def add_job(
+        self,
+        name: str,
+        func: JobFunc,
+        *,
+        trigger,
+        jitter: float = 0,
+        catch_up: bool = False,
+    ) -> Job:
+        """
+        Registra um job. Se o agendador já estiver rodando, o job começa na hora.
+
+        Args:
+            name:     Nome único do job (chave no arquivo de estado).
+            func:     Coroutine function sem argumentos.
+            trigger:  IntervalTrigger, CronTrigger ou DeadlineTrigger.
+            jitter:   Atraso aleatório máximo (segundos) somado a cada execução.
+            catch_up: Roda imediatamente se uma execução foi perdida enquanto o bot
+                      estava fora do ar.
+        """
+        if name in self.jobs:
+            raise ValueError(f"Job '{name}' já registrado")
+
+        job = Job(name, func, trigger, jitter, catch_up)
+        last_run = self._state.get(name)
+        if last_run:
+            job.last_run = datetime.fromisoformat(last_run)
+        self.jobs[name] = job
+        log.info("Job registrado: %s (%r)", name, trigger)
+
+        if self.running:
+            job._task = asyncio.create_task(self._job_loop(job))
+        return job
+
+    def remove_job(self, name: str) -> None:
+        job = self.jobs.pop(name, None)
+        if job is not None and job._task is not None:
+            job._task.cancel()
+
+    def start(self) -> None:
+        """Inicia todos os jobs registrados. Chamadas repetidas são ignoradas."""
+        if self.running:
+            return
+        self.running = True
+        for job in self.jobs.values():
+            job._task = asyncio.create_task(self._job_loop(job))
+        log.info("Scheduler iniciado com %d job(s)", len(self.jobs))
+
+    async def shutdown(self) -> None:
+        self.running = False
+        tasks = [job._task for job in self.jobs.values() if job._task is not None]
+        tasks += self._background
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _first_run(self, job: Job, now: datetime) -> datetime | None:
+        if job.catch_up and job.trigger.missed(job.last_run, now):
+            log.info("Job %s perdeu execução desde %s; recuperando agora", job.name, job.last_run)
+            return now
+        if job.catch_up:
+            return job.trigger.next_run(job.last_run, now)
+        return job.trigger.next_run(None, now)
+
+    async def _refresh(self, job: Job) -> None:
+        """Recarrega os dados de onde o trigger tira o prazo, se ele tiver ``refresh``."""
+        refresh = getattr(job.trigger, "refresh", None)
+        if refresh is None:
+            return
+        try:
+            await refresh()
+        except Exception as e:
+            log.error("Erro ao recarregar o prazo do job %s: %s", job.name, e)
+
+    def reschedule(self, name: str) -> None:
+        """Faz o job recalcular o próximo horário (ex.: o prazo do trigger mudou)."""
+        job = self.jobs.get(name)
+        if job is not None:
+            job._wakeup.set()
+
+    async def _sleep_until_due(self, job: Job) -> bool:
+        """Dorme até o próximo horário do job; False se foi acordado por ``reschedule``."""
+        timeout = None
+        if job.next_run is not None:
+            timeout = (job.next_run - _now()).total_seconds()
+            if job.jitter:
+                timeout += random.uniform(0, job.jitter)
+            if timeout <= 0:
+                return True
+
+        try:
+            await asyncio.wait_for(job._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    async def _job_loop(self, job: Job) -> None:
+        # limpo antes do refresh: um reschedule durante a leitura não se perde
+        job._wakeup.clear()
+        await self._refresh(job)
+        job.next_run = self._first_run(job, _now())
+        while True:
+            if await self._sleep_until_due(job):
+                await self.run_job(job.name)
+                if self._standby() and not job.trigger.recurring:
+                    # o prazo é do líder; a reserva espera um reschedule ou a promoção
+                    job.next_run = None
+                    continue
+            job._wakeup.clear()
+            await self._refresh(job)
+            job.next_run = job.trigger.next_run(job.last_run, _now())
+
+    async def run_job(self, name: str) -> bool:
+        """Executa o job agora, a menos que ele já esteja rodando. Retorna se executou."""
+        job = self.jobs[name]
+        if self._standby():
+            JOB_RUNS.inc(job=name, result="standby")
+            log.debug("Job %s ignorado: este processo não é o líder", name)
+            if job.trigger.recurring:
+                job.last_run = _now()
+            return False
+
+        if job.running:
+            job.skipped += 1
+            JOB_RUNS.inc(job=name, result="skipped")
+            log.warning("Job %s ainda em execução; pulando esta rodada", name)
+            return False
+
+        job.running = True
+        started_at = _now()
+        start = time.perf_counter()
+        try:
+            with tracer.span(f"job {name}"):
+                await job.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            job.failures += 1
+            JOB_RUNS.inc(job=name, result="error")
+            log.error("Erro no job %s: %s", name, e, exc_info=True)
+        else:
+            JOB_RUNS.inc(job=name, result="ok")
+        finally:
+            duration = time.perf_counter() - start
+            job.running = False
+            job.runs += 1
+            job.last_duration = duration
+            job.total_duration += duration
+            JOB_SECONDS.observe(duration, job=name)
+
+        job.last_run = started_at
+        self._state[name] = started_at.isoformat()
+        await self._save_state()
+        log.info("Job %s executado em %.3fs", name, duration)
+        return True
+
+    def stats(self) -> dict[str, dict]:
+        return {name: job.stats() for name, job in self.jobs.items()}
@@ -0,0 +1,162 @@
+"""
+triggers.py — quando um job deve rodar.
+
+Um trigger responde uma única pergunta: dado o último horário de execução (ou
+``None``) e o horário atual, qual o próximo horário de execução.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, tzinfo
+from typing import Any, Awaitable, Callable
+
+
+class IntervalTrigger:
+    """Roda a cada intervalo fixo."""
+
+    recurring = True
+
+    def __init__(self, *, seconds: float = 0, minutes: float = 0, hours: float = 0):
+        self.interval = timedelta(seconds=seconds, minutes=minutes, hours=hours)
+        if self.interval <= timedelta(0):
+            raise ValueError("Intervalo precisa ser positivo")
+
+    def next_run(self, last_run: datetime | None, now: datetime) -> datetime:
+        if last_run is None:
+            return now
+        return max(now, last_run + self.interval)
+
+    def missed(self, last_run: datetime | None, now: datetime) -> bool:
+        return last_run is not None and last_run + self.interval <= now
+
+    def __repr__(self) -> str:
+        return f"every {self.interval}"
+
+
+def _parse_field(field: str, low: int, high: int) -> set[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"Passo inválido em '{field}'")
+
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+
+        if start < low or end > high or start > end:
+            raise ValueError(f"Valor fora do intervalo {low}-{high} em '{field}'")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronTrigger:
+    """
+    Expressão cron de 5 campos: ``minuto hora dia-do-mês mês dia-da-semana``.
+
+    Suporta ``*``, listas (``11,23``), intervalos (``1-5``) e passos (``*/15``).
+    Dia da semana vai de 0 (domingo) a 6. Como no cron, se dia-do-mês e
+    dia-da-semana forem ambos restritos basta um deles bater.
+    """
+
+    recurring = True
+
+    def __init__(self, expression: str, tz: tzinfo | None = None):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expressão cron precisa de 5 campos: '{expression}'")
+
+        self.expression = expression
+        self.tz = tz
+        self.minutes = _parse_field(fields[0], 0, 59)
+        self.hours = _parse_field(fields[1], 0, 23)
+        self.days = _parse_field(fields[2], 1, 31)
+        self.months = _parse_field(fields[3], 1, 12)
+        self.weekdays = {d % 7 for d in _parse_field(fields[4], 0, 7)}
+        self._any_day = fields[2] == "*"
+        self._any_weekday = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Primeiro horário estritamente depois de ``after`` que bate com a expressão."""
+        dt = after.astimezone(self.tz) if self.tz else after
+        dt = dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+            elif dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"Expressão cron nunca dispara: '{self.expression}'")
+
+    def next_run(self, last_run: datetime | None, now: datetime) -> datetime:
+        return self.next_after(now)
+
+    def missed(self, last_run: datetime | None, now: datetime) -> bool:
+        return last_run is not None and self.next_after(last_run) <= now
+
+    def __repr__(self) -> str:
+        return f"cron '{self.expression}'"
+
+
+class DeadlineTrigger:
+    """
+    Roda no horário devolvido por ``deadline`` (ou nunca, se for None).
+
+    Cada prazo dispara uma única vez; depois disso o job espera até o prazo mudar
+    e o dono do job chamar ``Scheduler.reschedule``.
+
+    ``refresh`` (opcional) é uma coroutine function que recarrega os dados de onde
+    ``deadline`` lê (ex.: de um backend de estado compartilhado com outras
+    réplicas); o agendador a chama antes de cada cálculo do prazo.
+    """
+
+    # cada prazo é uma execução só: a reserva não pode dá-lo por cumprido
+    recurring = False
+
+    def __init__(
+        self,
+        deadline: Callable[[], datetime | None],
+        refresh: Callable[[], Awaitable[Any]] | None = None,
+    ):
+        self.deadline = deadline
+        self.refresh = refresh
+
+    def _current(self) -> datetime | None:
+        deadline = self.deadline()
+        if deadline is not None and deadline.tzinfo is None:
+            deadline = deadline.astimezone()
+        return deadline
+
+    def next_run(self, last_run: datetime | None, now: datetime) -> datetime | None:
+        deadline = self._current()
+        if deadline is None or (last_run is not None and deadline <= last_run):
+            return None
+        return max(now, deadline)
+
+    def missed(self, last_run: datetime | None, now: datetime) -> bool:
+        deadline = self._current()
+        return deadline is not None and deadline <= now and (last_run is None or last_run < deadline)
+
+    def __repr__(self) -> str:
+        return f"deadline {self._current()}"
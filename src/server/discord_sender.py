@@ -3,12 +3,25 @@ import asyncio
 import discord
 
 from clients.generic.http import get_timestamp
-from clients.twitch.twitch_client import TwitchClient
+from clients.twitch.twitch_client import get_client
+from cluster.ipc import IPCError
 from logger import get_logger
+from utils.metrics import metrics
+from utils.sharding import owns_channel
+from utils.tracing import tracer
 from .embed_builder import build_embed
+from .webhook import WebhookSender
 
 log = get_logger(__name__)
 
+NOTIFICATIONS = metrics.counter("notifications_total", "Notificações de stream por resultado", ("result",))
+NOTIFICATION_SECONDS = metrics.histogram(
+    "notification_seconds", "Tempo total para montar e enviar uma notificação de stream"
+)
+DISCORD_SEND_SECONDS = metrics.histogram(
+    "discord_send_seconds", "Latência de envio de mensagens ao Discord", ("target",)
+)
+
 
 async def send_to_discord(
     bot: discord.Client,
@@ -16,6 +29,7 @@ async def send_to_discord(
     streamer: str,
     status: bool,
     timestamp: str,
+    webhook: WebhookSender | None = None,
 ) -> None:
     """Send a notification to Discord.
 
@@ -25,47 +39,103 @@ async def send_to_discord(
         streamer: Streamer name
         status: True if online, False if offline
         timestamp: ISO format timestamp
+        webhook: If set, post through this webhook instead of the bot's channel
     """
+    if webhook is not None:
+        # o webhook não depende do gateway: qualquer shard/worker pode enviar
+        with NOTIFICATION_SECONDS.time(), tracer.span("notification", streamer=streamer, online=status):
+            await _send_webhook(webhook, streamer, status, timestamp)
+        return
+
     if not channel_id:
         log.warning("Canal Discord não configurado - evento não será enviado")
         log.info("Configure NOTIFICATION_CHANNEL_ID no arquivo .env")
+        NOTIFICATIONS.inc(result="unconfigured")
         return
 
+    if not owns_channel(bot, channel_id):
+        cluster = getattr(bot, "cluster", None)
+        if cluster is not None:
+            await _forward(cluster, channel_id, streamer, status, timestamp)
+            return
+        log.info("Canal %s pertence a outro shard - evento não será enviado por este processo", channel_id)
+        NOTIFICATIONS.inc(result="not_owner")
+        return
+
+    with NOTIFICATION_SECONDS.time(), tracer.span("notification", streamer=streamer, online=status):
+        await _send(bot, channel_id, streamer, status, timestamp)
+
+
+async def _forward(cluster, channel_id: int, streamer: str, status: bool, timestamp: str) -> None:
+    """Entrega a notificação ao worker do cluster dono do canal."""
+    try:
+        await cluster.request(channel_id, "notify", {
+            "channel_id": channel_id, "streamer": streamer, "status": status, "timestamp": timestamp,
+        })
+    except IPCError as e:
+        log.error("❌ Não foi possível repassar a notificação de %s: %s", streamer, e)
+        NOTIFICATIONS.inc(result="no_owner")
+        return
+    log.info("[NOTIF] Notificação de %s repassada ao dono do canal %s", streamer, channel_id)
+    NOTIFICATIONS.inc(result="forwarded")
+
+
+async def _build(streamer: str, status: bool, timestamp: str) -> discord.Embed:
+    try:
+        time_str = get_timestamp()
+    except Exception:
+        time_str = timestamp
+
+    # Fetch Twitch user images
+    images = None
+    try:
+        images = await asyncio.to_thread(get_client().get_user, streamer)
+    except Exception as e:
+        log.warning("Não foi possível obter imagens do Twitch para '%s': %s", streamer, e)
+
+    profile_img = None
+    offline_img = None
+    if images:
+        profile_img = images.get("profile_image_url")
+        offline_img = images.get("offline_image_url")
+
+    embed = build_embed(streamer, status, timestamp, profile_img, offline_img)
+    embed.set_footer(text=f"Notificação automática • {time_str}")
+    return embed
+
+
+async def _send(bot: discord.Client, channel_id: int, streamer: str, status: bool, timestamp: str) -> None:
     try:
         channel = bot.get_channel(channel_id)
         if not channel:
-            log.error(f"❌ Canal {channel_id} não encontrado")
+            log.error("❌ Canal %s não encontrado", channel_id)
+            NOTIFICATIONS.inc(result="no_channel")
             return
 
         status_text = "está ONLINE" if status else "ficou OFFLINE"
+        embed = await _build(streamer, status, timestamp)
 
-        try:
-            time_str = get_timestamp()
-        except Exception:
-            time_str = timestamp
-
-        # Fetch Twitch user images
-        images = None
-        try:
-            twitch_client = TwitchClient()
-            loop = asyncio.get_running_loop()
-            images = await loop.run_in_executor(None, twitch_client.get_user, streamer)
-        except Exception as e:
-            log.warning(f"Não foi possível obter imagens do Twitch para '{streamer}': {e}")
-
-        profile_img = None
-        offline_img = None
-        if images:
-            profile_img = images.get("profile_image_url")
-            offline_img = images.get("offline_image_url")
-
-        # Build embed
-        embed = build_embed(streamer, status, timestamp, profile_img, offline_img)
-        embed.set_footer(text=f"Notificação automática • {time_str}")
-
-        await channel.send(embed=embed)
-        log.info(f"✅ Notificação enviada ao Discord: {streamer} - {status_text}")
+        with DISCORD_SEND_SECONDS.time(target="notification"):
+            await channel.send(embed=embed)
+        NOTIFICATIONS.inc(result="sent")
+        log.info("✅ Notificação enviada ao Discord: %s - %s", streamer, status_text)
 
     except Exception as e:
-        log.error(f"Erro ao enviar para Discord: {e}", exc_info=True)
+        NOTIFICATIONS.inc(result="error")
+        log.error("Erro ao enviar para Discord: %s", e, exc_info=True)
 
+
+async def _send_webhook(webhook: WebhookSender, streamer: str, status: bool, timestamp: str) -> None:
+    try:
+        status_text = "está ONLINE" if status else "ficou OFFLINE"
+        embed = await _build(streamer, status, timestamp)
+
+        # inclui a espera pelos outros embeds do lote
+        with DISCORD_SEND_SECONDS.time(target="webhook"):
+            await webhook.send(embed)
+        NOTIFICATIONS.inc(result="sent")
+        log.info("✅ Notificação enviada ao webhook: %s - %s", streamer, status_text)
+
+    except Exception as e:
+        NOTIFICATIONS.inc(result="error")
+        log.error("Erro ao enviar para o webhook: %s", e, exc_info=True)
@@ -4,14 +4,37 @@ import json
 from aiohttp import web
 
 from logger import get_logger
+from utils.metrics import metrics
 from .discord_sender import send_to_discord
 
 log = get_logger(__name__)
 
+# notificações disparadas e ainda não entregues ao Discord
+_pending_notifications: set[asyncio.Task] = set()
 
-async def health_check(request: web.Request) -> web.Response:
-    """Health check endpoint."""
-    return web.json_response({"status": "ok"}, status=200)
+
+def pending_notifications() -> int:
+    return len(_pending_notifications)
+
+
+async def health_live(request: web.Request, health) -> web.Response:
+    """Liveness: processo de pé e event loop respondendo."""
+    ok, report = health.live()
+    return web.json_response(report, status=200 if ok else 503)
+
+
+async def health_ready(request: web.Request, health) -> web.Response:
+    """Readiness: gateway conectado e nenhuma fila/pool saturado."""
+    ok, report = health.ready()
+    return web.json_response(report, status=200 if ok else 503)
+
+
+async def metrics_handler(request: web.Request) -> web.Response:
+    """Métricas do bot no formato de texto do Prometheus."""
+    return web.Response(
+        body=metrics.render().encode(),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
 
 
 def _validate_event_data(data: dict) -> tuple[bool, dict, str | None, bool | None]:
@@ -28,11 +51,11 @@ def _validate_event_data(data: dict) -> tuple[bool, dict, str | None, bool | Non
     timestamp = data.get("timestamp")
 
     if streamer is None or status_raw is None or timestamp is None:
-        log.warning(f"Evento inválido: campos faltando - {data}")
+        log.warning("Evento inválido: campos faltando - %s", data)
         return False, None, "Campos obrigatórios: streamer, status, timestamp", None
 
     if not isinstance(streamer, str):
-        log.warning(f"Evento inválido: streamer deve ser string - {data}")
+        log.warning("Evento inválido: streamer deve ser string - %s", data)
         return False, None, "Tipo inválido: streamer deve ser string", None
 
     if isinstance(status_raw, bool):
@@ -44,7 +67,7 @@ def _validate_event_data(data: dict) -> tuple[bool, dict, str | None, bool | Non
         elif status_lower == "offline":
             status = False
         else:
-            log.warning(f"Evento inválido: status deve ser 'online'/'offline' ou true/false - {data}")
+            log.warning("Evento inválido: status deve ser 'online'/'offline' ou true/false - %s", data)
             return (
                 False,
                 None,
@@ -52,23 +75,29 @@ def _validate_event_data(data: dict) -> tuple[bool, dict, str | None, bool | Non
                 None,
             )
     else:
-        log.warning(f"Evento inválido: tipo de status não suportado - {data}")
+        log.warning("Evento inválido: tipo de status não suportado - %s", data)
         return False, None, "Tipo inválido: status deve ser boolean ou string", None
 
     return True, {"streamer": streamer, "status": status, "timestamp": timestamp}, None, status
 
 
-async def handle_event(request: web.Request, bot, channel_id: int) -> web.Response:
+async def handle_event(request: web.Request, bot, channel_id: int, webhook=None) -> web.Response:
     """Handle incoming stream status events.
 
     Args:
         request: aiohttp Request object
         bot: Discord bot instance
         channel_id: Discord channel ID for notifications
+        webhook: Optional WebhookSender used instead of the channel
 
     Returns:
         JSON response
     """
+    # a reserva recusa: o remetente (ou o balanceador) tenta de novo e cai no líder
+    if not bot.leader.is_leader:
+        log.info("Evento recusado: este processo não é o líder")
+        return web.json_response({"error": "Réplica de reserva"}, status=503)
+
     try:
         data = await request.json()
         is_valid, event_data, error_msg, status = _validate_event_data(data)
@@ -79,9 +108,14 @@ async def handle_event(request: web.Request, bot, channel_id: int) -> web.Respon
         streamer = event_data["streamer"]
         timestamp = event_data["timestamp"]
         status_text = "ONLINE" if status else "OFFLINE"
-        log.info(f"[NOTIF] Streamer: {streamer} | Status: {status_text} | TS: {timestamp}")
+        log.info(
+            "[NOTIF] Streamer: %s | Status: %s | TS: %s", streamer, status_text, timestamp,
+            extra={"sample": "notif"},
+        )
 
-        asyncio.create_task(send_to_discord(bot, channel_id, streamer, status, timestamp))
+        task = asyncio.create_task(send_to_discord(bot, channel_id, streamer, status, timestamp, webhook))
+        _pending_notifications.add(task)
+        task.add_done_callback(_pending_notifications.discard)
 
         return web.json_response({"success": True}, status=200)
 
@@ -89,6 +123,6 @@ async def handle_event(request: web.Request, bot, channel_id: int) -> web.Respon
         log.warning("Payload não é JSON válido")
         return web.json_response({"error": "JSON inválido"}, status=400)
     except Exception as e:
-        log.error(f"Erro ao processar evento: {e}", exc_info=True)
+        log.error("Erro ao processar evento: %s", e, exc_info=True)
         return web.json_response({"error": "Erro interno"}, status=500)
 
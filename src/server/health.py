@@ -0,0 +1,163 @@
+"""
+health.py — liveness e readiness do bot.
+
+* ``live``:  o processo está de pé e o event loop não está travado.
+* ``ready``: além disso, o gateway está conectado com latência aceitável, o pool de
+  buscas aceita trabalho, a fila de notificações não está acumulando e, com
+  eleição de líder, este processo é o líder.
+
+O atraso do event loop é medido por uma task que dorme um intervalo fixo e compara
+quando deveria acordar com quando de fato acordou. Os resultados dos checks ficam
+em cache por alguns segundos para que probes frequentes não custem nada.
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+
+from config.constants import settings
+from logger import get_logger
+from utils.executor import search_executor
+from utils.metrics import metrics
+from utils.sharding import shard_latencies
+
+log = get_logger(__name__)
+
+LAG_INTERVAL = 0.5
+# quantas medições de atraso entram no pior caso reportado (~30s)
+LAG_WINDOW = 60
+
+
+class LoopLagMonitor:
+    """Mede continuamente o atraso de agendamento do event loop."""
+
+    def __init__(self, interval: float = LAG_INTERVAL, window: int = LAG_WINDOW):
+        self.interval = interval
+        self.window = window
+        self.last = 0.0
+        self._recent: list[float] = []
+        self._task: asyncio.Task | None = None
+
+    @property
+    def worst(self) -> float:
+        """Maior atraso na janela recente."""
+        return max(self._recent, default=0.0)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last = max(0.0, time.perf_counter() - expected)
+            self._recent.append(self.last)
+            if len(self._recent) > self.window:
+                del self._recent[0]
+
+
+class HealthChecker:
+    """Avalia liveness/readiness e guarda o resultado por ``cache_ttl`` segundos."""
+
+    def __init__(self, bot, pending_notifications, cache_ttl: float = settings.health_cache_ttl):
+        self.bot = bot
+        self.pending_notifications = pending_notifications
+        self.cache_ttl = cache_ttl
+        self.loop_lag = LoopLagMonitor()
+        self._cache: dict[str, tuple[float, tuple[bool, dict]]] = {}
+
+    def _cached(self, name: str, check) -> tuple[bool, dict]:
+        now = time.monotonic()
+        entry = self._cache.get(name)
+        if entry is not None and now - entry[0] < self.cache_ttl:
+            return entry[1]
+        result = check()
+        self._cache[name] = (now, result)
+        return result
+
+    def live(self) -> tuple[bool, dict]:
+        return self._cached("live", self._check_live)
+
+    def ready(self) -> tuple[bool, dict]:
+        return self._cached("ready", self._check_ready)
+
+    def _loop_report(self) -> dict:
+        return {
+            "monitored": self.loop_lag.running,
+            "lag": round(self.loop_lag.last, 4),
+            "worst_lag": round(self.loop_lag.worst, 4),
+        }
+
+    def _check_live(self) -> tuple[bool, dict]:
+        # se o loop estivesse travado agora este handler nem rodaria; a janela
+        # recente pega travamentos que já passaram mas ainda são relevantes
+        loop = self._loop_report()
+        ok = loop["worst_lag"] < settings.health_max_stall
+        return ok, {"status": "ok" if ok else "stalled", "loop": loop}
+
+    def _check_ready(self) -> tuple[bool, dict]:
+        # com shards, o pior shard decide: um gateway lento já atrasa os seus servidores
+        shards = {
+            str(shard_id): round(latency, 4) if math.isfinite(latency) else None
+            for shard_id, latency in shard_latencies(self.bot).items()
+        }
+        latency = max((l for l in shards.values() if l is not None), default=None)
+        connected = not self.bot.is_closed() and self.bot.is_ready()
+        gateway = {
+            "connected": connected,
+            "latency": latency if None not in shards.values() else None,
+            "shards": shards,
+        }
+        loop = self._loop_report()
+        executor = {**search_executor.stats(), "saturated": search_executor.saturated}
+        pending = self.pending_notifications()
+        notifications = {"pending": pending, "max": settings.notification_queue_max}
+
+        failures = []
+        if not connected:
+            failures.append("gateway desconectado")
+        elif gateway["latency"] is None or latency > settings.health_max_latency:
+            failures.append("latência do gateway alta")
+        if loop["lag"] > settings.health_max_loop_lag:
+            failures.append("event loop atrasado")
+        if executor["saturated"]:
+            failures.append("pool de buscas saturado")
+        if pending > settings.notification_queue_max:
+            failures.append("fila de notificações acumulando")
+        # a reserva fica fora do balanceamento até virar líder
+        leader = self.bot.leader
+        if not leader.is_leader:
+            failures.append("réplica de reserva")
+
+        ok = not failures
+        if not ok:
+            log.warning("Bot não está pronto: %s", ", ".join(failures))
+        return ok, {
+            "status": "ok" if ok else "degraded",
+            "failures": failures,
+            "gateway": gateway,
+            "loop": loop,
+            "executor": executor,
+            "notifications": notifications,
+            "leader": {"enabled": leader.enabled, "is_leader": leader.is_leader},
+        }
+
+
+def register_metrics(checker: HealthChecker) -> None:
+    metrics.gauge("event_loop_lag_seconds", "Último atraso medido do event loop", lambda: checker.loop_lag.last)
+    metrics.gauge(
+        "discord_gateway_latency_seconds",
+        "Latência do heartbeat do gateway do Discord",
+        lambda: checker.bot.latency if math.isfinite(checker.bot.latency) else -1,
+    )
+    metrics.gauge("notifications_pending", "Notificações ainda não entregues ao Discord", checker.pending_notifications)
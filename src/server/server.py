@@ -1,7 +1,9 @@
 from aiohttp import web
 
 from logger import get_logger
-from .handlers import health_check, handle_event
+from .handlers import handle_event, health_live, health_ready, metrics_handler, pending_notifications
+from .health import HealthChecker, register_metrics
+from .webhook import WebhookSender
 
 log = get_logger(__name__)
 
@@ -9,7 +11,7 @@ log = get_logger(__name__)
 class NotificationServer:
     """HTTP server for handling stream notifications and sending them to Discord."""
 
-    def __init__(self, bot, host: str, port: int, channel_id: int):
+    def __init__(self, bot, host: str, port: int, channel_id: int, webhook_url: str = "", batch_window: float = 2.0):
         """Initialize the notification server.
 
         Args:
@@ -17,11 +19,16 @@ class NotificationServer:
             host: Server host
             port: Server port
             channel_id: Discord channel ID for notifications
+            webhook_url: Discord webhook URL; when set, notifications go through it instead of channel_id
+            batch_window: Seconds to wait for more notifications to batch in one webhook message
         """
         self.bot = bot
         self.host = host
         self.port = port
         self.channel_id = channel_id
+        self.webhook = WebhookSender(webhook_url, batch_window) if webhook_url else None
+        self.health = HealthChecker(bot, pending_notifications)
+        register_metrics(self.health)
         self.app = web.Application()
         self._setup_routes()
 
@@ -29,10 +36,19 @@ class NotificationServer:
         """Setup HTTP routes."""
         # Create a wrapper for handle_event that includes the bot and channel_id
         async def event_handler(request: web.Request) -> web.Response:
-            return await handle_event(request, self.bot, self.channel_id)
+            return await handle_event(request, self.bot, self.channel_id, self.webhook)
+
+        async def live_handler(request: web.Request) -> web.Response:
+            return await health_live(request, self.health)
+
+        async def ready_handler(request: web.Request) -> web.Response:
+            return await health_ready(request, self.health)
 
         self.app.router.add_post("/event", event_handler)
-        self.app.router.add_get("/health", health_check)
+        self.app.router.add_get("/health", live_handler)
+        self.app.router.add_get("/health/live", live_handler)
+        self.app.router.add_get("/health/ready", ready_handler)
+        self.app.router.add_get("/metrics", metrics_handler)
 
     async def start(self):
         """Start the HTTP server.
@@ -44,6 +60,12 @@ class NotificationServer:
         await runner.setup()
         site = web.TCPSite(runner, self.host, self.port)
         await site.start()
-        log.info(f"Servidor HTTP rodando em %s:%s" % (self.host, self.port))
+        self.health.loop_lag.start()
+        log.info("Servidor HTTP rodando em %s:%s", self.host, self.port)
         return runner
 
+    async def stop(self, runner: web.AppRunner) -> None:
+        """Stop the HTTP server and deliver notifications still waiting for a webhook batch."""
+        await runner.cleanup()
+        if self.webhook is not None:
+            await self.webhook.close()
@@ -0,0 +1,143 @@
+"""
+webhook.py — envio das notificações por um webhook do Discord.
+
+Alternativa ao ``channel.send`` pelo cliente do bot: o webhook tem sessão HTTP e
+limite de requisições próprios, então uma rajada de notificações não disputa os
+buckets de rate limit com os comandos. Embeds que chegam dentro de
+``NOTIFICATION_BATCH_WINDOW`` segundos vão juntos numa mensagem só (até 10, o
+máximo do Discord, e até 6000 caracteres somados).
+"""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import discord
+
+from logger import get_logger
+from utils.metrics import metrics
+from utils.tracing import http_trace_config
+
+log = get_logger(__name__)
+
+WEBHOOK_POSTS = metrics.counter("webhook_posts_total", "Mensagens enviadas ao webhook por resultado", ("result",))
+WEBHOOK_BATCH_EMBEDS = metrics.histogram(
+    "webhook_batch_embeds", "Embeds por mensagem enviada ao webhook", buckets=(1, 2, 3, 5, 8, 10)
+)
+
+MAX_EMBEDS = 10
+MAX_CHARACTERS = 6000
+MAX_ATTEMPTS = 3
+
+
+class WebhookError(Exception):
+    """O Discord recusou a mensagem ou não respondeu depois das tentativas."""
+
+
+class WebhookSender:
+    def __init__(self, url: str, window: float):
+        """
+        Args:
+            url:    URL do webhook (``https://discord.com/api/webhooks/<id>/<token>``).
+            window: Segundos que o primeiro embed de um lote espera por outros.
+        """
+        self.url = url
+        self.window = window
+        self._pending: list[tuple[discord.Embed, asyncio.Future]] = []
+        self._timer: asyncio.Task | None = None
+        self._posts: set[asyncio.Task] = set()
+        self._session: aiohttp.ClientSession | None = None
+        # um POST por vez: o 429 de um lote segura os seguintes
+        self._lock = asyncio.Lock()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10), trace_configs=[http_trace_config()]
+            )
+        return self._session
+
+    async def send(self, embed: discord.Embed) -> None:
+        """Enfileira ``embed`` e espera o lote dele ser entregue (ou levanta ``WebhookError``)."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((embed, future))
+        if len(self._pending) >= MAX_EMBEDS:
+            task = asyncio.create_task(self._post(self._take_batch()))
+            self._posts.add(task)
+            task.add_done_callback(self._posts.discard)
+        elif self._timer is None:
+            self._timer = asyncio.create_task(self._flush_later())
+        await future
+
+    def _take_batch(self) -> list[tuple[discord.Embed, asyncio.Future]]:
+        size = 0
+        count = 0
+        for embed, _ in self._pending[:MAX_EMBEDS]:
+            size += len(embed)
+            if count and size > MAX_CHARACTERS:
+                break
+            count += 1
+        batch = self._pending[:count]
+        del self._pending[:count]
+        return batch
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.window)
+        self._timer = None
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Envia tudo o que está na fila, sem esperar a janela."""
+        while self._pending:
+            await self._post(self._take_batch())
+
+    async def _post(self, batch: list[tuple[discord.Embed, asyncio.Future]]) -> None:
+        if not batch:
+            return
+        payload = {"embeds": [embed.to_dict() for embed, _ in batch]}
+        try:
+            async with self._lock:
+                await self._deliver(payload)
+        except Exception as e:
+            WEBHOOK_POSTS.inc(result="error")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e if isinstance(e, WebhookError) else WebhookError(str(e)))
+            return
+        WEBHOOK_POSTS.inc(result="sent")
+        WEBHOOK_BATCH_EMBEDS.observe(len(batch))
+        log.debug("Lote de %d embed(s) enviado ao webhook", len(batch))
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def _deliver(self, payload: dict) -> None:
+        session = self._get_session()
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            async with session.post(self.url, json=payload) as resp:
+                if resp.status < 300:
+                    return
+                if resp.status == 429:
+                    body = await resp.json(content_type=None)
+                    retry_after = float(body.get("retry_after", 1))
+                    WEBHOOK_POSTS.inc(result="rate_limited")
+                    log.warning("Webhook limitado pelo Discord, nova tentativa em %.2fs", retry_after)
+                    await asyncio.sleep(retry_after)
+                    continue
+                text = await resp.text()
+                if resp.status < 500:
+                    raise WebhookError(f"HTTP {resp.status}: {text[:200]}")
+                log.warning("Webhook respondeu %s (tentativa %d/%d)", resp.status, attempt, MAX_ATTEMPTS)
+                await asyncio.sleep(attempt)
+        raise WebhookError(f"sem resposta de sucesso após {MAX_ATTEMPTS} tentativas")
+
+    async def close(self) -> None:
+        """Entrega o que está na fila e fecha a sessão HTTP."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await asyncio.gather(*self._posts, return_exceptions=True)
+        await self.flush()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,38 @@
+"""
+Estado compartilhado do bot (cooldowns, caches, contadores, takes).
+
+``STATE_BACKEND`` escolhe onde ele fica: ``memory`` (padrão, um processo só),
+``sqlite`` (arquivo em ``STATE_SQLITE_PATH``, compartilhado entre processos da
+mesma máquina) ou ``redis`` (``STATE_REDIS_URL``).
+"""
+from config.constants import settings
+from .base import StateBackend
+from .cache import StateCache
+from .memory import MemoryBackend
+from .resp import RedisBackend, RespServer
+from .sqlite import SQLiteBackend
+
+
+def create_backend(kind: str) -> StateBackend:
+    kind = kind.lower()
+    if kind == "memory":
+        return MemoryBackend()
+    if kind == "sqlite":
+        return SQLiteBackend(settings.state_sqlite_path)
+    if kind == "redis":
+        return RedisBackend(settings.state_redis_url)
+    raise ValueError(f"STATE_BACKEND desconhecido: {kind}")
+
+
+state = create_backend(settings.state_backend)
+
+__all__ = [
+    "MemoryBackend",
+    "RedisBackend",
+    "RespServer",
+    "SQLiteBackend",
+    "StateBackend",
+    "StateCache",
+    "create_backend",
+    "state",
+]
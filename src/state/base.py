@@ -0,0 +1,65 @@
+"""
+base.py — interface comum dos backends de estado.
+
+Valores são qualquer coisa serializável em JSON. Toda operação é assíncrona para
+que backends remotos (Redis) e com I/O de disco (SQLite) não travem o event loop,
+e leituras/escritas em lote (``get_many``/``set_many``) custam uma ida só.
+"""
+from __future__ import annotations
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Mapping
+
+
+def encode(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def decode(raw: str | bytes | None) -> Any:
+    return None if raw is None else json.loads(raw)
+
+
+class StateBackend(ABC):
+    """Armazenamento chave-valor com TTL."""
+
+    #: outros processos (réplicas, workers do cluster) enxergam as mesmas chaves
+    shared = False
+    #: o conteúdo sobrevive a um restart do bot
+    persistent = False
+
+    async def get(self, key: str) -> Any | None:
+        return (await self.get_many([key])).get(key)
+
+    @abstractmethod
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Valores das chaves existentes (as ausentes ou expiradas ficam de fora)."""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, *, ttl: float | None = None, nx: bool = False) -> bool:
+        """
+        Grava ``value``, expirando em ``ttl`` segundos.
+
+        Com ``nx=True`` só grava se a chave não existir; retorna se gravou. É o
+        "testa e marca" atômico usado pelos cooldowns.
+        """
+
+    @abstractmethod
+    async def set_many(self, mapping: Mapping[str, Any], *, ttl: float | None = None) -> None:
+        """Grava várias chaves de uma vez, todas com o mesmo ``ttl``."""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> int:
+        """Remove as chaves; retorna quantas existiam."""
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1, *, ttl: float | None = None) -> int:
+        """
+        Soma ``amount`` a um contador e retorna o novo valor.
+
+        O ``ttl`` vale a partir da criação do contador (janela fixa): incrementos
+        seguintes não renovam a expiração.
+        """
+
+    async def close(self) -> None:
+        pass
@@ -0,0 +1,80 @@
+"""
+cache.py — cache com TTL guardado no backend de estado.
+
+Substitui os caches LRU em memória quando o resultado vale para todas as
+réplicas (ex.: se uma URL de imagem responde). Num backend compartilhado o
+tamanho é limitado pelo TTL; no backend em memória, que não tem outro limite,
+``max_entries`` mantém um LRU das chaves e apaga do backend as menos usadas.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, Iterable, Mapping
+
+from utils.metrics import metrics
+from .base import StateBackend
+
+CACHE_LOOKUPS = metrics.counter(
+    "cache_lookups_total", "Consultas a caches em memória por resultado", ("cache", "result")
+)
+
+
+class StateCache:
+    def __init__(self, name: str, ttl: float, backend: StateBackend, max_entries: int | None = None):
+        """
+        Args:
+            name:        Prefixo das chaves no backend e rótulo das métricas.
+            ttl:         Validade das entradas em segundos.
+            backend:     Backend de estado onde as entradas ficam.
+            max_entries: Limite de entradas quando o backend não é compartilhado.
+        """
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend
+        self.max_entries = max_entries
+        # chaves em ordem de uso; só quando este processo é o único a escrever no backend
+        self._lru: OrderedDict[str, None] | None = None
+        if max_entries is not None and not backend.shared:
+            self._lru = OrderedDict()
+
+    def _key(self, key: str) -> str:
+        return f"cache:{self.name}:{key}"
+
+    async def get(self, key: str) -> Any | None:
+        return (await self.get_many([key])).get(key)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        """Os valores em cache de ``keys``, numa consulta só ao backend."""
+        keys = list(keys)
+        found = await self.backend.get_many([self._key(key) for key in keys])
+        values = {key: found[self._key(key)] for key in keys if self._key(key) in found}
+        hits = len(values)
+        if self._lru is not None:
+            for key in values:
+                self._lru[key] = None
+                self._lru.move_to_end(key)
+        if hits:
+            CACHE_LOOKUPS.inc(hits, cache=self.name, result="hit")
+        if len(keys) - hits:
+            CACHE_LOOKUPS.inc(len(keys) - hits, cache=self.name, result="miss")
+        return values
+
+    async def add(self, key: str, value: Any) -> None:
+        await self.backend.set(self._key(key), value, ttl=self.ttl)
+        await self._track([key])
+
+    async def add_many(self, mapping: Mapping[str, Any]) -> None:
+        await self.backend.set_many({self._key(key): value for key, value in mapping.items()}, ttl=self.ttl)
+        await self._track(mapping)
+
+    async def _track(self, keys: Iterable[str]) -> None:
+        if self._lru is None:
+            return
+        for key in keys:
+            self._lru[key] = None
+            self._lru.move_to_end(key)
+        evicted = []
+        while len(self._lru) > self.max_entries:
+            evicted.append(self._lru.popitem(last=False)[0])
+        if evicted:
+            await self.backend.delete(*map(self._key, evicted))
@@ -0,0 +1,77 @@
+"""
+memory.py — backend de estado em memória (padrão; um processo só, some no restart).
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Iterable, Mapping
+
+from .base import StateBackend, decode, encode
+
+# a cada tantas escritas as chaves expiradas que ninguém leu são removidas
+PURGE_EVERY = 1000
+
+
+class MemoryBackend(StateBackend):
+    """Dict de ``chave -> (valor em JSON, expira em)``."""
+
+    def __init__(self):
+        self._data: dict[str, tuple[str, float | None]] = {}
+        self._writes = 0
+
+    def _alive(self, key: str, now: float) -> tuple[str, float | None] | None:
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= now:
+            del self._data[key]
+            return None
+        return entry
+
+    def _written(self) -> None:
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            now = time.time()
+            for key in [k for k, (_, expires) in self._data.items() if expires is not None and expires <= now]:
+                del self._data[key]
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        now = time.time()
+        values = {}
+        for key in keys:
+            entry = self._alive(key, now)
+            if entry is not None:
+                values[key] = decode(entry[0])
+        return values
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None, nx: bool = False) -> bool:
+        now = time.time()
+        if nx and self._alive(key, now) is not None:
+            return False
+        self._data[key] = (encode(value), now + ttl if ttl else None)
+        self._written()
+        return True
+
+    async def set_many(self, mapping: Mapping[str, Any], *, ttl: float | None = None) -> None:
+        expires = time.time() + ttl if ttl else None
+        for key, value in mapping.items():
+            self._data[key] = (encode(value), expires)
+            self._written()
+
+    async def delete(self, *keys: str) -> int:
+        now = time.time()
+        removed = 0
+        for key in keys:
+            if self._alive(key, now) is not None:
+                del self._data[key]
+                removed += 1
+        return removed
+
+    async def incr(self, key: str, amount: int = 1, *, ttl: float | None = None) -> int:
+        now = time.time()
+        entry = self._alive(key, now)
+        if entry is None:
+            value, expires = amount, now + ttl if ttl else None
+        else:
+            value, expires = decode(entry[0]) + amount, entry[1]
+        self._data[key] = (encode(value), expires)
+        self._written()
+        return value
@@ -0,0 +1,297 @@
+"""
+resp.py — backend de estado em Redis (protocolo RESP2) e um servidor substituto.
+
+``RedisBackend`` fala RESP direto sobre uma conexão asyncio, sem dependência
+extra. Os comandos de uma operação (ex.: ``set_many``) vão num pipeline só.
+
+Para desenvolvimento e testes, ``RespServer`` implementa em memória o
+subconjunto de comandos que o backend usa::
+
+    python -m state.resp --port 6380
+    STATE_BACKEND=redis STATE_REDIS_URL=redis://localhost:6380/0 python __main__.py
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import math
+import time
+from typing import Any, Iterable, Mapping
+from urllib.parse import urlparse
+
+from logger import get_logger
+from .base import StateBackend, decode, encode
+
+log = get_logger(__name__)
+
+
+class RespError(Exception):
+    """Erro devolvido pelo servidor (``-ERR ...``)."""
+
+
+def _command(*args: Any) -> bytes:
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("conexão fechada pelo servidor")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RespError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        size = int(rest)
+        if size < 0:
+            return None
+        data = await reader.readexactly(size + 2)
+        return data[:-2]
+    if kind == b"*":
+        size = int(rest)
+        if size < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(size)]
+    raise RespError(f"resposta RESP inválida: {line!r}")
+
+
+def _ttl_args(ttl: float | None) -> tuple:
+    # PX aceita milissegundos, então TTLs fracionários (testes) funcionam
+    return ("PX", max(1, math.ceil(ttl * 1000))) if ttl else ()
+
+
+class RedisBackend(StateBackend):
+    shared = True
+    persistent = True
+
+    def __init__(self, url: str):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._send(setup)
+        log.info("Conectado ao Redis em %s:%s/%s", self.host, self.port, self.db)
+
+    async def _send(self, commands: list[tuple]) -> list[Any]:
+        try:
+            self._writer.write(b"".join(_command(*cmd) for cmd in commands))
+            await self._writer.drain()
+            replies = [await _read_reply(self._reader) for _ in commands]
+        except BaseException:
+            # cancelado (ou com erro) entre a escrita e a leitura: as respostas que
+            # ficaram no socket seriam lidas pelo próximo comando, então a conexão
+            # é descartada e a próxima operação reconecta
+            self._writer.close()
+            self._writer = None
+            raise
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def pipeline(self, commands: list[tuple]) -> list[Any]:
+        """Envia ``commands`` de uma vez e retorna as respostas na mesma ordem."""
+        async with self._lock:
+            for attempt in (1, 2):
+                try:
+                    if self._writer is None or self._writer.is_closing():
+                        await self._connect()
+                    return await self._send(commands)
+                except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+                    self._writer = None
+                    if attempt == 2:
+                        raise
+                    log.warning("Conexão com o Redis perdida (%s), reconectando", e)
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        (values,) = await self.pipeline([("MGET", *keys)])
+        return {key: decode(value) for key, value in zip(keys, values) if value is not None}
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None, nx: bool = False) -> bool:
+        (reply,) = await self.pipeline([("SET", key, encode(value), *_ttl_args(ttl), *(("NX",) if nx else ()))])
+        return reply == "OK"
+
+    async def set_many(self, mapping: Mapping[str, Any], *, ttl: float | None = None) -> None:
+        if not mapping:
+            return
+        if ttl:
+            await self.pipeline([("SET", key, encode(value), *_ttl_args(ttl)) for key, value in mapping.items()])
+        else:
+            await self.pipeline([("MSET", *(item for key, value in mapping.items() for item in (key, encode(value))))])
+
+    async def delete(self, *keys: str) -> int:
+        if not keys:
+            return 0
+        (removed,) = await self.pipeline([("DEL", *keys)])
+        return removed
+
+    async def incr(self, key: str, amount: int = 1, *, ttl: float | None = None) -> int:
+        if not ttl:
+            (value,) = await self.pipeline([("INCRBY", key, amount)])
+            return value
+        # o SET NX cria o contador já com a expiração (começa a janela) e o INCRBY
+        # a preserva; no mesmo pipeline, nenhum contador fica sem TTL se o
+        # processo cair entre os dois
+        _, value = await self.pipeline([("SET", key, 0, *_ttl_args(ttl), "NX"), ("INCRBY", key, amount)])
+        return value
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class RespServer:
+    """Servidor RESP em memória com os comandos usados pelo ``RedisBackend``."""
+
+    def __init__(self):
+        self._data: dict[bytes, tuple[bytes, float | None]] = {}
+
+    def _get(self, key: bytes) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.time():
+            del self._data[key]
+            return None
+        return entry[0]
+
+    def _expiry(self, args: list[bytes]) -> float | None:
+        options = [arg.upper() for arg in args]
+        for unit, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+            if unit in options:
+                return time.time() + int(args[options.index(unit) + 1]) * scale
+        return None
+
+    def execute(self, name: str, args: list[bytes]) -> Any:
+        if name == "PING":
+            return "PONG"
+        if name in ("AUTH", "SELECT"):
+            return "OK"
+        if name == "GET":
+            return self._get(args[0])
+        if name == "MGET":
+            return [self._get(key) for key in args]
+        if name == "SET":
+            options = [arg.upper() for arg in args[2:]]
+            exists = self._get(args[0]) is not None
+            if (b"NX" in options and exists) or (b"XX" in options and not exists):
+                return None
+            self._data[args[0]] = (args[1], self._expiry(args[2:]))
+            return "OK"
+        if name == "MSET":
+            for key, value in zip(args[::2], args[1::2]):
+                self._data[key] = (value, None)
+            return "OK"
+        if name == "DEL":
+            removed = [key for key in args if self._get(key) is not None]
+            for key in removed:
+                del self._data[key]
+            return len(removed)
+        if name == "EXISTS":
+            return sum(self._get(key) is not None for key in args)
+        if name in ("INCR", "INCRBY"):
+            current = self._get(args[0])
+            expires = self._data[args[0]][1] if current is not None else None
+            try:
+                value = int(current or 0) + (int(args[1]) if name == "INCRBY" else 1)
+            except ValueError:
+                return RespError("ERR value is not an integer or out of range")
+            self._data[args[0]] = (str(value).encode(), expires)
+            return value
+        if name in ("EXPIRE", "PEXPIRE"):
+            current = self._get(args[0])
+            if current is None:
+                return 0
+            scale = 1.0 if name == "EXPIRE" else 0.001
+            self._data[args[0]] = (current, time.time() + int(args[1]) * scale)
+            return 1
+        if name in ("TTL", "PTTL"):
+            if self._get(args[0]) is None:
+                return -2
+            expires = self._data[args[0]][1]
+            if expires is None:
+                return -1
+            return round((expires - time.time()) * (1 if name == "TTL" else 1000))
+        if name == "FLUSHDB":
+            self._data.clear()
+            return "OK"
+        return RespError(f"ERR unknown command '{name}'")
+
+    @staticmethod
+    def _encode(reply: Any) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, RespError):
+            return f"-{reply}\r\n".encode()
+        if isinstance(reply, str):
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        return f"*{len(reply)}\r\n".encode() + b"".join(RespServer._encode(item) for item in reply)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_reply(reader)
+                if not isinstance(request, list) or not request:
+                    writer.write(self._encode(RespError("ERR protocolo inválido")))
+                    break
+                name, args = request[0].decode().upper(), request[1:]
+                try:
+                    reply = self.execute(name, args)
+                except (IndexError, ValueError):
+                    reply = RespError(f"ERR wrong number of arguments for '{name}'")
+                writer.write(self._encode(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 6379) -> asyncio.AbstractServer:
+        server = await asyncio.start_server(self._handle, host, port)
+        log.info("Servidor RESP substituto ouvindo em %s:%s", host, port)
+        return server
+
+
+async def _serve(host: str, port: int) -> None:
+    server = await RespServer().start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor RESP em memória para desenvolvimento")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    try:
+        asyncio.run(_serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,161 @@
+"""
+sqlite.py — backend de estado em SQLite.
+
+Persistente e compartilhado entre processos da mesma máquina (workers do cluster,
+réplicas no mesmo host): o arquivo fica em modo WAL e cada operação é uma
+transação. As chamadas ao SQLite rodam numa thread para não travar o event loop.
+"""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterable, Mapping
+
+from .base import StateBackend, decode, encode
+
+PURGE_EVERY = 1000
+# limite de variáveis por consulta em versões antigas do SQLite
+BATCH = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    expires_at REAL
+)
+"""
+
+
+class SQLiteBackend(StateBackend):
+    shared = True
+    persistent = True
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    async def _run(self, func, *args):
+        def locked():
+            with self._lock:
+                return func(self._connection(), *args)
+        return await asyncio.to_thread(locked)
+
+    def _written(self, conn: sqlite3.Connection, count: int = 1) -> None:
+        before, self._writes = self._writes, self._writes + count
+        if before // PURGE_EVERY != self._writes // PURGE_EVERY:
+            conn.execute("DELETE FROM state WHERE expires_at <= ?", (time.time(),))
+
+    @staticmethod
+    def _expires(ttl: float | None) -> float | None:
+        return time.time() + ttl if ttl else None
+
+    async def get_many(self, keys: Iterable[str]) -> dict[str, Any]:
+        keys = list(keys)
+
+        def op(conn: sqlite3.Connection) -> dict[str, Any]:
+            now = time.time()
+            values = {}
+            for i in range(0, len(keys), BATCH):
+                chunk = keys[i:i + BATCH]
+                rows = conn.execute(
+                    f"SELECT key, value FROM state WHERE key IN ({','.join('?' * len(chunk))})"
+                    " AND (expires_at IS NULL OR expires_at > ?)",
+                    (*chunk, now),
+                )
+                values.update((key, decode(value)) for key, value in rows)
+            return values
+
+        return await self._run(op) if keys else {}
+
+    async def set(self, key: str, value: Any, *, ttl: float | None = None, nx: bool = False) -> bool:
+        def op(conn: sqlite3.Connection) -> bool:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if nx:
+                    # uma chave expirada conta como ausente
+                    conn.execute("DELETE FROM state WHERE key = ? AND expires_at <= ?", (key, time.time()))
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, encode(value), self._expires(ttl)),
+                    )
+                else:
+                    cursor = conn.execute(
+                        "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                        (key, encode(value), self._expires(ttl)),
+                    )
+                self._written(conn)
+                return cursor.rowcount == 1
+
+        return await self._run(op)
+
+    async def set_many(self, mapping: Mapping[str, Any], *, ttl: float | None = None) -> None:
+        rows = [(key, encode(value), self._expires(ttl)) for key, value in mapping.items()]
+
+        def op(conn: sqlite3.Connection) -> None:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany("INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)", rows)
+                self._written(conn, len(rows))
+
+        if rows:
+            await self._run(op)
+
+    async def delete(self, *keys: str) -> int:
+        def op(conn: sqlite3.Connection) -> int:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                removed = 0
+                for key in keys:
+                    removed += conn.execute(
+                        "DELETE FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, now)
+                    ).rowcount
+                    conn.execute("DELETE FROM state WHERE key = ?", (key,))
+                return removed
+
+        return await self._run(op) if keys else 0
+
+    async def incr(self, key: str, amount: int = 1, *, ttl: float | None = None) -> int:
+        def op(conn: sqlite3.Connection) -> int:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                now = time.time()
+                row = conn.execute(
+                    "SELECT value, expires_at FROM state WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                    (key, now),
+                ).fetchone()
+                if row is None:
+                    value, expires = amount, self._expires(ttl)
+                else:
+                    value, expires = decode(row[0]) + amount, row[1]
+                conn.execute(
+                    "INSERT OR REPLACE INTO state (key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, encode(value), expires),
+                )
+                self._written(conn)
+                return value
+
+        return await self._run(op)
+
+    async def close(self) -> None:
+        def op():
+            with self._lock:
+                if self._conn is not None:
+                    self._conn.close()
+                    self._conn = None
+        await asyncio.to_thread(op)
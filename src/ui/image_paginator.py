@@ -1,12 +1,19 @@
+import io
+import random
 from urllib.parse import urlparse
 
 import discord
 
 from clients.generic.http import get_timestamp
+from clients.image_search.prefetch import image_prefetcher
 from logger import get_logger
 
 log = get_logger(__name__)
 
+PREFETCH_AHEAD = 2
+# Tempo máximo esperando um prefetch em andamento (a interação expira em 3s)
+PREFETCH_WAIT = 1.0
+
 
 class ImagePaginator(discord.ui.View):
     def __init__(self, results, query, ctx, timeout=300, search_engine="DuckDuckGo"):
@@ -38,6 +45,42 @@ class ImagePaginator(discord.ui.View):
         embed.set_footer(text=f"Página {self.index + 1}/{len(self.results)} - {self.search_engine} • {self.time_str}")
         return embed
 
+    def build_page(self) -> tuple[discord.Embed, list[discord.File]]:
+        """Embed da página atual usando a miniatura pré-carregada, quando existir."""
+        embed = self.build_embed()
+        thumbnail = image_prefetcher.get(self.results[self.index]["link"])
+        if thumbnail is None:
+            return embed, []
+
+        data, filename = thumbnail
+        embed.set_image(url=f"attachment://{filename}")
+        return embed, [discord.File(io.BytesIO(data), filename=filename)]
+
+    def prefetch_ahead(self) -> None:
+        """Pré-carrega as próximas páginas enquanto o usuário vê a atual."""
+        upcoming = self.results[self.index + 1:self.index + 1 + PREFETCH_AHEAD]
+        image_prefetcher.schedule([result["link"] for result in upcoming])
+
+    def drop_failed(self) -> None:
+        """Remove as páginas cujo prefetch falhou, mantendo a página atual."""
+        current = self.results[self.index]
+        kept = [
+            result for result in self.results
+            if result is current or not image_prefetcher.failed(result["link"])
+        ]
+        if len(kept) != len(self.results):
+            log.debug("Descartando %d página(s) com prefetch falho", len(self.results) - len(kept))
+            self.results = kept
+            self.index = next(i for i, result in enumerate(kept) if result is current)
+
+    async def show_page(self, interaction: discord.Interaction, index: int) -> None:
+        self.index = max(0, min(index, len(self.results) - 1))
+        await image_prefetcher.wait(self.results[self.index]["link"], timeout=PREFETCH_WAIT)
+        self.update_button_states()
+        embed, files = self.build_page()
+        await interaction.response.edit_message(embed=embed, attachments=files, view=self)
+        self.prefetch_ahead()
+
     async def on_timeout(self) -> None:
         for item in self.children:
             item.disabled = True
@@ -56,21 +99,15 @@ class ImagePaginator(discord.ui.View):
 
     @discord.ui.button(label="Anterior", style=discord.ButtonStyle.secondary, custom_id="prev_btn")
     async def prev_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.index > 0:
-            self.index -= 1
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+        self.drop_failed()
+        await self.show_page(interaction, self.index - 1)
 
     @discord.ui.button(label="Próxima", style=discord.ButtonStyle.primary, custom_id="next_btn")
     async def next_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.index < len(self.results) - 1:
-            self.index += 1
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+        self.drop_failed()
+        await self.show_page(interaction, self.index + 1)
 
     @discord.ui.button(emoji="🔀", style=discord.ButtonStyle.secondary, custom_id="shuffle_btn")
     async def shuffle_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        import random
-        self.index = random.randint(0, len(self.results) - 1)
-        self.update_button_states()
-        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+        self.drop_failed()
+        await self.show_page(interaction, random.randint(0, len(self.results) - 1))
@@ -0,0 +1,158 @@
+"""
+attachments.py — reaproveita no CDN do Discord as imagens já enviadas pelo bot.
+
+A primeira resposta com uma imagem dos assets sobe o arquivo normalmente e guarda
+a URL do anexo no backend de estado, sob o hash do conteúdo. As seguintes mandam
+só um embed apontando para essa URL, sem reenviar os bytes.
+
+A URL deixa de valer quando:
+
+* expira: as URLs de anexo são assinadas (parâmetro ``ex``); a entrada vence
+  um pouco antes disso, ou em ``ATTACHMENT_URL_TTL`` se a URL não tiver ``ex``;
+* a mensagem original é apagada (``forget_message``, chamado pelo
+  ``on_raw_message_delete``);
+* o envio do embed falha.
+
+Em qualquer desses casos o arquivo é enviado de novo. Com ``STATE_BACKEND``
+sqlite ou redis as URLs sobrevivem a restarts e valem para todas as réplicas.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from urllib.parse import parse_qs, urlparse
+
+import discord
+
+from config.constants import settings
+from logger import get_logger
+from state import state
+from utils.metrics import metrics
+from utils.tracing import tracer
+
+log = get_logger(__name__)
+
+ATTACHMENT_SENDS = metrics.counter(
+    "attachment_sends_total", "Imagens enviadas por reaproveitamento da URL ou upload", ("result",)
+)
+
+# só imagens aparecem num embed; o resto (vídeo, áudio) sempre é enviado como anexo
+IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".webp"}
+# folga antes do vencimento da assinatura, para não mandar uma URL que expira no caminho
+EXPIRY_MARGIN = 600
+
+# caminho -> (mtime, hash): evita reler o arquivo quando a URL está em cache
+_digests: dict[str, tuple[float, str]] = {}
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with tracer.span("file read", path=path), open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def _digest(path: str) -> str:
+    mtime = os.path.getmtime(path)
+    entry = _digests.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+    digest = await asyncio.to_thread(_file_digest, path)
+    _digests[path] = (mtime, digest)
+    return digest
+
+
+def _key(digest: str) -> str:
+    return f"attachment:{digest}"
+
+
+def _message_key(message_id: int) -> str:
+    return f"attachment-message:{message_id}"
+
+
+def url_ttl(url: str, now: float | None = None) -> float:
+    """Segundos até a URL do anexo deixar de ser usada (já com a folga)."""
+    now = time.time() if now is None else now
+    expires = parse_qs(urlparse(url).query).get("ex")
+    if not expires:
+        return settings.attachment_url_ttl
+    try:
+        return int(expires[0], 16) - now - EXPIRY_MARGIN
+    except ValueError:
+        return settings.attachment_url_ttl
+
+
+async def send_image(
+    send: Callable[..., Awaitable[discord.Message]],
+    path: str,
+    content: str | None = None,
+    **kwargs: Any,
+) -> discord.Message:
+    """
+    Envia a imagem em ``path`` por ``send`` (``message.reply``, ``ctx.send``,
+    ``channel.send``...), reaproveitando a URL de um envio anterior.
+
+    Mensagens com ``delete_after`` usam a URL em cache mas não viram fonte dela,
+    já que o anexo some junto com a mensagem.
+    """
+    if not settings.attachment_reuse or Path(path).suffix.lower() not in IMAGE_EXTENSIONS:
+        return await _upload(send, path, content, **kwargs)
+
+    digest = await _digest(path)
+    entry = await state.get(_key(digest))
+    if entry is not None:
+        embed = discord.Embed().set_image(url=entry["url"])
+        try:
+            message = await send(content, embed=embed, **kwargs)
+        except discord.HTTPException as e:
+            log.warning("URL em cache de %s recusada (%s), enviando o arquivo de novo", path, e)
+            await forget(digest)
+        else:
+            ATTACHMENT_SENDS.inc(result="reused")
+            return message
+
+    message = await _upload(send, path, content, **kwargs)
+    if message.attachments and kwargs.get("delete_after") is None:
+        await _remember(digest, message)
+    return message
+
+
+async def _upload(send, path: str, content: str | None, **kwargs: Any) -> discord.Message:
+    with tracer.span("file read", path=path), open(path, "rb") as f:
+        file = discord.File(f, filename=Path(path).name)
+        message = await send(content, file=file, **kwargs)
+    ATTACHMENT_SENDS.inc(result="uploaded")
+    return message
+
+
+async def _remember(digest: str, message: discord.Message) -> None:
+    url = message.attachments[0].url
+    ttl = url_ttl(url)
+    if ttl <= 0:
+        return
+    await state.set_many(
+        {_key(digest): {"url": url, "message": message.id}, _message_key(message.id): digest},
+        ttl=ttl,
+    )
+    log.debug("URL do anexo %s guardada por %.0fs", digest[:12], ttl)
+
+
+async def forget(digest: str) -> None:
+    entry = await state.get(_key(digest))
+    keys = [_key(digest)]
+    if entry is not None:
+        keys.append(_message_key(entry["message"]))
+    await state.delete(*keys)
+
+
+async def forget_message(message_id: int) -> None:
+    """Descarta a URL cuja mensagem de origem foi apagada."""
+    digest = await state.get(_message_key(message_id))
+    if digest is not None:
+        log.info("Mensagem %s com anexo em cache apagada; a imagem será reenviada", message_id)
+        await forget(digest)
@@ -1,16 +1,49 @@
 import time
+from typing import Callable
 
-cooldowns = {}
+from logger import get_logger
+from state import state
+from utils.metrics import metrics
 
-def on_cooldown(user_id: int, cooldown_time: int, admin_id=None):
-    print(f"User ID: {user_id}")
+log = get_logger(__name__)
+
+# no cluster com estado só em memória, avisa os outros workers de cada cooldown
+# disparado aqui (com sqlite/redis todos já enxergam a mesma chave)
+_replicate: Callable[[int, float, float], None] | None = None
+
+COOLDOWN_CHECKS = metrics.counter(
+    "bot_cooldown_checks_total", "Verificações de cooldown por resultado", ("result",)
+)
+
+
+def _key(user_id: int) -> str:
+    return f"cooldown:{user_id}"
+
+
+async def on_cooldown(user_id: int, cooldown_time: int, admin_id=None):
     if admin_id and user_id == admin_id:
-        print("Admin bypass")
+        log.debug("Cooldown ignorado para o admin %s", user_id)
         return False
-    last_trigger = cooldowns.get(user_id, 0)
-    if time.time() - last_trigger > cooldown_time:
-        cooldowns[user_id] = time.time()
-        print("User not in cooldown")
+    # testa e marca de uma vez: duas réplicas não disparam juntas para o mesmo usuário
+    now = time.time()
+    if await state.set(_key(user_id), now, ttl=cooldown_time, nx=True):
+        if _replicate is not None:
+            _replicate(user_id, now, cooldown_time)
+        log.debug("Usuário %s fora do cooldown", user_id)
+        COOLDOWN_CHECKS.inc(result="miss")
         return False
-    print("User in cooldown")
+    log.debug("Usuário %s em cooldown", user_id)
+    COOLDOWN_CHECKS.inc(result="hit")
     return True
+
+
+def replicate_with(callback: Callable[[int, float, float], None]) -> None:
+    global _replicate
+    _replicate = callback
+
+
+async def apply_remote(user_id: int, triggered_at: float, cooldown_time: float) -> None:
+    """Registra um cooldown disparado em outro processo."""
+    remaining = triggered_at + cooldown_time - time.time()
+    if remaining > 0:
+        await state.set(_key(user_id), triggered_at, ttl=remaining)
@@ -0,0 +1,105 @@
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config.constants import settings
+from logger import get_logger
+from utils.metrics import metrics
+
+log = get_logger(__name__)
+
+_executors: dict[str, "BoundedExecutor"] = {}
+
+
+class ExecutorSaturated(RuntimeError):
+    """Lançada quando o pool não aceita mais trabalho."""
+
+
+class BoundedExecutor:
+    """
+    Pool de threads dedicado com fila limitada e controle de admissão.
+
+    Uma chamada ocupa o seu slot até a thread terminar de verdade — mesmo que o
+    ``await`` tenha sido cancelado por timeout. Assim, threads presas contam como
+    carga e novas chamadas são rejeitadas na hora em vez de se acumularem.
+    """
+
+    def __init__(self, name: str, max_workers: int = 4, max_queue: int = 4):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.rejected = 0
+        _executors[name] = self
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Chamadas aguardando uma thread livre."""
+        return max(0, self._in_flight - self.max_workers)
+
+    @property
+    def saturated(self) -> bool:
+        return self._in_flight >= self.max_workers + self.max_queue
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+
+    async def run(self, fn, *args, **kwargs):
+        """Executa ``fn`` no pool; lança ExecutorSaturated se não houver vaga."""
+        with self._lock:
+            if self.saturated:
+                self.rejected += 1
+                raise ExecutorSaturated(
+                    f"Pool '{self.name}' saturado ({self._in_flight} chamadas em andamento)"
+                )
+            self._in_flight += 1
+            self.submitted += 1
+
+        try:
+            # leva o contexto (span atual do tracing) para a thread, como asyncio.to_thread
+            context = contextvars.copy_context()
+            future = self._pool.submit(context.run, functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect(stat: str) -> dict[tuple[str, ...], float]:
+    return {(name,): executor.stats()[stat] for name, executor in _executors.items()}
+
+
+metrics.gauge("executor_in_flight", "Chamadas rodando ou na fila do pool", lambda: _collect("in_flight"), ("executor",))
+metrics.gauge("executor_queue_depth", "Chamadas esperando uma thread livre", lambda: _collect("queue_depth"), ("executor",))
+metrics.gauge("executor_rejected", "Chamadas rejeitadas por saturação desde o início", lambda: _collect("rejected"), ("executor",))
+
+search_executor = BoundedExecutor(
+    "search",
+    max_workers=settings.search_max_workers,
+    max_queue=settings.search_max_queue,
+)
@@ -0,0 +1,83 @@
+"""
+sharding.py — modo com shards (``AutoShardedBot``) e a qual shard pertence cada canal.
+
+Com ``SHARDING=true`` o bot abre uma conexão de gateway por shard. ``SHARD_COUNT``
+fixa o total de shards (vazio usa o recomendado pelo Discord) e ``SHARD_IDS``
+escolhe quais deles este processo conecta (``0,1`` ou ``0-3``), para dividir os
+shards entre processos.
+
+Um processo só recebe eventos — e só tem em cache — os servidores dos seus shards.
+Quem envia para um canal fixo fora de um comando (notificações, jobs agendados)
+confere ``owns_channel`` antes, para que só o dono do canal envie.
+"""
+from __future__ import annotations
+
+import discord
+
+from config.constants import settings
+
+
+def parse_shard_ids(spec: str) -> list[int] | None:
+    """``"0,2-4"`` -> ``[0, 2, 3, 4]``; vazio -> ``None`` (todos os shards)."""
+    ids: set[int] = set()
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if "-" in item:
+            start, end = item.split("-", 1)
+            ids.update(range(int(start), int(end) + 1))
+        else:
+            ids.add(int(item))
+    return sorted(ids) or None
+
+
+def shard_options() -> dict:
+    """Argumentos de shard para o construtor do ``AutoShardedBot``."""
+    shard_ids = parse_shard_ids(settings.shard_ids)
+    if shard_ids is not None and settings.shard_count is None:
+        raise ValueError("SHARD_IDS exige SHARD_COUNT")
+    if shard_ids is not None and max(shard_ids) >= settings.shard_count:
+        raise ValueError(f"SHARD_IDS fora do intervalo 0..{settings.shard_count - 1}")
+    return {"shard_count": settings.shard_count, "shard_ids": shard_ids}
+
+
+def is_sharded(bot: discord.Client) -> bool:
+    return isinstance(bot, discord.AutoShardedClient)
+
+
+def shard_for_guild(guild_id: int, shard_count: int) -> int:
+    """Shard que recebe os eventos do servidor (fórmula do Discord)."""
+    return (guild_id >> 22) % shard_count
+
+
+def owned_shards(bot: discord.Client) -> list[int]:
+    if not is_sharded(bot):
+        return [0]
+    if bot.shard_ids is not None:
+        return list(bot.shard_ids)
+    return list(range(bot.shard_count or 1))
+
+
+def owns_channel(bot: discord.Client, channel_id: int) -> bool:
+    """
+    Se este processo é o dono do canal e deve enviar para ele.
+
+    Sem shards o processo é dono de tudo. Com shards, o canal precisa estar no
+    cache (ou seja, num servidor de um shard deste processo); DMs ficam com o shard 0.
+    """
+    if not is_sharded(bot):
+        return True
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        return False
+    guild = getattr(channel, "guild", None)
+    shard_id = guild.shard_id if guild is not None else 0
+    return shard_id in owned_shards(bot)
+
+
+def shard_latencies(bot: discord.Client) -> dict[int, float]:
+    """Latência do heartbeat (s) de cada shard conectado por este processo."""
+    if is_sharded(bot):
+        return dict(bot.latencies)
+    return {bot.shard_id or 0: bot.latency}
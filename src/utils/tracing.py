@@ -0,0 +1,300 @@
+"""
+tracing.py — spans por comando/listener com spans aninhados para I/O.
+
+Cada comando (via ``AutoCog.cog_before_invoke``/``cog_after_invoke``) e cada
+listener dos cogs abre um span raiz; chamadas HTTP, leitura/escrita de arquivos e
+envios ao Discord feitos dentro dele viram spans filhos, ligados pelo contexto
+(``contextvars``) — inclusive através de ``asyncio.to_thread`` e do pool de buscas.
+
+Os spans terminados são exportados em lote por uma thread, sem tocar o event loop:
+
+* ``jsonl``: uma linha JSON por span em ``settings.tracing_file``;
+* ``otlp``:  POST no formato OTLP/HTTP JSON para ``settings.tracing_otlp_endpoint``
+  (um collector OpenTelemetry, ou o stand-in local: ``python -m utils.tracing``).
+
+Com ``tracing_exporter = "none"`` (padrão) nenhum span é criado.
+"""
+from __future__ import annotations
+
+import functools
+import json
+import os
+import queue
+import secrets
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Iterator
+
+import aiohttp
+
+from config.constants import settings
+from logger import get_logger
+
+log = get_logger(__name__)
+
+SERVICE_NAME = "pai-bot"
+_BATCH_SIZE = 100
+_FLUSH_INTERVAL = 2.0
+
+
+class Span:
+    """Uma operação com início, fim, atributos e o span pai."""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, parent: Span | None, attributes: dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent is not None else None
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration(self) -> float | None:
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns is not None else None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration": self.duration,
+            "attributes": self.attributes,
+            "error": self.error,
+        }
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class JsonLinesExporter:
+    """Grava spans como JSON, um por linha."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+
+    def export(self, spans: list[Span]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n")
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(span: Span) -> dict[str, Any]:
+    data = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in span.attributes.items()],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        data["parentSpanId"] = span.parent_id
+    return data
+
+
+class OTLPExporter:
+    """Envia spans para um collector OTLP/HTTP (JSON)."""
+
+    def __init__(self, endpoint: str, timeout: float = 5.0):
+        self.endpoint = endpoint
+        self.timeout = timeout
+
+    def export(self, spans: list[Span]) -> None:
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                "scopeSpans": [{"scope": {"name": SERVICE_NAME}, "spans": [_otlp_span(s) for s in spans]}],
+            }]
+        }
+        request = urllib.request.Request(
+            self.endpoint,
+            data=json.dumps(payload).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+class _BatchProcessor:
+    """Acumula spans terminados e exporta em lote numa thread própria."""
+
+    def __init__(self, exporter):
+        self.exporter = exporter
+        self._queue: queue.SimpleQueue[Span] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def submit(self, span: Span) -> None:
+        self._queue.put(span)
+
+    def _drain(self, first: Span) -> list[Span]:
+        batch = [first]
+        while len(batch) < _BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._drain(self._queue.get())
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                log.warning("Falha ao exportar %d span(s): %s", len(batch), e)
+            if len(batch) < _BATCH_SIZE:
+                time.sleep(_FLUSH_INTERVAL)
+
+
+class Tracer:
+    """Cria spans ligados ao contexto atual e os entrega ao exportador."""
+
+    def __init__(self, exporter=None):
+        self._processor = _BatchProcessor(exporter) if exporter is not None else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._processor is not None
+
+    def start_span(self, name: str, **attributes: Any) -> Span | None:
+        """Abre um span filho do span atual, sem torná-lo o atual."""
+        if not self.enabled:
+            return None
+        return Span(name, _current_span.get(), attributes)
+
+    def end_span(self, span: Span | None, error: BaseException | str | None = None) -> None:
+        if span is None:
+            return
+        span.end_ns = time.time_ns()
+        if error is not None:
+            span.error = error if isinstance(error, str) else f"{type(error).__name__}: {error}"
+        self._processor.submit(span)
+
+    def activate(self, span: Span | None):
+        """Torna ``span`` o span atual; retorna o token para ``deactivate``."""
+        return _current_span.set(span) if span is not None else None
+
+    def deactivate(self, token) -> None:
+        if token is not None:
+            _current_span.reset(token)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span | None]:
+        """Span que cobre o bloco ``with`` e é o atual dentro dele."""
+        span = self.start_span(name, **attributes)
+        if span is None:
+            yield None
+            return
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, e)
+            raise
+        else:
+            self.end_span(span)
+        finally:
+            _current_span.reset(token)
+
+    def traced(self, name: str):
+        """Decorator: executa a coroutine function dentro de um span."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def http_trace_config() -> aiohttp.TraceConfig:
+    """TraceConfig do aiohttp que abre um span por requisição HTTP da sessão."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, ctx, params):
+        ctx.span = tracer.start_span(
+            f"http {params.method}", url=str(params.url.with_query(None)), host=params.url.host or ""
+        )
+
+    async def on_request_end(session, ctx, params):
+        if ctx.span is not None:
+            ctx.span.set_attribute("status", params.response.status)
+        tracer.end_span(ctx.span)
+
+    async def on_request_exception(session, ctx, params):
+        tracer.end_span(ctx.span, params.exception)
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def _exporter_from_settings():
+    kind = settings.tracing_exporter.lower()
+    if kind == "jsonl":
+        return JsonLinesExporter(settings.tracing_file)
+    if kind == "otlp":
+        return OTLPExporter(settings.tracing_otlp_endpoint)
+    if kind != "none":
+        log.warning("Exportador de tracing desconhecido: %s (tracing desligado)", kind)
+    return None
+
+
+tracer = Tracer(_exporter_from_settings())
+
+
+def run_collector(host: str = "127.0.0.1", port: int = 4318, output: str = ".cache/otlp.jsonl") -> None:
+    """Collector OTLP/HTTP mínimo: grava cada span recebido como uma linha JSON."""
+    from aiohttp import web
+
+    async def receive(request: web.Request) -> web.Response:
+        payload = await request.json()
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "a", encoding="utf-8") as f:
+            for resource in payload.get("resourceSpans", []):
+                for scope in resource.get("scopeSpans", []):
+                    for span in scope.get("spans", []):
+                        f.write(json.dumps(span, ensure_ascii=False) + "\n")
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post("/v1/traces", receive)
+    web.run_app(app, host=host, port=port)
+
+
+if __name__ == "__main__":
+    run_collector(port=int(os.getenv("COLLECTOR_PORT", "4318")))
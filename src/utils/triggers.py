@@ -0,0 +1,192 @@
+"""
+triggers.py — gatilhos de palavra-chave por servidor, compilados sob demanda.
+
+O ``pai_config.json`` tem a lista global ``configs`` e, opcionalmente, listas por
+servidor em ``guilds``::
+
+    "guilds": {
+        "123456789": {"configs": [...], "cooldown": 60, "inherit": false}
+    }
+
+Um servidor sem entrada usa a lista global; com entrada, usa a sua (mais a global
+se ``inherit`` for verdadeiro).
+
+O ``TriggerRegistry`` só compila os gatilhos de um servidor na primeira mensagem
+dele e descarta os que ficaram ociosos, então memória e custo de compilação
+acompanham os servidores ativos, não o total de configurações. Cada conjunto
+compilado tem uma regex única com todas as palavras-chave: a grande maioria das
+mensagens, que não tem gatilho nenhum, custa uma busca só.
+
+Mensagens e palavras-chave passam pela mesma ``normalize`` (acentos, leetspeak,
+letras parecidas de outros alfabetos, palavras soletradas, separadores) e casam
+como palavras inteiras. Assim ``nubank`` sozinha pega ``Nubãnk``, ``n.u.b.a.n.k``,
+``n u b a n k``, ``n_u_b_a_n_k`` e ``nu8ank``, sem listar cada variação. As
+palavras-chave são texto literal, não regex.
+
+Trechos claramente disfarçados (letras soltas ou presas por pontuação, como
+``n_u_b``, ``c.l.o`` ou ``nu_``) também casam quando são o começo de uma
+palavra-chave de uma palavra só: ``n_u_b`` dispara ``nubank``, mas ``nub``
+escrito normalmente não.
+"""
+from __future__ import annotations
+
+import re
+import time
+import unicodedata
+from typing import Any
+
+from logger import get_logger
+from utils.metrics import metrics
+
+log = get_logger(__name__)
+
+TRIGGER_SETS = metrics.counter(
+    "trigger_sets_total", "Conjuntos de gatilhos compilados e descartados", ("event",)
+)
+
+
+# letras de outros alfabetos com a mesma cara das latinas (а cirílico, ο grego...)
+_CONFUSABLES = {
+    "а": "a", "в": "b", "е": "e", "ё": "e", "к": "k", "м": "m", "н": "h", "о": "o", "р": "p",
+    "с": "c", "т": "t", "у": "y", "х": "x", "і": "i", "ј": "j", "ѕ": "s", "ԁ": "d",
+    "α": "a", "β": "b", "ε": "e", "ι": "i", "κ": "k", "ν": "v", "ο": "o", "ρ": "p", "τ": "t", "υ": "u", "χ": "x",
+}
+_LEET = {"0": "o", "1": "i", "3": "e", "4": "a", "5": "s", "7": "t", "8": "b", "@": "a", "$": "s"}
+_FOLD = str.maketrans({**_CONFUSABLES, **_LEET})
+# pontuação usada para separar letras ("n.u.b", "n_u_b", "n-u-b", "n*u*b")
+_SEPARATOR_CHARS = r"\s._\-*~+/\\,:;'\"`^"
+_SEPARATORS = re.compile(f"[{_SEPARATOR_CHARS}]+")
+# três ou mais letras soltas com o mesmo separador entre elas: "n u b", "n.u.b.a.n.k"
+_SPELLED = re.compile(f"(?<![^\\W_])[^\\W_]([{_SEPARATOR_CHARS}])[^\\W_](?:\\1[^\\W_])+(?![^\\W_])")
+# palavra com pontuação no meio ("n_u_b", "c.lo") ou terminada em "_" ("nu_")
+_PUNCTUATION_CHARS = r"._\-*~+/\\,:;'\"`^"
+_DISGUISED = re.compile(
+    f"(?<![^\\W_])[^\\W_]+(?:[{_PUNCTUATION_CHARS}]+[^\\W_]+)+(?![^\\W_])|(?<![^\\W_])[^\\W_]+_+(?!\\w)"
+)
+_NOT_LETTERS = re.compile(r"[\W_]+")
+# trechos disfarçados mais curtos que isso não disparam nada
+MIN_FRAGMENT = 2
+
+
+def _fold(text: str) -> str:
+    text = text.casefold()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c) and unicodedata.category(c) != "Cf")
+    return text.translate(_FOLD)
+
+
+def _normalize_folded(text: str) -> str:
+    text = _SPELLED.sub(lambda m: m.group(0)[::2], text)
+    return _SEPARATORS.sub(" ", text).strip()
+
+
+def normalize(text: str) -> str:
+    """Forma canônica de ``text`` para casar gatilhos.
+
+    Minúsculas sem acento, leetspeak e letras parecidas trocadas pelas latinas,
+    caracteres invisíveis removidos, palavras soletradas juntadas ("n u b" vira
+    "nub") e qualquer outra sequência de separadores virando um espaço só.
+    """
+    return _normalize_folded(_fold(text))
+
+
+def _fragments(folded: str) -> set[str]:
+    """Trechos disfarçados de ``folded`` (já passado por ``_fold``), só com as letras."""
+    found = [m.group(0) for m in _DISGUISED.finditer(folded)]
+    found += [m.group(0) for m in _SPELLED.finditer(folded) if m.group(1).isspace()]
+    fragments = (_NOT_LETTERS.sub("", f) for f in found)
+    return {f for f in fragments if len(f) >= MIN_FRAGMENT}
+
+
+def _words(keywords: list[str]) -> list[str]:
+    """Palavras-chave de uma palavra só, já normalizadas, para casar trechos disfarçados."""
+    return [k for k in map(normalize, keywords) if k and " " not in k]
+
+
+def _pattern(keywords: list[str]) -> str | None:
+    patterns = [re.escape(k) for k in map(normalize, keywords) if k]
+    return r"\b(?:{})\b".format("|".join(patterns)) if patterns else None
+
+
+class TriggerSet:
+    """Gatilhos compilados de um servidor."""
+
+    def __init__(self, triggers: list[dict[str, Any]], cooldown: int):
+        self.triggers = triggers
+        self.cooldown = cooldown
+        patterns = [(t, _pattern(t["keywords"])) for t in triggers if t["enabled"]]
+        self._enabled = [(t, re.compile(p)) for t, p in patterns if p]
+        keywords = [keyword for trigger, _ in self._enabled for keyword in trigger["keywords"]]
+        self._any = re.compile(_pattern(keywords)) if keywords else None
+        self._words = {id(t): _words(t["keywords"]) for t, _ in self._enabled}
+        self.last_used = time.monotonic()
+
+    def match(self, content: str) -> dict[str, Any] | None:
+        """Primeiro gatilho habilitado (na ordem da configuração) que bate com ``content``."""
+        self.last_used = time.monotonic()
+        if self._any is None:
+            return None
+        folded = _fold(content)
+        text = _normalize_folded(folded)
+        fragments = _fragments(folded)
+        if not fragments and self._any.search(text) is None:
+            return None
+        for trigger, pattern in self._enabled:
+            if pattern.search(text) or self._disguised(trigger, fragments):
+                return trigger
+        return None
+
+    def _disguised(self, trigger: dict[str, Any], fragments: set[str]) -> bool:
+        words = self._words[id(trigger)]
+        return any(word.startswith(fragment) for fragment in fragments for word in words)
+
+
+class TriggerRegistry:
+    """Conjuntos de gatilhos por servidor, compilados no primeiro uso."""
+
+    def __init__(self, configs: dict[str, Any], idle_ttl: float):
+        """
+        Args:
+            configs:  Saída de ``config.loader.get_configs``.
+            idle_ttl: Segundos sem mensagens até o conjunto de um servidor ser descartado.
+        """
+        self.configs = configs
+        self.idle_ttl = idle_ttl
+        self._sets: dict[int | None, TriggerSet] = {}
+        self._last_sweep = time.monotonic()
+
+    def configs_for(self, guild_id: int | None) -> tuple[list[dict[str, Any]], int]:
+        """Gatilhos e cooldown que valem para o servidor (sem compilar nada)."""
+        guild = self.configs.get("guilds", {}).get(guild_id)
+        if guild is None:
+            return self.configs["configs_list"], self.configs["cooldown"]
+        triggers = guild["configs_list"]
+        if guild["inherit"]:
+            triggers = triggers + self.configs["configs_list"]
+        return triggers, guild["cooldown"]
+
+    def get(self, guild_id: int | None) -> TriggerSet:
+        self._sweep()
+        trigger_set = self._sets.get(guild_id)
+        if trigger_set is None:
+            trigger_set = TriggerSet(*self.configs_for(guild_id))
+            self._sets[guild_id] = trigger_set
+            TRIGGER_SETS.inc(event="loaded")
+            log.debug("Gatilhos do servidor %s compilados (%d)", guild_id, len(trigger_set.triggers))
+        return trigger_set
+
+    def _sweep(self) -> None:
+        now = time.monotonic()
+        if now - self._last_sweep < self.idle_ttl / 2:
+            return
+        self._last_sweep = now
+        idle = [guild_id for guild_id, s in self._sets.items() if now - s.last_used > self.idle_ttl]
+        for guild_id in idle:
+            del self._sets[guild_id]
+        if idle:
+            TRIGGER_SETS.inc(len(idle), event="evicted")
+            log.debug("%d conjunto(s) de gatilhos ocioso(s) descartado(s)", len(idle))
+
+    def loaded(self) -> int:
+        return len(self._sets)
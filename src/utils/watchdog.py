@@ -0,0 +1,133 @@
+"""
+watchdog.py — detecta travamentos do event loop e mostra quem travou.
+
+Uma thread separada agenda um "batimento" no loop a cada ``interval`` segundos. Se o
+último batimento executado ficar mais de ``threshold`` segundos para trás, o loop
+está bloqueado por código síncrono: a thread captura a stack da thread do loop
+(onde está a chamada bloqueante), a task asyncio atual e o comando do bot que ela
+executa, e loga tudo. Os travamentos são contados por comando.
+"""
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import Counter
+
+from logger import get_logger
+from utils.metrics import metrics
+
+log = get_logger(__name__)
+
+STALLS = metrics.counter(
+    "event_loop_stalls_total", "Travamentos do event loop acima do limite, por comando", ("command",)
+)
+STALL_SECONDS = metrics.histogram(
+    "event_loop_stall_seconds", "Duração dos travamentos do event loop", ("command",),
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+
+class _Stall:
+    def __init__(self, started_at: float, command: str, task_name: str, coroutine: str):
+        self.started_at = started_at
+        self.command = command
+        self.task_name = task_name
+        self.coroutine = coroutine
+
+
+class LoopWatchdog:
+    """Thread que vigia o event loop e registra cada travamento."""
+
+    def __init__(self, threshold: float, interval: float | None = None):
+        self.threshold = threshold
+        self.interval = interval or threshold / 4
+        self.stalls_by_command: Counter[str] = Counter()
+        self._commands: weakref.WeakKeyDictionary[asyncio.Task, str] = weakref.WeakKeyDictionary()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.monotonic()
+        self._stall: _Stall | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        """Começa a vigiar o loop atual. Precisa ser chamado de dentro do loop."""
+        if self._thread is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+        log.info("Watchdog do event loop ativo (limite de %.2fs)", self.threshold)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def track(self, command: str) -> None:
+        """Associa a task atual a um comando (chamado antes de cada comando)."""
+        task = asyncio.current_task()
+        if task is not None:
+            self._commands[task] = command
+
+    def untrack(self) -> None:
+        task = asyncio.current_task()
+        if task is not None:
+            self._commands.pop(task, None)
+
+    def _beat(self) -> None:
+        self._last_beat = time.monotonic()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self._loop.call_soon_threadsafe(self._beat)
+            except RuntimeError:
+                # loop fechado
+                return
+
+            behind = time.monotonic() - self._last_beat
+            if behind > self.threshold:
+                if self._stall is None:
+                    self._report_stall(behind)
+            elif self._stall is not None:
+                self._finish_stall()
+
+    def _current_task(self) -> asyncio.Task | None:
+        try:
+            return asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+
+    def _report_stall(self, behind: float) -> None:
+        task = self._current_task()
+        command = self._commands.get(task, "-") if task is not None else "-"
+        task_name = task.get_name() if task is not None else "-"
+        coroutine = getattr(task.get_coro(), "__qualname__", "-") if task is not None else "-"
+
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "(stack indisponível)\n"
+
+        self._stall = _Stall(self._last_beat, command, task_name, coroutine)
+        self.stalls_by_command[command] += 1
+        STALLS.inc(command=command)
+        log.warning(
+            "Event loop travado há %.2fs | comando: %s | task: %s | coroutine: %s\n%s",
+            behind, command, task_name, coroutine, stack.rstrip(),
+        )
+
+    def _finish_stall(self) -> None:
+        stall, self._stall = self._stall, None
+        duration = self._last_beat - stall.started_at
+        STALL_SECONDS.observe(duration, command=stall.command)
+        log.warning(
+            "Event loop voltou a responder após %.2fs (comando: %s, coroutine: %s)",
+            duration, stall.command, stall.coroutine,
+        )
+
@@ -0,0 +1,7 @@
+import os
+import sys
+from pathlib import Path
+
+# os módulos do bot importam uns aos outros a partir de src/ e leem o .env no import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+os.environ.setdefault("TOKEN", "test")
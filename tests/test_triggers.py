@@ -0,0 +1,48 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from config.loader import get_configs
+from utils.triggers import TriggerSet
+
+CONFIG = Path(__file__).resolve().parent.parent / "config" / "pai_config.json"
+
+
+@pytest.fixture(scope="module")
+def triggers():
+    configs = get_configs(json.loads(CONFIG.read_text(encoding="utf-8")))
+    return TriggerSet(configs["configs_list"], configs["cooldown"])
+
+
+@pytest.mark.parametrize(
+    "content, name",
+    [
+        # palavras-chave que saíram do pai_config.json ao passar a normalizar as mensagens
+        ("n u b a n k", "nubank"),
+        ("c l o j u r e", "nubank"),
+        ("n.u.b.a.n.k", "nubank"),
+        ("c.l.o.j.u.r.e", "nubank"),
+        ("n_u_b", "nubank"),
+        ("c_l_o", "nubank"),
+        ("nu_", "nubank"),
+        ("nao vou elaborar", "elab"),
+        ("nao quero elaborar", "elab"),
+        # as mesmas no meio de uma frase
+        ("olha o n_u_b", "nubank"),
+        ("meu nu_ tá", "nubank"),
+        ("usa c_l_o no back", "nubank"),
+        ("Não quero elaborar.", "elab"),
+    ],
+)
+def test_removed_keywords_still_trigger(triggers, content, name):
+    trigger = triggers.match(content)
+    assert trigger is not None and trigger["name"] == name
+
+
+@pytest.mark.parametrize(
+    "content",
+    ["nub", "clo", "nu", "já vá embora", "in ter", "a ru st", "o clô", "c lo", "foi já.", "n/a"],
+)
+def test_plain_text_does_not_trigger(triggers, content):
+    assert triggers.match(content) is None